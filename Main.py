@@ -1,116 +1,120 @@
-import time
-from Models.Deck import Deck
-from Models.Hands import Hands
-from Models.Dealer_hands import DealerHands
+import asyncio
+from Models.Rules import Rules
 from Utility.DB import DatabaseManager
-import Utility.Calculations as calc
+from Utility.Advisor import Advisor
+from Utility.Strategy_server import StrategyServer
+from Utility.Pipeline import Pipeline, OVERVIEW_STAGES, main
+from Utility.Benchmark import BenchmarkSuite
 
 
-def All_Hands_in_DB(missing_cards=None):
-    # 1. Datenbank vorbereiten
-    db_path = "Data/blackjack.db"
-    db_manager = DatabaseManager(db_path)
-    table_name = "Hands"
-    db_manager.drop_table(table_name)
-    db_manager.create_table_hands(table_name)
-    db_manager.inspect_table_columns(table_name)
+DB_PATH = "Data/blackjack.db"
 
-    # 2. Deck initialisieren
-    deck = Deck()  # Ein Deck
+# NumPy ist optional: Simulator, Zusammensetzungs-Sweep, Hausvorteil und Spaltenexport werden erst in ihren
+# Funktionen importiert, damit die Pipeline-Aufgaben auch ohne NumPy laufen.
 
-    # 3. Hands-Objekt erstellen
-    hands_generator = Hands(deck, db_manager)
 
-    # 4. Hände generieren und speichern
-    print("Generiere und speichere alle möglichen Hände...")
-    hands_generator.generate_and_save_hands(missing_cards)
-    print("Alle Hände wurden erfolgreich generiert und gespeichert!")
+def All_Hands_in_DB(missing_cards=None):
+    # Stufe 'hands' (wird übersprungen, wenn Deck, fehlende Karten und Code unverändert sind)
+    Pipeline(DB_PATH, missing_cards=missing_cards).run(["hands"])
 
-    # 5. Statusbericht
-    db_manager.print_hand_count(table_name)
+def Dealer_Hands_in_DB(missing_cards=None):
+    Pipeline(DB_PATH, missing_cards=missing_cards).run(["dealer_hands"])
 
-    # 6. DB schließen
+    # Dealerhände auswerten
+    db_manager = DatabaseManager(DB_PATH)
+    stats = db_manager.get_dealer_hand_statistics()
+    for row in stats:
+        print(row)  # (start_card, count_17, count_18, count_19, count_20, count_21, count_blackjack, count_busted)
     db_manager.close()
 
-def Dealer_Hands_in_DB(missing_cards=None):
-    # 1. Datenbank vorbereiten
-    db_path = "Data/blackjack.db"
-    db_manager = DatabaseManager(db_path)
-    table_name = "Dealer_Hands"
-    db_manager.drop_table(table_name)
-    db_manager.create_table_hands(table_name)
+def Dealer_Hands_statistics_from_DB():
+    Pipeline(DB_PATH).run(["dealer_statistics"])
 
-    # 2. Deck initialisieren
-    deck = Deck()  # Ein Deck
+def Full_Hands(jobs=1):
+    Pipeline(DB_PATH, hand_jobs=jobs).run(["full_player_hands"])
 
-    # 3. Dealer_Hands-Objekt erstellen
-    hands_generator = DealerHands(deck, db_manager)
+def EVs():
+    Pipeline(DB_PATH).run(["evs"])
 
-    # 4. Dealer-Hände generieren und speichern
-    hands_generator.generate_dealer_hands(table_name, missing_cards)
+def Strategy_Overview(jobs=4):
+    # Die Übersichten laufen gleichzeitig, jede mit eigener Verbindung
+    Pipeline(DB_PATH, jobs=jobs).run(OVERVIEW_STAGES)
 
-    # 6. Statusbericht
-    db_manager.print_hand_count(table_name)
+def Advisor_Benchmark():
+    db_path = "Data/blackjack.db"
+    advisor = Advisor(db_path)
+    print(f"Advisor geladen: {len(advisor)} Einträge")
+    print(advisor.best_action([10, 6], 10))
+    print(advisor.benchmark())
 
-    # 7. Dealerhände auswerten
-    stats = db_manager.get_dealer_hand_statistics()
-    for row in stats:
-        print(row)  # (start_card, count_17, count_18, count_19, count_20, count_21, count_blackjack, count_busted)
+def Export_Columns(columns_dir="Data/columns/Full_player_hands", split_columns_dir="Data/columns/Split_ev"):
+    from Utility.Columnar import ColumnStore
 
-    # 8. DB schließen
+    db_manager = DatabaseManager(DB_PATH)
+    ColumnStore(columns_dir).export(db_manager.connection, "Full_player_hands")
+    ColumnStore(split_columns_dir).export(db_manager.connection, "Split_ev")
     db_manager.close()
+    advisor = Advisor(DB_PATH, columns_dir=columns_dir, split_columns_dir=split_columns_dir)
+    print(f"Advisor aus Spaltenexport geladen: {len(advisor)} Einträge")
 
-def Dealer_Hands_statistics_from_DB():
+def Strategy_Server():
     db_path = "Data/blackjack.db"
-    db_manager = DatabaseManager(db_path)
-    db_manager.create_stats_table()
-    db_manager.update_dealer_hand_statistics()
+    server = StrategyServer(db_path)
+    asyncio.run(server.serve_forever())
 
-def Full_Hands():
-    db_path = "Data/blackjack.db"
-    db_manager = DatabaseManager(db_path)
-    table_name = "Full_player_hands"
-    db_manager.drop_table(table_name)
-    db_manager.create_table_full_player_hands(table_name)
-    db_manager.inspect_table_columns(table_name)
-    deck = Deck()
-    hands_generator = Hands(deck, db_manager)
-    start_time = time.time()  # Timer starten
-    hands_generator.generate_and_save_full_player_hands()
-    end_time = time.time()  # Timer stoppen
-    print(f"Generierung der Dealer-Hände dauerte: {end_time - start_time:.4f} Sekunden")
-    db_manager.close()
+def Simulation(rounds=1000000, jobs=4):
+    from Utility.Simulator import Simulator
 
-def EVs():
     db_path = "Data/blackjack.db"
-    db_manager = DatabaseManager(db_path)
-    table_name = "Full_player_hands"
-    db_manager.get_ev_for_hands(table_name)
+    simulator = Simulator(db_path, deck_count=1, penetration=0)
+    result = simulator.run(rounds, jobs=jobs)
+    print(result.as_dict())
+    for row in simulator.compare_with_exact(result, min_count=1000)[:10]:
+        print(row)
+
+def Composition_Sweep(max_removed=2):
+    from Utility.Composition_sweep import CompositionSweep
 
-def Strategy_Overview():
     db_path = "Data/blackjack.db"
     db_manager = DatabaseManager(db_path)
-    table_name = "Full_player_hands"
-    db_manager.create_player_dealer_startcard_overview(table_name)
-    db_manager.create_and_fill_player_dealer_strategy_table()
-    db_manager.create_and_fill_player_dealer_strategy_table_soft()
-    db_manager.create_and_fill_double_overview()
-    db_manager.create_and_fill_starthand_overview()
-    db_manager.create_and_fill_pair_overview()
+    sweep = CompositionSweep(max_removed=max_removed)
+    results = sweep.run()
+    print(f"{len(results)} Zusammensetzungen in {sweep.seconds:.4f} Sekunden berechnet")
+    with db_manager.bulk_load():
+        sweep.save(db_manager, results)
     db_manager.close()
 
-
-if __name__ == "__main__":
-    All_Hands_in_DB()
-    #All_Hands_in_DB(missing_cards=[1, 1, 1])
-    #Dealer_Hands_in_DB()
-    #Dealer_Hands_in_DB(missing_cards=[1, 1, 1])
-    #Dealer_Hands_statistics_from_DB()
-    Full_Hands()
-    EVs()
-    Strategy_Overview()
-
-
-
+def Rule_Matrix():
+    from Utility.Composition_sweep import CompositionSweep
+
+    sweep = CompositionSweep(max_removed=0)
+    rules_list = Rules.matrix(hit_soft_17=[False, True], blackjack_payout=[1.5, 1.2], peek=[True, False],
+                              surrender=[False, True])
+    results = sweep.run_matrix(rules_list)
+    print(f"{len(rules_list)} Regelvarianten in {sweep.seconds:.4f} Sekunden berechnet")
+    base = results[Rules()][(0,) * 10]
+    for rules in rules_list:
+        cells = results[rules][(0,) * 10]
+        changed = sum(1 for cell, values in cells.items() if values[0] != base[cell][0])
+        print(f"{rules}: {changed} abweichende Entscheidungen")
+
+def House_Edge(jobs=4):
+    from Utility.House_edge import HouseEdgeCalculator
+
+    rules_list = Rules.matrix(hit_soft_17=[False, True], blackjack_payout=[1.5, 1.2])
+    for rules, result in HouseEdgeCalculator.compare_rules(rules_list, jobs=jobs).items():
+        print(f"{rules}: Hausvorteil {result['house_edge'] * 100:.3f} %")
+
+def Benchmarks(decks=(1, 2, 6)):
+    suite = BenchmarkSuite(decks)
+    results = suite.run()
+    baseline = suite.load_baseline()
+    if baseline is None:
+        suite.save_baseline(results)
+    for name, reference, seconds, ratio in suite.compare(results, baseline or {}):
+        print(f"Regression {name}: {reference:.6f} -> {seconds:.6f} Sekunden")
 
 
+if __name__ == "__main__":
+    # Standard: hands, full_player_hands, evs und alle Übersichten (siehe "python Main.py --list")
+    raise SystemExit(main())
@@ -1,13 +1,39 @@
+
+from Models.Hand_state import HandState
+from Models.Rules import Rules
 import Utility.Calculations as calc
+from Utility.Instrumentation import instrumented
+from Utility.Lru_cache import LRUCache
+from Utility.Progress import ProgressReporter
+
+
+# Reihenfolge der Dealer-Endergebnisse in den Vektoren der DP-Berechnung
+DEALER_OUTCOMES = ["17", "18", "19", "20", "21", "Blackjack", "Bust"]
+
+
+class DealerCache(LRUCache):
+    """
+    LRU-Cache für Dealer-Verteilungen, damit gleiche Dealer-Berechnungen nur einmal durchgeführt werden.
+    Schlüssel sind Tupel aus Startkarte, Restdeck und Dealer-Regeln.
+    """
+
+
+# Gemeinsamer Cache für alle DealerHands-Instanzen eines Prozesses
+dealer_cache = DealerCache()
+
 
 class DealerHands:
-    def __init__(self, deck, db_manager=None):
+    def __init__(self, deck, db_manager=None, cache=None, rules=None, progress=None):
         # Initialisierung der Dealer-spezifischen Eigenschaften
         self.dealer_threshold = 17  # Mindestwert, ab dem der Dealer stoppt
+        self.rules = rules if rules is not None else Rules()  # H17/S17 und Peek
         self.deck = deck
+        self.cache = cache if cache is not None else dealer_cache
+        self.progress = progress if progress is not None else ProgressReporter()  # Fortschritt von generate_dealer_hands
         if db_manager is not None: self.db_manager = db_manager
 
 
+    @instrumented()
     def generate_dealer_hands(self, table_name, start_card=None, missing_cards=None):
         """
         Generiert und speichert alle möglichen Dealerhände für eine bestimmte Startkarte oder für alle Karten.
@@ -34,16 +60,18 @@ class DealerHands:
             # Validierung der Startkarte
             if start_card not in self.deck.get_available_cards():
                 raise ValueError(f"Ungültige Startkarte: {start_card}. Die Startkarte muss zwischen 1 und 10 liegen.")
-            print(f"Generiere Dealerhände für Startkarte {start_card} in Tabelle '{table_name}'...")
-            original_frequencies[start_card] -= 1
-            self._generate_dealer_hands_recursive(table_name, [start_card], start_card, original_frequencies,
-                                                  hands_to_insert)
+            start_cards = [start_card]
         else:
             # Generiere Dealerhände für alle möglichen Startkarten
-            for card in self.deck.get_available_cards():
-                print(f"Generiere Dealerhände für Startkarte {card} in Tabelle '{table_name}'...")
+            start_cards = self.deck.get_available_cards()
+
+        # Fortschritt pro Startkarte statt einer Ausgabe pro Hand
+        with self.progress.task(f"Dealerhände ({table_name})", total=len(start_cards)) as task:
+            for card in start_cards:
+                task.begin_unit(card)
                 original_frequencies[card] -= 1
-                self._generate_dealer_hands_recursive(table_name, [card], card, original_frequencies, hands_to_insert)
+                self._generate_dealer_hands_recursive(table_name, [card], card, original_frequencies, hands_to_insert,
+                                                      task)
                 original_frequencies[card] += 1
 
         # Alle Hände speichern, nachdem die Rekursion abgeschlossen ist
@@ -53,27 +81,35 @@ class DealerHands:
 
 
     def _generate_dealer_hands_recursive(self, table_name, current_hand, start_card, original_frequencies,
-                                         hands_to_insert):
+                                         hands_to_insert, task=None):
         """
         Rekursive Methode zur Generierung aller möglichen Dealerhände.
 
         Args:
             table_name (str): Name der Tabelle.
-            current_hand (list): Die aktuelle Hand (als Liste der Kartenwerte).
+            current_hand (list or HandState): Die aktuelle Hand (als Liste der Kartenwerte oder als HandState,
+                                              der während der Rekursion per push/pop fortgeschrieben wird).
             start_card (int): Die Startkarte des Dealers.
             original_frequencies: Eine Kopie der Anzahlen des aktuellen Decks, um Karten zu entnehmen.
             hands_to_insert (list): Liste für das Batch-Speichern der Hände.
+            task (ProgressTask, optional): Fortschritt, der pro gespeicherter Hand weitergezählt wird.
         """
-        total_value = calc.hand_value(current_hand)
+        if not isinstance(current_hand, HandState):
+            current_hand = HandState(current_hand)
+
+        total_value = current_hand.total_value
         is_blackjack = len(current_hand) == 2 and total_value == 21
         is_busted = total_value > 21
 
         # Hand speichern, wenn Dealer mindestens 17 hat
         if total_value >= self.dealer_threshold:
-            print(f"Speichere Hand: {current_hand}")
+            if task is not None:
+                task.advance()
+                if task.verbose:
+                    task.detail(f"Speichere Hand: {current_hand}")
             hands_to_insert.append({
-                "hands_type": "dealer",
-                "hand": current_hand.copy(),
+                "hand_type": "dealer",
+                "hand": current_hand.cards.copy(),
                 "start_card": start_card,
                 "total_value": total_value,
                 "minimum_value": None,
@@ -83,20 +119,22 @@ class DealerHands:
                 "can_double": False,
                 "can_split": False,
                 "bust_chance": 0,
-                "frequency": calc.hand_frequency_with_order(current_hand, original_frequencies, cards_to_ignore=1),
-                "probability": calc.hand_probability(current_hand)
+                "frequency": calc.hand_frequency_with_order(current_hand.cards, original_frequencies, cards_to_ignore=1),
+                "probability": calc.hand_probability(current_hand.cards)
             })
             return
 
         # Rekursive Erweiterung nur mit verfügbaren Karten
         for card in self.deck.get_available_cards():
             if original_frequencies[card] > 0:  # Nur Karten nutzen, die noch verfügbar sind
-                next_hand = current_hand + [card]
+                current_hand.push(card)
 
                 # Reduziere die Verfügbarkeit der Karte temporär
                 original_frequencies[card] -= 1
-                self._generate_dealer_hands_recursive(table_name, next_hand, start_card, original_frequencies, hands_to_insert)
+                self._generate_dealer_hands_recursive(table_name, current_hand, start_card, original_frequencies,
+                                                      hands_to_insert, task)
                 original_frequencies[card] += 1  # Wiederherstellung nach Rekursion
+                current_hand.pop()
 
     def just_generate_dealer_hands(self, start_card, deck):
         """
@@ -111,7 +149,8 @@ class DealerHands:
             dict: Verteilung der Dealer-Hände mit Wahrscheinlichkeiten für ≤16, 17, 18, 19, 20, 21, Blackjack und Bust.
         """
         dealer_hands = {}
-        self.just_generate_dealer_hands_recursive([start_card], deck, dealer_hands, no_blackjack=True if start_card in [10, 1] else False)
+        self.just_generate_dealer_hands_recursive([start_card], deck, dealer_hands,
+                                                  no_blackjack=self.rules.peek and start_card in [10, 1])
 
         # Normalisierung der Wahrscheinlichkeiten
         total_probability = sum(dealer_hands.values())
@@ -123,6 +162,139 @@ class DealerHands:
 
         return dealer_hands
 
+    def dealer_distribution(self, start_card, deck):
+        """
+        Liefert die Dealer-Verteilung wie just_generate_dealer_hands, verwendet aber den Cache.
+        Die Verteilung hängt nur von der Startkarte, dem Restdeck und den Dealer-Regeln (H17, Peek) ab.
+
+        Args:
+            start_card (int): Die erste Karte des Dealers.
+            deck (Deck): Instanz des Decks.
+
+        Returns:
+            dict: Verteilung der Dealer-Hände (Kopie des Cache-Eintrags).
+        """
+        key = self.cache_key(start_card, deck)
+        distribution = self.cache.get(key)
+        if distribution is None:
+            distribution = self.dealer_distribution_dp(start_card)
+            self.cache.put(key, distribution)
+        return dict(distribution)
+
+    @instrumented()
+    def dealer_distribution_dp(self, start_card, counts=None, memo=None):
+        """
+        Berechnet die Dealer-Verteilung per dynamischer Programmierung statt durch Aufzählen aller Kartenfolgen.
+        Zustände sind (harter Wert, Ass vorhanden, Restdeck); gleiche Zustände aus verschiedenen Reihenfolgen
+        werden nur einmal berechnet. Liefert dieselben Werte wie just_generate_dealer_hands.
+
+        Args:
+            start_card (int): Die erste Karte des Dealers.
+            counts (list[int], optional): Restdeck als Anzahlen der Karten 1 bis 10 (inklusive Startkarte).
+                                          Wenn None, wird das Deck des Objekts verwendet.
+            memo (dict, optional): Gemeinsamer DP-Speicher. Die Zustände hängen weder von der Startkarte noch
+                                   von der ursprünglichen Zusammensetzung ab, daher kann er über mehrere Aufrufe
+                                   (z. B. benachbarte Deck-Zusammensetzungen) geteilt werden; H17 ist Teil des Schlüssels.
+
+        Returns:
+            dict: Verteilung der Dealer-Hände mit Wahrscheinlichkeiten für 17, 18, 19, 20, 21, Blackjack und Bust.
+        """
+        counts = list(self.deck.state.counts if counts is None else counts)
+        if counts[start_card - 1] <= 0:
+            return {}
+        counts[start_card - 1] -= 1
+        total_cards = sum(counts)
+        no_blackjack = self.rules.peek and start_card in [10, 1]
+        if memo is None:
+            memo = {}
+
+        distribution = [0.0] * len(DEALER_OUTCOMES)
+        total_probability = 0.0
+        for card in range(1, 11):
+            count = counts[card - 1]
+            if count == 0:
+                continue
+            if no_blackjack and card + start_card == 11:
+                continue  # Verhindere Blackjack nach Start mit 10 oder Ass
+            probability = count / total_cards
+            total_probability += probability
+
+            hard = start_card + card
+            soft = start_card == 1 or card == 1
+            if soft and hard == 11:
+                distribution[5] += probability  # Blackjack
+                continue
+
+            counts[card - 1] -= 1
+            outcome = self._dealer_dp(hard, soft, tuple(counts), total_cards - 1, memo)
+            counts[card - 1] += 1
+            for i, value in enumerate(outcome):
+                distribution[i] += probability * value
+
+        if total_probability <= 0:
+            return {}
+        return {key: value / total_probability for key, value in zip(DEALER_OUTCOMES, distribution) if value > 0}
+
+    def _dealer_dp(self, hard, soft, counts, total_cards, memo):
+        """
+        Rekursiver DP-Schritt für dealer_distribution_dp.
+
+        Args:
+            hard (int): Harter Wert der Dealer-Hand (Asse als 1).
+            soft (bool): Ob die Hand mindestens ein Ass enthält.
+            counts (tuple[int]): Restdeck als Anzahlen der Karten 1 bis 10.
+            total_cards (int): Summe von counts.
+            memo (dict): Bereits berechnete Zustände.
+
+        Returns:
+            list[float]: Wahrscheinlichkeiten in der Reihenfolge von DEALER_OUTCOMES.
+        """
+        outcome = [0.0] * len(DEALER_OUTCOMES)
+        if hard > 21:
+            outcome[6] = 1.0
+            return outcome
+        total_value = hard + 10 if soft and hard <= 11 else hard
+        if total_value >= self.dealer_threshold and self.rules.dealer_stands(total_value, total_value != hard):
+            outcome[total_value - 17] = 1.0
+            return outcome
+
+        key = (hard, soft, counts, self.rules.hit_soft_17)
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+
+        if total_cards > 0:
+            next_counts = list(counts)
+            for card in range(1, 11):
+                count = counts[card - 1]
+                if count == 0:
+                    continue
+                probability = count / total_cards
+                next_counts[card - 1] -= 1
+                child = self._dealer_dp(hard + card, soft or card == 1, tuple(next_counts), total_cards - 1, memo)
+                next_counts[card - 1] += 1
+                for i, value in enumerate(child):
+                    outcome[i] += probability * value
+
+        memo[key] = outcome
+        return outcome
+
+    def cache_key(self, start_card, deck):
+        """
+        Erstellt den Cache-Schlüssel aus Startkarte, Restdeck und Dealer-Regeln.
+
+        Args:
+            start_card (int): Die erste Karte des Dealers.
+            deck (Deck): Instanz des Decks.
+
+        Returns:
+            tuple: Hashbarer Schlüssel.
+        """
+        remaining = self.deck.snapshot()
+        available = tuple(deck.original_card_frequencies.get(card, 0) for card in range(1, 11))
+        rules = (self.dealer_threshold, self.rules.peek and start_card in [10, 1], self.rules.dealer_key())
+        return start_card, remaining, available, rules
+
     def just_generate_dealer_hands_recursive(self, current_hand, deck, dealer_hands, no_blackjack=False):
         """
         Rekursive Funktion zur Generierung aller möglichen Dealer-Hände und deren Wahrscheinlichkeiten.
@@ -147,8 +319,8 @@ class DealerHands:
             dealer_hands["Bust"] = dealer_hands.get("Bust", 0) + hand_prob
             return hand_prob
 
-        # Falls mindestens 17 erreicht wurde, Hand speichern
-        if total_value >= 17:
+        # Falls der Dealer steht (ab 17, bei H17 nicht auf Soft 17), Hand speichern
+        if total_value >= 17 and self.rules.dealer_stands(total_value, total_value != minimum_value):
             key = "Blackjack" if total_value == 21 and len(current_hand) == 2 else str(total_value)
             dealer_hands[key] = dealer_hands.get(key, 0) + hand_prob
             return hand_prob
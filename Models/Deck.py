@@ -1,23 +1,122 @@
+from collections.abc import MutableMapping
+
 deck_count = 1  #Globale Variable für die Anzahl der Decks, Standard für Testzwecke ist 1 für ein Deck aus 52 Karten, Standard für Kasinos ist 6 Decks aus zusammen 312 Karten.
 
+
+class DeckState:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, counts):
+        """
+        Kompakte Darstellung eines Decks: feste Liste mit 10 Anzahlen (Index 0 = Ass, Index 9 = Zehn)
+        und laufende Gesamtzahl der Karten.
+
+        Args:
+            counts (list[int]): Anzahlen der Karten 1 bis 10.
+        """
+        self.counts = list(counts)
+        self.total = sum(self.counts)
+
+    def remove(self, card):
+        """
+        Entfernt eine Karte in O(1).
+
+        Args:
+            card (int): Die Karte, die entfernt werden soll (Wert zwischen 1 und 10).
+
+        Raises:
+            ValueError: Wenn die Karte nicht verfügbar ist.
+        """
+        if self.counts[card - 1] <= 0:
+            raise ValueError(f"Karte {card} ist nicht mehr im Deck verfügbar.")
+        self.counts[card - 1] -= 1
+        self.total -= 1
+
+    def restore(self, card):
+        """Fügt eine Karte in O(1) zurück ins Deck."""
+        self.counts[card - 1] += 1
+        self.total += 1
+
+    def count(self, card):
+        """Gibt die Anzahl der verbleibenden Karten eines Werts zurück."""
+        return self.counts[card - 1]
+
+    def snapshot(self):
+        """
+        Gibt einen unveränderlichen, hashbaren Schnappschuss zurück, z. B. als Cache-Schlüssel.
+
+        Returns:
+            tuple: Die Anzahlen der Karten 1 bis 10.
+        """
+        return tuple(self.counts)
+
+    def copy(self):
+        """Erstellt eine Kopie des Zustands."""
+        new_state = DeckState.__new__(DeckState)
+        new_state.counts = self.counts.copy()
+        new_state.total = self.total
+        return new_state
+
+
+class _CardFrequencies(MutableMapping):
+    """Dictionary-Ansicht (Kartenwert -> Anzahl) auf einen DeckState, damit bestehender Code weiter funktioniert."""
+    __slots__ = ("_state",)
+
+    def __init__(self, state):
+        self._state = state
+
+    def __getitem__(self, card):
+        if not isinstance(card, int) or not 1 <= card <= 10:
+            raise KeyError(card)
+        return self._state.counts[card - 1]
+
+    def __setitem__(self, card, value):
+        if not isinstance(card, int) or not 1 <= card <= 10:
+            raise KeyError(card)
+        self._state.total += value - self._state.counts[card - 1]
+        self._state.counts[card - 1] = value
+
+    def __delitem__(self, card):
+        raise TypeError("Karten können nicht aus der Häufigkeitstabelle gelöscht werden.")
+
+    def __iter__(self):
+        return iter(range(1, 11))
+
+    def __len__(self):
+        return 10
+
+    def copy(self):
+        """Gibt ein gewöhnliches Dictionary mit den aktuellen Häufigkeiten zurück."""
+        return dict(zip(range(1, 11), self._state.counts))
+
+    def __repr__(self):
+        return repr(self.copy())
+
+
 class Deck:
-    def __init__(self):
-        """Erstellt ein Deck mit Kartenwerten von 1 bis 10 und ihren Häufigkeiten."""
-        self.deck_count = {deck_count}
-        # Häufigkeiten pro Karte in einem Standarddeck
-        self.card_frequencies = {
-            1: 4 * deck_count,  # Ass
-            2: 4 * deck_count,
-            3: 4 * deck_count,
-            4: 4 * deck_count,
-            5: 4 * deck_count,
-            6: 4 * deck_count,
-            7: 4 * deck_count,
-            8: 4 * deck_count,
-            9: 4 * deck_count,
-            10: 16 * deck_count,  # 10, Bube, Dame, König
-        }
+    def __init__(self, deck_count=None):
+        """
+        Erstellt ein Deck mit Kartenwerten von 1 bis 10 und ihren Häufigkeiten.
+
+        Args:
+            deck_count (int, optional): Anzahl der Decks. Wenn None, wird die globale Variable deck_count verwendet.
+        """
+        if deck_count is None:
+            deck_count = globals()["deck_count"]
+        self.deck_count = deck_count
+        # Häufigkeiten pro Karte in einem Standarddeck: Ass bis 9 je 4-mal, 10, Bube, Dame, König zusammen 16-mal
+        self.state = DeckState([4 * deck_count] * 9 + [16 * deck_count])
         self.original_card_frequencies = self.card_frequencies.copy()
+        self._available_cards = [card for card, freq in self.original_card_frequencies.items() if freq > 0]
+
+    @property
+    def card_frequencies(self):
+        """Aktuelle Häufigkeiten als Dictionary-Ansicht (Kartenwert -> Anzahl) auf den DeckState."""
+        return _CardFrequencies(self.state)
+
+    @card_frequencies.setter
+    def card_frequencies(self, frequencies):
+        self.state = DeckState([frequencies.get(card, 0) for card in range(1, 11)])
 
 
     def remove_card(self, card):
@@ -30,27 +129,25 @@ class Deck:
         Raises:
             ValueError: Wenn die Karte nicht verfügbar ist.
         """
-        if self.card_frequencies[card] > 0:
-            self.card_frequencies[card] -= 1
-        else:
-            raise ValueError(f"Karte {card} ist nicht mehr im Deck verfügbar.")
+        self.state.remove(card)
 
 
     def restore_card(self, card):
         """Fügt eine Karte zurück ins Deck."""
-        self.card_frequencies[card] += 1
+        self.state.restore(card)
 
 
     def get_available_cards(self):
         """
         Gibt eine Liste der Kartenwerte zurück, die im Deck verfügbar sind.
+        Die Liste wird einmalig beim Erstellen berechnet und darf nicht verändert werden.
         """
-        return [card for card, freq in self.original_card_frequencies.items() if freq > 0]
+        return self._available_cards
 
 
     def total_cards(self):
-        """Berechnet die Gesamtzahl der Karten im Deck."""
-        return sum(self.card_frequencies.values())
+        """Gibt die Gesamtzahl der Karten im Deck zurück (wird laufend mitgeführt)."""
+        return self.state.total
 
 
     def get_missing_cards(self):
@@ -59,9 +156,9 @@ class Deck:
         Gibt ein Wörterbuch zurück, das die fehlenden Karten und deren Häufigkeiten darstellt.
         """
         return {
-            card: self.original_card_frequencies[card] - self.card_frequencies.get(card, 0)
+            card: self.original_card_frequencies[card] - self.state.counts[card - 1]
             for card in self.original_card_frequencies
-            if self.original_card_frequencies[card] > self.card_frequencies.get(card, 0)
+            if self.original_card_frequencies[card] > self.state.counts[card - 1]
         }
 
 
@@ -72,7 +169,17 @@ class Deck:
         Returns:
             list: Eine Liste von Häufigkeiten für jede Karte von 1 bis 10.
         """
-        return [self.card_frequencies.get(card, 0) for card in range(1, 11)]
+        return self.state.counts.copy()
+
+
+    def snapshot(self):
+        """
+        Gibt einen hashbaren Schnappschuss der aktuellen Kartenanzahlen zurück.
+
+        Returns:
+            tuple: Die Anzahlen der Karten 1 bis 10.
+        """
+        return self.state.snapshot()
 
 
     def copy(self):
@@ -82,6 +189,34 @@ class Deck:
         Returns:
             Deck: Eine Kopie des aktuellen Decks.
         """
-        new_deck = Deck()
-        new_deck.card_frequencies = self.card_frequencies.copy()
-        return new_deck
\ No newline at end of file
+        new_deck = Deck.__new__(Deck)
+        new_deck.deck_count = self.deck_count
+        new_deck.state = self.state.copy()
+        new_deck.original_card_frequencies = self.original_card_frequencies.copy()
+        new_deck._available_cards = self._available_cards
+        return new_deck
+
+
+    def without(self, removed_counts):
+        """
+        Erstellt ein neues Deck, aus dem Karten dauerhaft entfernt sind (andere Zusammensetzung).
+        Anders als bei remove_card sind die Karten auch in original_card_frequencies nicht mehr enthalten.
+
+        Args:
+            removed_counts (list[int] or tuple[int]): Anzahl der entfernten Karten 1 bis 10.
+
+        Returns:
+            Deck: Das Deck mit der neuen Zusammensetzung.
+
+        Raises:
+            ValueError: Wenn mehr Karten entfernt werden sollen, als im Deck sind.
+        """
+        counts = [count - removed for count, removed in zip(self.state.counts, removed_counts)]
+        if any(count < 0 for count in counts):
+            raise ValueError(f"Es können nicht mehr Karten entfernt werden, als im Deck sind: {list(removed_counts)}")
+        new_deck = Deck.__new__(Deck)
+        new_deck.deck_count = self.deck_count
+        new_deck.state = DeckState(counts)
+        new_deck.original_card_frequencies = new_deck.card_frequencies.copy()
+        new_deck._available_cards = [card for card, freq in new_deck.original_card_frequencies.items() if freq > 0]
+        return new_deck
@@ -0,0 +1,110 @@
+from Models.Hand_state import HandState
+import Utility.Calculations as calc
+
+
+class HandCatalogue:
+    def __init__(self, deck):
+        """
+        Verzeichnis aller Spielerhände (sortiert, minimum_value <= 21) eines Decks mit ihren statischen Eigenschaften.
+        Die Eigenschaften hängen nicht von der Dealer-Karte ab und werden daher nur einmal pro Deck berechnet.
+        Alle Werte liegen in flachen Listen, der Index einer Hand ist ihre Position in der sortierten
+        Tiefensuche (dieselbe Reihenfolge wie bei generate_full_player_hands_recursive).
+
+        Args:
+            deck (Deck): Instanz des Decks, dessen original_card_frequencies die verfügbaren Karten festlegen.
+        """
+        self.limits = [deck.original_card_frequencies.get(card, 0) for card in range(1, 11)]
+        self.cards = []          # Karten der Hand in sortierter Reihenfolge (Tupel)
+        self.counts = []         # Kartenzählung 1 bis 10 (Tupel)
+        self.total_value = []
+        self.minimum_value = []
+        self.is_starthand = []
+        self.is_blackjack = []
+        self.can_double = []
+        self.can_split = []
+        self.frequency = []
+        self.parent = []         # Index der Hand ohne die letzte Karte (-1 für die leere Hand)
+        self.children = []       # Pro Hand 10 Indizes der Folgehände nach Ziehen der Karten 1 bis 10 (-1 = Bust/nicht verfügbar)
+        self.index = {}          # Kartenzählung -> Index
+
+        self._build(HandState(), 1, -1, deck)
+        for counts in self.counts:
+            self.children.append([self._child_index(counts, card) for card in range(1, 11)])
+
+    def __len__(self):
+        return len(self.cards)
+
+    def _build(self, hand, start_card, parent, deck):
+        """
+        Rekursive, sortierte Tiefensuche, die die Hände in die flachen Listen einträgt.
+
+        Args:
+            hand (HandState): Die aktuelle Hand, wird per push/pop fortgeschrieben.
+            start_card (int): Die minimale Karte, die hinzugefügt werden darf.
+            parent (int): Index der Elternhand.
+            deck (Deck): Instanz des Decks.
+        """
+        if hand.minimum_value > 21:
+            return
+
+        index = len(self.cards)
+        total_value = hand.total_value
+        is_starthand = len(hand) == 2
+
+        self.cards.append(tuple(hand.cards))
+        self.counts.append(tuple(hand.counts))
+        self.total_value.append(total_value)
+        self.minimum_value.append(hand.minimum_value)
+        self.is_starthand.append(is_starthand)
+        self.is_blackjack.append(total_value == 21 and is_starthand)
+        self.can_double.append(is_starthand and total_value < 21)
+        self.can_split.append(is_starthand and hand[0] == hand[1])
+        self.frequency.append(calc.hand_frequency(hand, deck))
+        self.parent.append(parent)
+        self.index[self.counts[-1]] = index
+
+        for card in range(start_card, 11):
+            if hand.count(card) < self.limits[card - 1]:
+                hand.push(card)
+                self._build(hand, card, index, deck)
+                hand.pop()
+
+    def _child_index(self, counts, card):
+        """Gibt den Index der Hand nach Ziehen einer Karte zurück oder -1, falls sie nicht existiert."""
+        child_counts = list(counts)
+        child_counts[card - 1] += 1
+        return self.index.get(tuple(child_counts), -1)
+
+    def find(self, counts):
+        """
+        Sucht eine Hand anhand ihrer Kartenzählung.
+
+        Args:
+            counts (list[int] or tuple[int]): Kartenzählung 1 bis 10.
+
+        Returns:
+            int: Index der Hand oder -1, falls sie nicht im Verzeichnis ist.
+        """
+        return self.index.get(tuple(counts), -1)
+
+
+# Einmal erstellte Verzeichnisse pro Deck-Konfiguration
+_catalogues = {}
+
+
+def get_catalogue(deck):
+    """
+    Gibt das Handverzeichnis für die Deck-Konfiguration zurück und erstellt es nur beim ersten Aufruf.
+
+    Args:
+        deck (Deck): Instanz des Decks.
+
+    Returns:
+        HandCatalogue: Das Verzeichnis für dieses Deck.
+    """
+    key = (tuple(deck.original_card_frequencies.get(card, 0) for card in range(1, 11)), deck.snapshot())
+    catalogue = _catalogues.get(key)
+    if catalogue is None:
+        catalogue = HandCatalogue(deck)
+        _catalogues[key] = catalogue
+    return catalogue
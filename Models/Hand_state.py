@@ -0,0 +1,73 @@
+class HandState:
+    __slots__ = ("cards", "counts", "hard_total", "aces", "length")
+
+    def __init__(self, cards=None):
+        """
+        Inkrementeller Zustand einer Hand für die rekursiven Generatoren.
+        Harter Wert, Anzahl der Asse, Kartenzählung und Länge werden bei push/pop in O(1) mitgeführt.
+
+        Args:
+            cards (list[int], optional): Karten, mit denen die Hand startet.
+        """
+        self.cards = []
+        self.counts = [0] * 10
+        self.hard_total = 0
+        self.aces = 0
+        self.length = 0
+        for card in cards or []:
+            self.push(card)
+
+    def push(self, card):
+        """Fügt der Hand eine Karte hinzu."""
+        self.cards.append(card)
+        self.counts[card - 1] += 1
+        self.hard_total += card
+        self.length += 1
+        if card == 1:
+            self.aces += 1
+
+    def pop(self):
+        """
+        Entfernt die zuletzt hinzugefügte Karte.
+
+        Returns:
+            int: Die entfernte Karte.
+        """
+        card = self.cards.pop()
+        self.counts[card - 1] -= 1
+        self.hard_total -= card
+        self.length -= 1
+        if card == 1:
+            self.aces -= 1
+        return card
+
+    @property
+    def minimum_value(self):
+        """Minimalwert der Hand (alle Asse zählen 1)."""
+        return self.hard_total
+
+    @property
+    def total_value(self):
+        """Wert der Hand, ein Ass zählt 11, solange die Hand dadurch nicht über 21 kommt."""
+        if self.aces and self.hard_total <= 11:
+            return self.hard_total + 10
+        return self.hard_total
+
+    def count(self, card):
+        """Gibt zurück, wie oft eine Karte in der Hand vorkommt."""
+        return self.counts[card - 1]
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __str__(self):
+        return str(self.cards)
+
+    def __repr__(self):
+        return f"HandState({self.cards})"
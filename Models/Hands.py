@@ -1,28 +1,68 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
 from Models.Deck import Deck
 from Models.Dealer_hands import DealerHands
+from Models.Hand_catalogue import get_catalogue
+from Models.Hand_state import HandState
+from Models.Rules import Rules
 from Utility.DB import DatabaseManager
+from Utility.Instrumentation import instrumented
+from Utility.Progress import ProgressReporter, QUIET
 import Utility.Calculations as calc
 
+
+def _full_player_hand_rows(deck, dealer_card, game_deck, rules=None):
+    """
+    Worker-Funktion für die parallele Generierung: erzeugt alle Spielerhände für eine Dealer-Startkarte
+    und gibt sie als fertige Datenbankzeilen zurück. Der Worker schreibt nicht selbst in die Datenbank.
+
+    Args:
+        deck (Deck): Das Deck des Hands-Objekts.
+        dealer_card (int or str): Die Dealer-Startkarte oder 'Blackjack'.
+        game_deck (Deck): Das Deck, mit dem die Wahrscheinlichkeiten berechnet werden.
+        rules (Rules, optional): Spielregeln für die Dealer-Verteilung.
+
+    Returns:
+        list[list]: Die Zeilen in der Reihenfolge von FULL_HAND_COLUMNS.
+    """
+    hands_generator = Hands(deck, None, rules, progress=ProgressReporter(QUIET))
+    return [DatabaseManager._full_hand_row(hand_data)
+            for hand_data in hands_generator.iter_full_player_hands([dealer_card], game_deck)]
+
+
 class Hands:
-    def __init__(self, deck, db_manager):
+    def __init__(self, deck, db_manager, rules=None, progress=None):
         """
         Initialisiert die Hands-Klasse.
 
         Args:
             deck (Deck): Das ursprüngliche Deck, das für die Hand-Generierung verwendet wird.
             db_manager (DatabaseManager): Datenbankmanager zum Speichern der generierten Hände.
+            rules (Rules, optional): Spielregeln für die Dealer-Verteilung. Standard sind die Regeln des
+                                     Datenbankmanagers bzw. die Standardregeln.
+            progress (ProgressReporter, optional): Fortschrittsanzeige der Spielerhände. Standard ist ein
+                                                   ProgressReporter mit gedrosselten Meldungen.
         """
         self.deck = deck
         self.db_manager = db_manager
+        if rules is None:
+            rules = getattr(db_manager, "rules", None) or Rules()
+        self.rules = rules
+        self.progress = progress if progress is not None else ProgressReporter()
 
 
-    def generate_and_save_hands(self, missing_cards=None):
+    @instrumented()
+    def generate_and_save_hands(self, missing_cards=None, stream=True):
         """
         Generiert und speichert alle möglichen Hände mit einem maximalen minimum_value von 21.
         Die Hände werden sortiert generiert und gespeichert.
 
         Args:
             missing_cards (list, optional): Liste von Karten, deren Häufigkeit im Deck reduziert werden soll.
+            stream (bool): Wenn True, werden die Hände einzeln erzeugt und blockweise gespeichert, sodass der
+                           Speicherbedarf unabhängig von der Anzahl der Hände bleibt. Wenn False, werden erst
+                           alle Hände gesammelt und dann gespeichert.
         """
         # Kopie der Originalfrequenzen, um Änderungen vorzunehmen
         adjusted_frequencies = self.deck.original_card_frequencies.copy()
@@ -33,7 +73,26 @@ class Hands:
                 if card in adjusted_frequencies:
                     adjusted_frequencies[card] = max(0, adjusted_frequencies[card] - 1)  # Verhindert negative Werte
 
-        self.generate_hands_recursive([], 1, [], adjusted_frequencies)
+        hands = self.iter_hands(adjusted_frequencies)
+        if not stream:
+            hands = list(hands)
+        count = self.db_manager.save_hands("hands", hands)
+        print(f"{count} Hände wurden erfolgreich gespeichert.")
+
+
+    def iter_hands(self, adjusted_frequencies=None):
+        """
+        Erzeugt alle möglichen Hände in sortierter Reihenfolge als Generator.
+
+        Args:
+            adjusted_frequencies (dict, optional): Angepasste Kartenzählung nach Abzug der missing_cards.
+
+        Yields:
+            dict: Die Hand mit ihren Eigenschaften (Format wie für save_hands).
+        """
+        if adjusted_frequencies is None:
+            adjusted_frequencies = self.deck.original_card_frequencies.copy()
+        return self._iter_hands_recursive(HandState(), 1, adjusted_frequencies)
 
 
     def generate_hands_recursive(self, current_hand=None, start_card=1, hands_to_insert=None, adjusted_frequencies=None):
@@ -41,27 +100,48 @@ class Hands:
         Rekursive Funktion zur Generierung von Händen in sortierter Reihenfolge.
 
         Args:
-            current_hand (list): Die aktuelle Hand als Liste der Kartenzahlen.
+            current_hand (list or HandState): Die aktuelle Hand als Liste der Kartenzahlen oder als HandState,
+                                              der während der Rekursion per push/pop fortgeschrieben wird.
             start_card (int): Die minimale Karte, die in dieser Iteration hinzugefügt werden darf.
             hands_to_insert (list): Liste der gesammelten Hände für den Batch-Insert.
             adjusted_frequencies (dict): Angepasste Kartenzählung nach Abzug der missing_cards.
         """
-        if current_hand is None:
-            current_hand = []
+        if not isinstance(current_hand, HandState):
+            current_hand = HandState(current_hand)
         if hands_to_insert is None:
             hands_to_insert = []  # Initialisierung hier innerhalb der Methode
         if adjusted_frequencies is None:
             adjusted_frequencies = self.deck.original_card_frequencies.copy()  # Falls keine Änderungen nötig sind
 
+        hands_to_insert.extend(self._iter_hands_recursive(current_hand, start_card, adjusted_frequencies))
+
+        # Nach der Rekursion: Alle Hände auf einmal speichern
+        if not current_hand:  # Nur nach der vollständigen Generierung speichern
+            self.db_manager.save_hands("hands", hands_to_insert)
+            print(f"{len(hands_to_insert)} Hände wurden erfolgreich gespeichert.")
+
+
+    def _iter_hands_recursive(self, current_hand, start_card, adjusted_frequencies):
+        """
+        Rekursiver Generator hinter iter_hands und generate_hands_recursive.
+
+        Args:
+            current_hand (HandState): Die aktuelle Hand, wird per push/pop fortgeschrieben.
+            start_card (int): Die minimale Karte, die in dieser Iteration hinzugefügt werden darf.
+            adjusted_frequencies (dict): Angepasste Kartenzählung nach Abzug der missing_cards.
+
+        Yields:
+            dict: Die Hand mit ihren Eigenschaften.
+        """
         # Berechne den Minimalwert der aktuellen Hand
-        minimum_value = calc.hand_value(current_hand, minimum=True)
+        minimum_value = current_hand.minimum_value
 
         # Abbruchbedingung: Wenn der Mindestwert der Hand > 21 ist, keine weitere Berechnung
         if minimum_value > 21:
             return
 
         # Berechne den Gesamtwert der aktuellen Hand
-        total_value = calc.hand_value(current_hand)
+        total_value = current_hand.total_value
 
         # Eigenschaften der Hand berechnen
         is_starthand = len(current_hand) == 2
@@ -71,15 +151,15 @@ class Hands:
         can_split = is_starthand and current_hand[0] == current_hand[1]
 
         # Häufigkeit der aktuellen Hand berechnen
-        frequency = calc.hand_frequency(current_hand)
+        frequency = calc.hand_frequency(current_hand, self.deck)
 
         # Wahrscheinlichkeit zu überbieten
-        bust_chance = calc.bust_probability(current_hand)
+        bust_chance = calc.bust_probability(current_hand, self.deck)
 
-        # Hand in die Liste aufnehmen
-        hands_to_insert.append({
-            "hands_type": "player",
-            "hand": current_hand.copy(),
+        # Hand ausgeben
+        yield {
+            "hand_type": "player",
+            "hand": current_hand.cards.copy(),
             "start_card": None,
             "total_value": total_value,
             "minimum_value": minimum_value,
@@ -91,88 +171,194 @@ class Hands:
             "bust_chance": bust_chance,
             "frequency": frequency,
             "probability": 0.0  # nicht erforderlich
-        })
+        }
 
         # Erzeuge neue Hände, indem jede mögliche Karte zur aktuellen Hand hinzugefügt wird
         for card in self.deck.get_available_cards():
             if card >= start_card:  # Nur Karten hinzufügen, die >= der letzten Karte sind
-                next_hand = current_hand + [card]  # Füge die Karte zur aktuellen Hand hinzu
-
                 # Überprüfe, ob die Karte noch verfügbar ist (nicht mehr als erlaubt vorhanden)
-                if next_hand.count(card) <= adjusted_frequencies[card]:
-                    self.generate_hands_recursive(next_hand, card, hands_to_insert,
-                                                  adjusted_frequencies)  # Jetzt korrekt
-
-        # Nach der Rekursion: Alle Hände auf einmal speichern
-        if not current_hand:  # Nur nach der vollständigen Generierung speichern
-            self.db_manager.save_hands("hands", hands_to_insert)
-            print(f"{len(hands_to_insert)} Hände wurden erfolgreich gespeichert.")
+                if current_hand.count(card) < adjusted_frequencies[card]:
+                    current_hand.push(card)  # Füge die Karte zur aktuellen Hand hinzu
+                    yield from self._iter_hands_recursive(current_hand, card, adjusted_frequencies)
+                    current_hand.pop()
 
 
-    def generate_and_save_full_player_hands(self, dealer_cards=None, deck=None):
+    @instrumented()
+    def generate_and_save_full_player_hands(self, dealer_cards=None, deck=None, stream=True, jobs=1):
         """
         Generiert und speichert alle möglichen Spielerhände unter Berücksichtigung der bekannten Dealer-Karten.
 
         Args:
             dealer_cards (list[int], optional): Bekannte Karten des Dealers.
             deck (Deck, optional): Instanz des Decks.
+            stream (bool): Wenn True, werden die Hände einzeln erzeugt und blockweise gespeichert.
+                           Wenn False, werden erst alle Hände gesammelt und dann gespeichert.
+            jobs (int): Anzahl der Prozesse. Bei jobs > 1 werden die Dealer-Startkarten auf einen
+                        ProcessPoolExecutor verteilt; nur dieser Prozess schreibt in die Datenbank.
+        """
+        if jobs > 1:
+            self._generate_and_save_full_player_hands_parallel(dealer_cards, deck, jobs)
+            return
+
+        hands = self.iter_full_player_hands(dealer_cards, deck)
+        if not stream:
+            hands = list(hands)
+
+        # Hände speichern, bei stream=True blockweise während der Generierung
+        count = self.db_manager.save_full_hands("Full_player_hands", hands)
+        print(f"{count} Spielerhände gespeichert.")
+
+    def _generate_and_save_full_player_hands_parallel(self, dealer_cards, deck, jobs):
+        """
+        Verteilt die Dealer-Startkarten auf mehrere Prozesse. Die Worker liefern fertige Zeilen zurück,
+        die in der Reihenfolge der Startkarten gespeichert werden, sodass das Ergebnis dem seriellen Lauf entspricht.
+
+        Args:
+            dealer_cards (list[int], optional): Bekannte Karten des Dealers.
+            deck (Deck, optional): Instanz des Decks.
+            jobs (int): Anzahl der Prozesse.
         """
         if deck is None:
             deck = Deck()
 
-        hands_to_insert = []
+        possible_dealer_cards = self._possible_dealer_cards(dealer_cards)
+        with ProcessPoolExecutor(max_workers=min(jobs, len(possible_dealer_cards))) as executor:
+            batches = executor.map(_full_player_hand_rows, [self.deck] * len(possible_dealer_cards),
+                                   possible_dealer_cards, [deck] * len(possible_dealer_cards),
+                                   [self.rules] * len(possible_dealer_cards))
+            with self.progress.task("Spielerhände", total=len(possible_dealer_cards)) as task:
+                count = self.db_manager.save_full_hand_rows(
+                    "Full_player_hands", chain.from_iterable(self._track_batches(task, possible_dealer_cards, batches)))
+        print(f"{count} Spielerhände gespeichert.")
+
+    @staticmethod
+    def _track_batches(task, dealer_cards, batches):
+        """Meldet den Fortschritt der parallelen Generierung, sobald ein Worker seine Dealer-Karte abgeschlossen hat."""
+        for dealer_card, rows in zip(dealer_cards, batches):
+            task.begin_unit(dealer_card, total=len(rows))
+            task.advance(len(rows))
+            yield rows
+
+    def _possible_dealer_cards(self, dealer_cards=None):
+        """
+        Bestimmt die zu durchlaufenden Dealer-Startkarten.
+
+        Args:
+            dealer_cards (list[int] or int, optional): Bekannte Karten des Dealers. Wenn None, werden alle
+                                                       Startkarten und 'Blackjack' durchlaufen.
 
-        # Falls keine spezifischen Dealer-Karten vorgegeben sind, alle möglichen durchlaufen
+        Returns:
+            list: Die Dealer-Startkarten.
+        """
         if dealer_cards is None:
-            possible_dealer_cards = ["Blackjack"] + self.deck.get_available_cards()
-        else:
-            possible_dealer_cards = [dealer_cards] if isinstance(dealer_cards, int) else dealer_cards
+            return ["Blackjack"] + self.deck.get_available_cards()
+        return [dealer_cards] if isinstance(dealer_cards, int) else dealer_cards
 
-        # Generiere alle möglichen Hände für jede Dealer-Startkarte
-        for dealer_card in possible_dealer_cards:
-            self.generate_full_player_hands_recursive([], 1, [dealer_card], hands_to_insert, deck)
+    def iter_full_player_hands(self, dealer_cards=None, deck=None):
+        """
+        Erzeugt alle möglichen Spielerhände für jede Dealer-Startkarte als Generator.
 
-        # Nach dem Durchlauf alle Hände speichern
-        self.db_manager.save_full_hands("Full_player_hands", hands_to_insert)
-        print(f"{len(hands_to_insert)} Spielerhände gespeichert.")
+        Args:
+            dealer_cards (list[int], optional): Bekannte Karten des Dealers. Wenn None, werden alle Startkarten
+                                                und 'Blackjack' durchlaufen.
+            deck (Deck, optional): Instanz des Decks.
+
+        Yields:
+            dict: Die Spielerhand mit ihren Eigenschaften (Format wie für save_full_hands).
+        """
+        if deck is None:
+            deck = Deck()
+
+        # Generiere alle möglichen Hände für jede Dealer-Startkarte; der Fortschritt wird pro Dealer-Karte gemeldet
+        possible_dealer_cards = self._possible_dealer_cards(dealer_cards)
+        with self.progress.task("Spielerhände", total=len(possible_dealer_cards)) as task:
+            for dealer_card in possible_dealer_cards:
+                task.begin_unit(dealer_card, total=None if dealer_card == "Blackjack" else len(get_catalogue(deck)))
+                for hand in self._iter_full_player_hands_recursive(HandState(), 1, [dealer_card], deck):
+                    task.advance()
+                    if task.verbose:
+                        task.detail(f"Spielerhand: {hand['hand']}, Dealer Start: {hand['dealer_start']}")
+                    yield hand
 
     def generate_full_player_hands_recursive(self, current_hand=None, start_card=1, dealer_cards=None, hands_to_insert=None, deck=None):
         """
         Rekursive Funktion zur Generierung von Spielerhänden und Berechnung ihrer Wahrscheinlichkeiten.
 
         Args:
-            current_hand (list[int]): Die aktuelle Hand als Liste der Kartenzahlen.
+            current_hand (list[int] or HandState): Die aktuelle Hand als Liste der Kartenzahlen oder als HandState,
+                                                   der während der Rekursion per push/pop fortgeschrieben wird.
             start_card (int): Die minimale Karte, die in dieser Iteration hinzugefügt werden darf.
             dealer_cards (list[int]): Bekannte Karten des Dealers, die aus dem Deck entfernt werden.
             hands_to_insert (list): Liste der gesammelten Hände für den Batch-Insert.
             deck (Deck): Instanz des Decks.
         """
-        if current_hand is None:
-            current_hand = []
+        if not isinstance(current_hand, HandState):
+            current_hand = HandState(current_hand)
         if dealer_cards is None:
             dealer_cards = []
         if hands_to_insert is None:
             hands_to_insert = []
         if deck is None:
             deck = Deck()
-        dealer_hands = DealerHands(deck)
 
-        # Berechne den Minimalwert der aktuellen Hand
-        minimum_value = calc.hand_value(current_hand, minimum=True)
-        if minimum_value > 21:
+        hands_to_insert.extend(self._iter_full_player_hands_recursive(current_hand, start_card, dealer_cards, deck))
+
+    def _iter_full_player_hands_recursive(self, current_hand, start_card, dealer_cards, deck):
+        """
+        Rekursiver Generator hinter iter_full_player_hands und generate_full_player_hands_recursive.
+        Die von der Dealer-Karte unabhängigen Eigenschaften kommen aus dem Handverzeichnis des Decks,
+        hier werden nur noch die Wahrscheinlichkeiten und die Gewinn-/Verlustspalten berechnet.
+
+        Args:
+            current_hand (HandState): Die aktuelle Hand, wird per push/pop fortgeschrieben.
+            start_card (int): Die minimale Karte, die in dieser Iteration hinzugefügt werden darf.
+            dealer_cards (list[int]): Bekannte Karten des Dealers, die aus dem Deck entfernt werden.
+            deck (Deck): Instanz des Decks.
+
+        Yields:
+            dict: Die Spielerhand mit ihren Eigenschaften.
+        """
+        if current_hand.minimum_value > 21:
             return
 
-        # Berechne den Gesamtwert der aktuellen Hand
-        total_value = calc.hand_value(current_hand)
+        catalogue = get_catalogue(deck)
+        index = catalogue.find(current_hand.counts)
+        if index < 0:
+            return
 
-        # Eigenschaften der Hand berechnen
-        is_starthand = len(current_hand) == 2
-        is_blackjack = total_value == 21 and is_starthand
-        can_double = is_starthand and total_value < 21
-        can_split = is_starthand and current_hand[0] == current_hand[1]
+        # Verfügbare Anzahl pro Karte nach Abzug der bekannten Dealer-Karten
+        limits = [catalogue.limits[card - 1] - dealer_cards.count(card) for card in range(1, 11)]
 
-        # Häufigkeit der aktuellen Hand berechnen
-        frequency = calc.hand_frequency(current_hand)
+        # Die Dealer-Verteilung hängt nur von der Startkarte ab und wird einmal pro Durchlauf geholt
+        dealer_hand_distribution = {}
+        if dealer_cards and dealer_cards != ["Blackjack"]:
+            dealer_hand_distribution = DealerHands(deck, rules=self.rules).dealer_distribution(dealer_cards[0], deck)
+
+        yield from self._iter_catalogue(catalogue, index, current_hand, start_card, dealer_cards, deck, limits,
+                                        dealer_hand_distribution)
+
+    def _iter_catalogue(self, catalogue, index, current_hand, start_card, dealer_cards, deck, limits,
+                        dealer_hand_distribution):
+        """
+        Durchläuft das Handverzeichnis ab einer Hand über die Kind-Verweise für eine Dealer-Startkarte.
+
+        Args:
+            catalogue (HandCatalogue): Handverzeichnis des Decks.
+            index (int): Index der aktuellen Hand im Verzeichnis.
+            current_hand (HandState): Die aktuelle Hand, wird per push/pop fortgeschrieben.
+            start_card (int): Die minimale Karte, die in dieser Iteration hinzugefügt werden darf.
+            dealer_cards (list[int]): Bekannte Karten des Dealers, die aus dem Deck entfernt werden.
+            deck (Deck): Instanz des Decks.
+            limits (list[int]): Verfügbare Anzahl pro Karte nach Abzug der Dealer-Karten.
+            dealer_hand_distribution (dict): Verteilung der Dealer-Hände für die Startkarte.
+
+        Yields:
+            dict: Die Spielerhand mit ihren Eigenschaften.
+        """
+        # Statische Eigenschaften der Hand aus dem Verzeichnis
+        total_value = catalogue.total_value[index]
+        is_starthand = catalogue.is_starthand[index]
+        is_blackjack = catalogue.is_blackjack[index]
 
         # Berechne Wahrscheinlichkeiten für diese Hand
         hit_probabilities = calc.probability_distribution(current_hand, deck, dealer_cards)
@@ -198,26 +384,23 @@ class Hands:
             hit_stand = 0
             action = 'Hit'
         else:
-            dealer_hand_distribution = dealer_hands.just_generate_dealer_hands(dealer_cards[0], deck) if dealer_cards else {}
             win_stand, loss_stand, draw_stand = calc.stand_probabilities(total_value, is_blackjack, dealer_hand_distribution)
             win_hit, loss_hit, draw_hit = calc.hit_probabilities(dealer_hand_distribution, hit_probabilities)
             hit_stand = (win_hit - loss_hit) - (win_stand - loss_stand)
             action = 'Stand' if hit_stand < 0 else 'Hit'
 
-        print(f"Spielerhand: {current_hand}, Dealer Start: {dealer_cards}")
-
-        # Hand zur Liste hinzufügen
-        hands_to_insert.append({
+        # Hand ausgeben
+        yield {
             "hand_type": "player",
-            "hand": current_hand.copy(),
+            "hand": current_hand.cards.copy(),
             "dealer_start": dealer_cards.copy(),
             "total_value": total_value,
-            "minimum_value": minimum_value,
+            "minimum_value": catalogue.minimum_value[index],
             "is_blackjack": is_blackjack,
             "is_starthand": is_starthand,
-            "can_double": can_double,
-            "can_split": can_split,
-            "frequency": frequency,
+            "can_double": catalogue.can_double[index],
+            "can_split": catalogue.can_split[index],
+            "frequency": catalogue.frequency[index],
             "probability": 0.0,  # nicht erforderlich
             "probabilities": hit_probabilities,
             "win_hit": win_hit,
@@ -227,24 +410,18 @@ class Hands:
             "hit_stand": hit_stand,
             "action": action,
             "ev": 0.0   # wird erst später gefüllt
-        })
+        }
 
         # Falls der Dealer einen Blackjack hat und es eine Starthand ist, keine weiteren Karten hinzufügen
         if is_starthand and "Blackjack" in dealer_cards:
             return
 
-        # Erzeuge neue Hände
-        for card in deck.get_available_cards():
-            if card >= start_card:
-                next_hand = current_hand + [card]
-                if next_hand.count(card) <= deck.original_card_frequencies.get(card, 0) - dealer_cards.count(card):
-                    self.generate_full_player_hands_recursive(next_hand, card, dealer_cards, hands_to_insert, deck)
-
-
-
-
-
-
-
-
-
+        # Folgehände über die Kind-Verweise des Verzeichnisses erzeugen
+        children = catalogue.children[index]
+        for card in range(start_card, 11):
+            child = children[card - 1]
+            if child >= 0 and current_hand.count(card) < limits[card - 1]:
+                current_hand.push(card)
+                yield from self._iter_catalogue(catalogue, child, current_hand, card, dealer_cards, deck, limits,
+                                                dealer_hand_distribution)
+                current_hand.pop()
@@ -0,0 +1,130 @@
+from itertools import product
+
+
+class Rules:
+    # Reihenfolge der Regeln in key() und as_dict()
+    FIELDS = ("hit_soft_17", "blackjack_payout", "peek", "double_after_split", "max_split_hands",
+              "resplit_aces", "split_aces_one_card", "surrender")
+
+    def __init__(self, hit_soft_17=False, blackjack_payout=1.5, peek=True, double_after_split=True,
+                 max_split_hands=4, resplit_aces=False, split_aces_one_card=True, surrender=False):
+        """
+        Spielregeln, die an Dealer-, Spieler- und EV-Berechnung übergeben werden.
+        Die Standardwerte entsprechen den bisher fest eingebauten Annahmen.
+
+        Args:
+            hit_soft_17 (bool): Dealer zieht auf Soft 17 (H17) statt zu stehen (S17).
+            blackjack_payout (float): Auszahlung für einen Blackjack (1.5 = 3:2, 1.2 = 6:5).
+            peek (bool): Dealer schaut bei 10 oder Ass nach einem Blackjack. False = ENHC (keine verdeckte Karte),
+                         ein Dealer-Blackjack nimmt dann auch Double- und Split-Einsätze.
+            double_after_split (bool): Verdoppeln nach einem Split erlaubt.
+            max_split_hands (int): Maximale Anzahl Hände nach Resplits (2 = kein Resplit).
+            resplit_aces (bool): Asse dürfen erneut gesplittet werden.
+            split_aces_one_card (bool): Gesplittete Asse erhalten nur eine Karte.
+            surrender (bool): Aufgeben der Starthand (Late Surrender) gegen den halben Einsatz erlaubt.
+        """
+        self.hit_soft_17 = hit_soft_17
+        self.blackjack_payout = blackjack_payout
+        self.peek = peek
+        self.double_after_split = double_after_split
+        self.max_split_hands = max_split_hands
+        self.resplit_aces = resplit_aces
+        self.split_aces_one_card = split_aces_one_card
+        self.surrender = surrender
+
+    def key(self):
+        """
+        Hashbarer Schlüssel aller Regeln, Bestandteil der Cache-Schlüssel.
+
+        Returns:
+            tuple: Die Regelwerte in der Reihenfolge von FIELDS.
+        """
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def dealer_key(self):
+        """
+        Schlüssel der Regeln, von denen die Dealer-Verteilung abhängt.
+
+        Returns:
+            tuple: (hit_soft_17, peek).
+        """
+        return self.hit_soft_17, self.peek
+
+    def hand_key(self):
+        """
+        Schlüssel der Regeln, von denen die EVs der Hände (ohne Split und Surrender) abhängen.
+
+        Returns:
+            tuple: Dealer-Regeln und Blackjack-Auszahlung.
+        """
+        return self.dealer_key() + (self.blackjack_payout,)
+
+    def surrender_ev(self, dealer_blackjack=0.0):
+        """
+        EV der Aufgabe (Late Surrender). Ohne Peek (ENHC) nimmt ein Dealer-Blackjack trotzdem den ganzen Einsatz.
+
+        Args:
+            dealer_blackjack (float): Wahrscheinlichkeit eines Dealer-Blackjacks (wird nur ohne Peek berücksichtigt).
+
+        Returns:
+            float: -0.5 mit Peek, sonst -0.5 * (1 - dealer_blackjack) - dealer_blackjack.
+        """
+        if self.peek:
+            return -0.5
+        return -0.5 * (1 - dealer_blackjack) - dealer_blackjack
+
+    def dealer_stands(self, total_value, soft):
+        """
+        Prüft, ob der Dealer mit dieser Hand stehen bleibt.
+
+        Args:
+            total_value (int): Gesamtwert der Hand (ein Ass zählt 11, wenn möglich).
+            soft (bool): Ob ein Ass als 11 gezählt wird.
+
+        Returns:
+            bool: True, wenn der Dealer nicht weiter zieht.
+        """
+        if total_value == 17 and soft:
+            return not self.hit_soft_17
+        return total_value >= 17
+
+    def replace(self, **changes):
+        """
+        Erstellt eine Kopie mit geänderten Regeln.
+
+        Args:
+            **changes: Neue Werte für einzelne Regeln.
+
+        Returns:
+            Rules: Die neuen Regeln.
+        """
+        return Rules(**dict(self.as_dict(), **changes))
+
+    @classmethod
+    def matrix(cls, base=None, **variants):
+        """
+        Erzeugt alle Kombinationen der angegebenen Regelvarianten.
+
+        Args:
+            base (Rules, optional): Ausgangsregeln für alle nicht variierten Werte.
+            **variants: Pro Regel eine Liste möglicher Werte, z. B. hit_soft_17=[False, True].
+
+        Returns:
+            list[Rules]: Eine Regel-Instanz pro Kombination.
+        """
+        base = base if base is not None else cls()
+        names = list(variants)
+        return [base.replace(**dict(zip(names, values))) for values in product(*(variants[name] for name in names))]
+
+    def as_dict(self):
+        """Regeln als Dictionary."""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, Rules) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"Rules({', '.join(f'{field}={value!r}' for field, value in self.as_dict().items())})"
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Utility.Advisor import Advisor
+from Utility.DB import DatabaseManager
+import Utility.Calculations as calc
+
+class TestAdvisor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.temp_dir.name, "blackjack.db")
+        db_manager = DatabaseManager(cls.db_path)
+        db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), db_manager).generate_and_save_full_player_hands(dealer_cards=[2, 6, 10])
+        db_manager.get_ev_for_hands("Full_player_hands")
+        db_manager.create_and_fill_split_ev()
+        db_manager.create_and_fill_pair_overview()
+        db_manager.close()
+        cls.advisor = Advisor(cls.db_path)
+
+    def test_best_action_matches_db(self):
+        db_manager = DatabaseManager(self.db_path)
+        cursor = db_manager.connection.cursor()
+        # Hände bis 6 speichern in der Tabelle keine Hit-Wahrscheinlichkeiten (win_hit = 0, loss_hit = 1)
+        cursor.execute("""
+            SELECT hand_text, dealer_start, win_stand - loss_stand, ev, (win_hit - loss_hit) * 2
+            FROM Full_player_hands WHERE is_starthand = 1 AND is_blackjack = 0 AND total_value > 6
+        """)
+        for hand_text, dealer_start, stand_ev, ev, double_ev in cursor.fetchall():
+            result = self.advisor.best_action([int(card) for card in hand_text.split(",")], int(dealer_start))
+            self.assertAlmostEqual(result["ev"]["Stand"], stand_ev, places=12)
+            self.assertAlmostEqual(max(result["ev"]["Hit"], result["ev"]["Stand"]), ev, places=12)
+            self.assertAlmostEqual(result["ev"]["Double"], double_ev, places=12)
+        db_manager.close()
+
+        self.assertEqual(self.advisor.best_action([1, 10], 6), {"action": "Stand", "ev": {"Stand": 1.5}})
+        self.assertEqual(self.advisor.best_action([8, 8], 6)["action"], "Split")
+        with self.assertRaises(KeyError):
+            self.advisor.best_action([10, 10, 10], 6)
+
+    def test_split_matches_pair_overview(self):
+        db_manager = DatabaseManager(self.db_path)
+        cursor = db_manager.connection.cursor()
+        split_evs = dict(cursor.execute("SELECT hand_key, ev FROM Split_ev").fetchall())
+        rows = cursor.execute("SELECT pair_value, Dealer_2, Dealer_6, Dealer_10 FROM Pair_overview").fetchall()
+        db_manager.close()
+
+        for pair_value, *decisions in rows:
+            for upcard, decision in zip([2, 6, 10], decisions):
+                result = self.advisor.best_action([pair_value, pair_value], upcard)
+                self.assertAlmostEqual(result["ev"]["Split"],
+                                       split_evs[calc.hand_key_of_cards([pair_value, pair_value], upcard)], places=12)
+                self.assertEqual(result["action"] == "Split", decision == "Split", (pair_value, upcard))
+        # 8,8 gegen 10: Split aus Split_ev, wie in Pair_overview
+        self.assertEqual(self.advisor.best_action([8, 8], 10)["action"], "Split")
+        self.assertEqual(dict((row[0], row[3]) for row in rows)[8], "Split")
+
+    def test_seen_cards(self):
+        # Ohne Fünfen im Restdeck wird 10,6 beim Ziehen schlechter
+        seen = [5, 5, 5, 5]
+        self.assertLess(self.advisor.best_action([10, 6], 6, seen)["ev"]["Hit"],
+                        self.advisor.best_action([10, 6], 6)["ev"]["Hit"])
+
+    def test_reload(self):
+        version = self.advisor.version
+        index = self.advisor._index
+        self.advisor.reload_in_background().join()
+        self.assertEqual(self.advisor.version, version + 1)
+        self.assertIsNot(self.advisor._index, index)
+        self.assertEqual(len(self.advisor), len(index))
+
+    def test_benchmark(self):
+        # Das Latenzziel selbst prüft die Benchmark-Suite (Utility.Benchmark.TARGETS)
+        result = self.advisor.benchmark(samples=500)
+        self.assertGreater(result["samples"], 0)
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertIsInstance(result["meets_target"], bool)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from Models.Deck import Deck
+from Models.Dealer_hands import DealerHands
+from Models.Hand_catalogue import HandCatalogue
+import Utility.Calculations as calc
+
+try:
+    import numpy as np
+    import Utility.Batch_calculations as batch
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy ist nicht installiert")
+class TestBatchCalculations(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck()
+        self.catalogue = HandCatalogue(self.deck)
+        self.dealer_hands = DealerHands(self.deck)
+
+    def test_probability_distribution_batch(self):
+        for upcard in [1, 6, 10]:
+            with self.subTest(upcard=upcard):
+                calculated = batch.probability_distribution_batch(self.catalogue.counts, upcard, self.deck)
+                for index, cards in enumerate(self.catalogue.cards):
+                    expected = calc.probability_distribution(list(cards), self.deck, [upcard])
+                    for column, outcome in enumerate(batch.OUTCOMES):
+                        self.assertAlmostEqual(calculated[index, column], expected[outcome], places=12)
+
+    def test_stand_and_hit_batch(self):
+        upcard = 7
+        dealer_distribution = self.dealer_hands.dealer_distribution(upcard, self.deck)
+        probabilities = batch.probability_distribution_batch(self.catalogue.counts, upcard, self.deck)
+
+        hit = batch.hit_probabilities_batch(probabilities, dealer_distribution)
+        stand = batch.stand_probabilities_batch(self.catalogue.total_value, self.catalogue.is_blackjack,
+                                                dealer_distribution)
+
+        for index, cards in enumerate(self.catalogue.cards):
+            player_distribution = calc.probability_distribution(list(cards), self.deck, [upcard])
+            expected_hit = calc.hit_probabilities(dealer_distribution, player_distribution)
+            expected_stand = calc.stand_probabilities(self.catalogue.total_value[index],
+                                                      self.catalogue.is_blackjack[index], dealer_distribution)
+            for column in range(3):
+                self.assertAlmostEqual(hit[index, column], expected_hit[column], places=12)
+                self.assertAlmostEqual(stand[index, column], expected_stand[column], places=12)
+
+    def test_stand_over_21_loses(self):
+        dealer_distribution = self.dealer_hands.dealer_distribution(6, self.deck)
+        stand = batch.stand_probabilities_batch([22, 26, 20], [False, False, False], dealer_distribution)
+        for index, total_value in enumerate([22, 26, 20]):
+            expected = calc.stand_probabilities(total_value, False, dealer_distribution)
+            for column in range(3):
+                self.assertAlmostEqual(stand[index, column], expected[column], places=12)
+        self.assertAlmostEqual(stand[0, 1], sum(dealer_distribution.values()), places=12)
+        self.assertEqual(stand[0, 0], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from Utility.Benchmark import BenchmarkSuite, MACRO_TASKS, TARGETS, micro_benchmarks, time_call, main
+from Utility.DB import DatabaseManager
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.baseline_path = os.path.join(self.temp_dir.name, "Data", "baseline.json")
+
+    def test_micro_benchmarks(self):
+        names = set(micro_benchmarks())
+        self.assertIn("hand_probability", names)
+        self.assertEqual(sum(name.startswith("just_generate_dealer_hands_") for name in names), 10)
+        self.assertGreater(time_call(lambda: sum(range(100)), repeat=2, number=10), 0)
+
+    def test_compare_with_threshold(self):
+        suite = BenchmarkSuite(threshold=0.2)
+        baseline = {"micro/a": 1.0, "micro/b": 1.0, "micro/c": 1.0}
+        results = {"micro/a": 1.1, "micro/b": 1.5, "micro/c": 3.0, "micro/new": 5.0}
+        regressions = suite.compare(results, baseline)
+        self.assertEqual([name for name, *_ in regressions], ["micro/c", "micro/b"])
+        self.assertAlmostEqual(regressions[0][3], 3.0)
+
+    def test_check_targets(self):
+        results = {"macro/1/Advisor_p99": 0.0002, "macro/6/Advisor_p99": 0.003, "macro/1/House_edge": 2.0,
+                   "macro/6/House_edge": 12.0, "micro/hand_value": 5.0}
+        self.assertEqual(BenchmarkSuite.check_targets(results), [("macro/6/Advisor_p99", 0.001, 0.003),
+                                                                 ("macro/6/House_edge", 10.0, 12.0)])
+        self.assertEqual(BenchmarkSuite.check_targets(results, {"hand_value": 1.0}),
+                         [("micro/hand_value", 1.0, 5.0)])
+
+    def test_run_macro(self):
+        db_path = os.path.join(self.temp_dir.name, "macro.db")
+        results = BenchmarkSuite().run_macro(1, db_path=db_path)
+        expected = {f"macro/1/{task}" for task in list(MACRO_TASKS) + list(TARGETS)}
+        self.assertEqual(set(results), expected)
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+        db_manager = DatabaseManager(db_path)
+        for table in ("Hands", "Full_player_hands", "Player_dealer_strategy_table", "starthand_overview",
+                      "Pair_overview"):
+            self.assertGreater(db_manager.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], 0)
+        db_manager.close()
+
+    def test_baseline_roundtrip_and_exit_code(self):
+        self.assertIsNone(BenchmarkSuite.load_baseline(self.baseline_path))
+        BenchmarkSuite.save_baseline({"micro/hand_value": 1e-12}, self.baseline_path)
+        self.assertEqual(BenchmarkSuite.load_baseline(self.baseline_path), {"micro/hand_value": 1e-12})
+
+        # Gegenüber einer unrealistisch schnellen Baseline schlägt der Lauf fehl
+        self.assertEqual(main(["--micro-only", "--repeat", "1", "--baseline", self.baseline_path]), 1)
+        self.assertEqual(main(["--micro-only", "--repeat", "1", "--baseline", self.baseline_path,
+                               "--update-baseline"]), 0)
+        self.assertIn("micro/just_generate_dealer_hands_1", BenchmarkSuite.load_baseline(self.baseline_path))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 import Utility.Calculations as calc
+from Models.Hand_state import HandState
 
 class TestCalculations(unittest.TestCase):
     def test_frequencies(self):
@@ -121,6 +122,42 @@ class TestCalculations(unittest.TestCase):
         probabilities = calc.card_draw_probabilities([], 1)
         self.assertAlmostEqual(float(sum(probabilities.values())), 1.0, places=4)
 
+    def test_hand_state(self):
+        hands = [[1, 1, 5], [1, 10], [10, 5, 7], [1, 1, 1, 1, 2, 2, 2, 2, 3], [6]]
+        for hand in hands:
+            with self.subTest(hand=hand):
+                state = HandState(hand)
+                self.assertEqual(calc.hand_value(state), calc.hand_value(hand))
+                self.assertEqual(calc.hand_value(state, minimum=True), calc.hand_value(hand, minimum=True))
+                self.assertEqual(calc.hand_frequency(state), calc.hand_frequency(hand))
+                self.assertEqual(calc.probability_distribution(state), calc.probability_distribution(hand))
+
+        state = HandState([1, 5])
+        state.push(1)
+        self.assertEqual((state.minimum_value, state.total_value, len(state)), (7, 17, 3))
+        self.assertEqual(state.pop(), 1)
+        self.assertEqual((state.minimum_value, state.total_value, state.count(1)), (6, 16, 1))
+
+    def test_hand_key(self):
+        counts = (21, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        for upcard in (None, 1, 10, "Blackjack"):
+            with self.subTest(upcard=upcard):
+                key = calc.encode_hand_key(counts, upcard)
+                self.assertLess(key, 1 << 63)
+                self.assertEqual(calc.decode_hand_key(key), (counts, upcard))
+
+        # Reihenfolge egal, Folgehand über einen Summanden
+        key = calc.hand_key_of_cards([10, 2], 6)
+        self.assertEqual(key, calc.hand_key_of_cards([2, 10], "6"))
+        self.assertEqual(key + calc.CARD_KEY_UNITS[4], calc.hand_key_of_cards([2, 5, 10], 6))
+        self.assertNotEqual(key, calc.hand_key_of_cards([10, 2], 7))
+        with self.assertRaises(ValueError):
+            calc.encode_hand_key([32] + [0] * 9)
+        # 32 Zweien würden sonst in das Feld der Dreien überlaufen
+        self.assertEqual(calc.hand_key_of_cards([2] * 31, 6), calc.encode_hand_key([0, 31] + [0] * 8, 6))
+        with self.assertRaises(ValueError):
+            calc.hand_key_of_cards([2] * 32, 6)
+
 
 if __name__ == '__main__':
     unittest.main()
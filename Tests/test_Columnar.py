@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+import numpy as np
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Utility.Advisor import Advisor
+from Utility.Columnar import ColumnStore
+from Utility.DB import DatabaseManager
+
+class TestColumnar(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.temp_dir.name, "blackjack.db")
+        db_manager = DatabaseManager(cls.db_path)
+        db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), db_manager).generate_and_save_full_player_hands(dealer_cards=["Blackjack", 4, 10])
+        db_manager.get_ev_for_hands("Full_player_hands")
+        db_manager.create_and_fill_split_ev()
+        db_manager.close()
+
+        cls.columns_dir = os.path.join(cls.temp_dir.name, "columns")
+        cls.connection = sqlite3.connect(cls.db_path)
+        cls.store = ColumnStore(cls.columns_dir)
+        cls.store.export(cls.connection, batch_size=1000)
+        cls.split_columns_dir = os.path.join(cls.temp_dir.name, "split_columns")
+        ColumnStore(cls.split_columns_dir).export(cls.connection, "Split_ev")
+
+    def test_export_and_mmap(self):
+        rows = self.connection.execute("SELECT COUNT(*) FROM Full_player_hands").fetchone()[0]
+        store = ColumnStore(self.columns_dir)
+        self.assertEqual(store.rows, rows)
+        self.assertIn("hand_key", store.columns)
+
+        hand_keys = store.load("hand_key")
+        self.assertIsInstance(hand_keys, np.memmap)
+        self.assertEqual(hand_keys.dtype, np.int64)
+        expected = [row[0] for row in self.connection.execute("SELECT hand_key FROM Full_player_hands ORDER BY rowid")]
+        self.assertEqual(hand_keys.tolist(), expected)
+        self.assertEqual(store.load("dealer_start")[0], "Blackjack")
+        self.assertEqual(store.load("can_split").dtype, np.bool_)
+        # probability ist NULL-frei, prob_* der Blackjack-Zeilen werden als Zahl gespeichert
+        self.assertFalse(np.isnan(store.load("ev")).any())
+
+    def test_import_roundtrip(self):
+        target = sqlite3.connect(":memory:")
+        self.assertEqual(self.store.import_into(target), self.store.rows)
+        query = "SELECT * FROM Full_player_hands ORDER BY hand_id"
+        self.assertEqual(target.execute(query).fetchall(), self.connection.execute(query).fetchall())
+        target.close()
+
+    def test_advisor_from_columns(self):
+        from_db = Advisor(self.db_path)
+        from_columns = Advisor(os.path.join(self.temp_dir.name, "missing.db"), columns_dir=self.columns_dir,
+                               split_columns_dir=self.split_columns_dir)
+        self.assertEqual(from_columns.load_index(), from_db.load_index())
+        self.assertEqual(from_columns.best_action([10, 6], 10), from_db.best_action([10, 6], 10))
+        self.assertIn("Split", from_columns.best_action([8, 8], 10)["ev"])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.close()
+        cls.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
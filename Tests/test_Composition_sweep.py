@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Rules import Rules
+from Utility.Composition_sweep import CompositionSweep
+from Utility.DB import DatabaseManager
+
+class TestCompositionSweep(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, "blackjack.db"))
+
+    def test_full_deck_matches_pipeline(self):
+        self.db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), self.db_manager).generate_and_save_full_player_hands(dealer_cards=[1, 5, 10])
+        self.db_manager.get_ev_for_hands("Full_player_hands")
+        self.db_manager.create_and_fill_split_ev()
+        self.db_manager.create_and_fill_starthand_overview()
+
+        cells = CompositionSweep(max_removed=0).run()[(0,) * 10]
+
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("SELECT hand_text, dealer_start, ev FROM Full_player_hands WHERE is_starthand = 1")
+        for hand_text, dealer_start, ev in cursor.fetchall():
+            action, best, stand_ev, hit_ev, double_ev, split_ev = cells[(hand_text, int(dealer_start))]
+            expected = ev if hand_text != "1,10" else 1.5
+            self.assertAlmostEqual(1.5 if hand_text == "1,10" else max(stand_ev, hit_ev), expected, places=12)
+
+        cursor.execute("SELECT hand_text, Dealer_1, Dealer_5, Dealer_10 FROM starthand_overview")
+        for hand_text, *decisions in cursor.fetchall():
+            for upcard, decision in zip([1, 5, 10], decisions):
+                self.assertEqual(cells[(hand_text, upcard)][0], decision)
+
+    def test_sweep_and_effect_of_removal(self):
+        sweep = CompositionSweep(max_removed=1)
+        self.assertEqual(len(list(sweep.iter_removals())), 11)
+
+        results = sweep.run()
+        effects = sweep.effect_of_removal(results)
+
+        # Ohne Fünfen wird 10,6 gegen 10 schlechter, ohne Zehnen besser (Hit)
+        action, ev, changes = effects[("6,10", 10)]
+        self.assertEqual(action, "Hit")
+        self.assertLess(changes[4], 0)
+        self.assertGreater(changes[9], 0)
+        self.assertEqual(results[(0,) * 10][("8,8", 6)][0], "Split")
+        self.assertIsNone(results[(0,) * 10][("8,9", 6)][5])
+
+        count = sweep.save(self.db_manager, results)
+        cursor = self.db_manager.connection.cursor()
+        self.assertEqual(cursor.execute("SELECT COUNT(*) FROM Composition_strategy").fetchone()[0], count)
+        self.assertEqual(cursor.execute("SELECT COUNT(DISTINCT removal) FROM Composition_strategy").fetchone()[0], 11)
+        row = cursor.execute("""
+            SELECT eor_5, eor_10 FROM Composition_effect_of_removal WHERE hand_text = '6,10' AND dealer_start = '10'
+        """).fetchone()
+        self.assertAlmostEqual(row[0], changes[4], places=12)
+        self.assertAlmostEqual(row[1], changes[9], places=12)
+
+    def test_rule_matrix(self):
+        sweep = CompositionSweep(max_removed=0)
+        rules_list = Rules.matrix(hit_soft_17=[False, True], blackjack_payout=[1.5, 1.2], surrender=[False, True])
+        self.assertEqual(len(rules_list), 8)
+
+        results = sweep.run_matrix(rules_list)
+        full_deck = (0,) * 10
+        for rules in (Rules(), Rules(hit_soft_17=True, blackjack_payout=1.2, surrender=True)):
+            expected = CompositionSweep(max_removed=0, rules=rules).run()[full_deck]
+            self.assertEqual(results[rules][full_deck], expected)
+
+        base = results[Rules()][full_deck]
+        self.assertEqual(results[Rules(blackjack_payout=1.2)][full_deck][("1,10", 6)][1], 1.2)
+        self.assertEqual(results[Rules(surrender=True)][full_deck][("6,10", 10)][0], "Surrender")
+        self.assertEqual(base[("6,10", 10)][0], "Hit")
+
+    def test_no_peek_blackjack_and_surrender(self):
+        rules = Rules(peek=False, surrender=True)
+        cells = CompositionSweep(max_removed=0, rules=rules).run()[(0,) * 10]
+        # Spieler-Blackjack gegen 10: unentschieden, wenn die verdeckte Karte eines der 4 Asse aus 51 Karten ist
+        self.assertAlmostEqual(cells[("1,10", 10)][1], 1.5 * (1 - 4 / 51), places=12)
+        self.assertEqual(cells[("1,10", 6)][1], 1.5)
+        # Ein Dealer-Blackjack nimmt auch nach der Aufgabe den ganzen Einsatz
+        self.assertEqual(cells[("6,10", 10)][0], "Surrender")
+        self.assertAlmostEqual(cells[("6,10", 10)][1], -0.5 - 0.5 * 4 / 51, places=12)
+
+        db_manager = DatabaseManager(os.path.join(self.temp_dir.name, "enhc.db"), rules=rules)
+        db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), db_manager, rules=rules).generate_and_save_full_player_hands(dealer_cards=[1, 6, 10])
+        db_manager.get_ev_for_hands("Full_player_hands")
+        db_manager.create_and_fill_split_ev()
+        db_manager.create_and_fill_starthand_overview()
+
+        cursor = db_manager.connection.cursor()
+        cursor.execute("SELECT hand_text, dealer_start, ev FROM Full_player_hands WHERE is_starthand = 1")
+        for hand_text, dealer_start, ev in cursor.fetchall():
+            action, best, stand_ev, hit_ev, double_ev, split_ev = cells[(hand_text, int(dealer_start))]
+            expected = best if hand_text == "1,10" else max(stand_ev, hit_ev)
+            self.assertAlmostEqual(ev, expected, places=12)
+        cursor.execute("SELECT hand_text, Dealer_1, Dealer_6, Dealer_10 FROM starthand_overview")
+        for hand_text, *decisions in cursor.fetchall():
+            for upcard, decision in zip([1, 6, 10], decisions):
+                self.assertEqual(cells[(hand_text, upcard)][0], decision)
+        db_manager.close()
+
+    def tearDown(self):
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Rules import Rules
+from Utility.DB import DatabaseManager
+import Utility.Calculations as calc
+
+class TestDB(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, "blackjack.db"), batch_size=100)
+
+    def fetch_hand_texts(self):
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("SELECT hand_text FROM Hands ORDER BY hand_id")
+        return [row[0] for row in cursor.fetchall()]
+
+    def test_streaming_save_hands(self):
+        self.db_manager.create_table_hands("Hands")
+        hands_generator = Hands(Deck(), self.db_manager)
+
+        hands_generator.generate_and_save_hands(stream=False)
+        expected = self.fetch_hand_texts()
+
+        self.db_manager.drop_table("Hands")
+        self.db_manager.create_table_hands("Hands")
+        count = self.db_manager.save_hands("Hands", hands_generator.iter_hands(), batch_size=7)
+
+        self.assertEqual(count, 2019)
+        self.assertEqual(self.fetch_hand_texts(), expected)
+
+    def test_parallel_full_player_hands(self):
+        hands_generator = Hands(Deck(), self.db_manager)
+        cursor = self.db_manager.connection.cursor()
+        results = []
+
+        for jobs in (1, 3):
+            self.db_manager.drop_table("Full_player_hands")
+            self.db_manager.create_table_full_player_hands("Full_player_hands")
+            hands_generator.generate_and_save_full_player_hands(dealer_cards=["Blackjack", 2, 10], jobs=jobs)
+            cursor.execute("""
+                SELECT hand_text, dealer_start, win_hit, loss_hit, win_stand, loss_stand, action
+                FROM Full_player_hands ORDER BY hand_text, dealer_start
+            """)
+            results.append(cursor.fetchall())
+
+        self.assertGreater(len(results[0]), 0)
+        self.assertEqual(results[0], results[1])
+
+    def test_get_ev_for_hands(self):
+        self.db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), self.db_manager).generate_and_save_full_player_hands(dealer_cards=[6])
+        self.db_manager.get_ev_for_hands("Full_player_hands")
+
+        # Die Verbindung bleibt nach der EV-Berechnung geöffnet
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("SELECT c1,c2,c3,c4,c5,c6,c7,c8,c9,c10, win_stand - loss_stand, ev, action FROM Full_player_hands")
+        rows = {tuple(row[:10]): row[10:] for row in cursor.fetchall()}
+
+        for stand_ev, ev, action in rows.values():
+            self.assertGreaterEqual(ev, stand_ev - 1e-12)
+
+        # Hit-EV von 10,2 gegen 6 aus den EVs der Folgehände nachrechnen
+        counts = [0, 1, 0, 0, 0, 0, 0, 0, 0, 1]
+        remaining = [4, 3, 4, 4, 4, 3, 4, 4, 4, 15]
+        hit_ev = 0.0
+        for card in range(1, 11):
+            probability = remaining[card - 1] / sum(remaining)
+            if 12 + card > 21:
+                hit_ev -= probability
+            else:
+                child = counts.copy()
+                child[card - 1] += 1
+                hit_ev += probability * rows[tuple(child)][1]
+        stand_ev, ev, action = rows[tuple(counts)]
+        self.assertAlmostEqual(ev, max(hit_ev, stand_ev), places=12)
+        self.assertEqual(action, "Stand")
+
+    def test_bulk_load(self):
+        cursor = self.db_manager.connection.cursor()
+        synchronous_before = cursor.execute("PRAGMA synchronous").fetchone()[0]
+        index_query = "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'Full_player_hands'"
+
+        with self.db_manager.bulk_load() as stats:
+            self.assertEqual(cursor.execute("PRAGMA synchronous").fetchone()[0], 0)
+            self.db_manager.create_table_full_player_hands("Full_player_hands")
+            Hands(Deck(), self.db_manager).generate_and_save_full_player_hands(dealer_cards=[9])
+            self.assertTrue(self.db_manager.connection.in_transaction)
+            self.assertEqual(cursor.execute(index_query).fetchall(), [])  # Index wird aufgeschoben
+
+        self.assertFalse(self.db_manager.connection.in_transaction)
+        self.assertEqual(len(cursor.execute(index_query).fetchall()), 2)  # hand_key und (hand_text, dealer_start)
+        self.assertEqual(cursor.execute("PRAGMA synchronous").fetchone()[0], synchronous_before)
+        self.assertEqual(stats.rows, cursor.execute("SELECT COUNT(*) FROM Full_player_hands").fetchone()[0])
+        self.assertGreater(stats.rows_per_second, 0)
+
+    def test_rules_in_pipeline(self):
+        rules = Rules(hit_soft_17=True, blackjack_payout=1.2, surrender=True)
+        db_manager = DatabaseManager(os.path.join(self.temp_dir.name, "rules.db"), rules=rules)
+        db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), db_manager).generate_and_save_full_player_hands(dealer_cards=[1, 10])
+        db_manager.get_ev_for_hands("Full_player_hands")
+        db_manager.create_and_fill_split_ev()
+        db_manager.create_and_fill_starthand_overview()
+
+        cursor = db_manager.connection.cursor()
+        ev = cursor.execute("SELECT ev FROM Full_player_hands WHERE hand_text = '1,10' AND dealer_start = '10'")
+        self.assertEqual(ev.fetchone()[0], 1.2)
+        row = cursor.execute("SELECT Dealer_1, Dealer_10 FROM starthand_overview WHERE hand_text = '6,10'").fetchone()
+        self.assertEqual(row, ("Surrender", "Surrender"))
+        db_manager.close()
+
+    def test_hand_key_column(self):
+        self.db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), self.db_manager).generate_and_save_full_player_hands(dealer_cards=[1, "Blackjack"])
+        cursor = self.db_manager.connection.cursor()
+        rows = cursor.execute(f"""
+            SELECT hand_key, {", ".join(f"c{i}" for i in range(1, 11))}, dealer_start FROM Full_player_hands
+        """).fetchall()
+        self.assertEqual(len({row[0] for row in rows}), len(rows))
+        for hand_key, *counts, dealer_start in rows:
+            self.assertEqual(calc.decode_hand_key(hand_key), (tuple(counts), 1 if dealer_start == "1" else dealer_start))
+
+        self.db_manager.create_and_fill_split_ev()
+        pairs = cursor.execute("""
+            SELECT COUNT(*) FROM Full_player_hands AS p JOIN Split_ev AS s ON s.hand_key = p.hand_key
+        """).fetchone()[0]
+        self.assertEqual(pairs, 10)  # Alle Paare gegen das Ass
+
+    def test_split_ev_source_checked(self):
+        self.db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), self.db_manager).generate_and_save_full_player_hands(dealer_cards=[6])
+        self.db_manager.get_ev_for_hands("Full_player_hands")
+        with self.assertRaises(ValueError):
+            self.db_manager.create_and_fill_pair_overview()  # Split_ev fehlt
+
+        # Split_ev für andere Regeln bzw. ein anderes Deck wird nicht stillschweigend verwendet
+        self.db_manager.create_and_fill_split_ev(rules=Rules(double_after_split=False))
+        with self.assertRaises(ValueError):
+            self.db_manager.create_and_fill_pair_overview()
+        self.db_manager.create_and_fill_split_ev(deck=Deck(2))
+        with self.assertRaises(ValueError):
+            self.db_manager.create_and_fill_starthand_overview()
+
+        self.db_manager.create_and_fill_split_ev()
+        self.db_manager.create_and_fill_pair_overview()
+        row = self.db_manager.connection.execute("SELECT Dealer_6 FROM Pair_overview WHERE pair_value = 8").fetchone()
+        self.assertEqual(row[0], "Split")
+
+    def test_import_without_numpy(self):
+        # NumPy ist optional; DatabaseManager, Advisor und Main müssen sich ohne NumPy importieren lassen
+        code = "import sys; sys.modules['numpy'] = None; import Utility.DB, Utility.Advisor, Utility.Pipeline, Main"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def tearDown(self):
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from Models.Deck import Deck
+from Models.Dealer_hands import DealerHands, DealerCache
+from Models.Rules import Rules
+
+class TestDealerHands(unittest.TestCase):
+    def test_dealer_cache(self):
+        deck = Deck()
+        cache = DealerCache(maxsize=2)
+        dealer_hands = DealerHands(deck, cache=cache)
+
+        first = dealer_hands.dealer_distribution(6, deck)
+        second = dealer_hands.dealer_distribution(6, deck)
+
+        self.assertEqual(first, second)
+        self.assertEqual(cache.info()["hits"], 1)
+        self.assertEqual(cache.info()["misses"], 1)
+
+        # Bei maxsize=2 wird der älteste Eintrag (Startkarte 6) verdrängt
+        dealer_hands.dealer_distribution(7, deck)
+        dealer_hands.dealer_distribution(8, deck)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(dealer_hands.cache_key(6, deck)))
+
+    def test_dealer_distribution_dp(self):
+        deck = Deck()
+        dealer_hands = DealerHands(deck)
+
+        for start_card in range(1, 11):
+            with self.subTest(start_card=start_card):
+                expected = dealer_hands.just_generate_dealer_hands(start_card, deck)
+                calculated = dealer_hands.dealer_distribution_dp(start_card)
+                self.assertEqual(set(calculated), set(expected))
+                for key, expected_value in expected.items():
+                    self.assertAlmostEqual(calculated[key], expected_value, places=12)
+                self.assertAlmostEqual(sum(calculated.values()), 1.0, places=12)
+
+    def test_dealer_rules(self):
+        deck = Deck()
+        cache = DealerCache()
+        stand_soft_17 = DealerHands(deck, cache=cache)
+        hit_soft_17 = DealerHands(deck, cache=cache, rules=Rules(hit_soft_17=True))
+        no_peek = DealerHands(deck, cache=cache, rules=Rules(peek=False))
+
+        # Die Regeln sind Teil des Cache-Schlüssels
+        self.assertNotEqual(stand_soft_17.cache_key(6, deck), hit_soft_17.cache_key(6, deck))
+        s17 = stand_soft_17.dealer_distribution(6, deck)
+        h17 = hit_soft_17.dealer_distribution(6, deck)
+        self.assertLess(h17["17"], s17["17"])
+        self.assertGreater(h17["Bust"], s17["Bust"])
+
+        # Ohne Peek hat der Dealer mit Ass oder 10 auch Blackjacks
+        self.assertNotIn("Blackjack", stand_soft_17.dealer_distribution(10, deck))
+        self.assertAlmostEqual(no_peek.dealer_distribution(10, deck)["Blackjack"], 4 / 51, places=12)
+
+        for rules in (Rules(hit_soft_17=True), Rules(peek=False)):
+            dealer_hands = DealerHands(deck, rules=rules)
+            for start_card in (1, 6, 10):
+                with self.subTest(rules=rules, start_card=start_card):
+                    expected = dealer_hands.just_generate_dealer_hands(start_card, deck)
+                    calculated = dealer_hands.dealer_distribution_dp(start_card)
+                    for key, expected_value in expected.items():
+                        self.assertAlmostEqual(calculated[key], expected_value, places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
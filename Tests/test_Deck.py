@@ -0,0 +1,52 @@
+import unittest
+from Models.Deck import Deck, DeckState
+
+class TestDeck(unittest.TestCase):
+    def test_deck_state(self):
+        state = DeckState([4] * 9 + [16])
+        self.assertEqual(state.total, 52)
+
+        state.remove(10)
+        state.remove(1)
+        self.assertEqual(state.total, 50)
+        self.assertEqual(state.snapshot(), (3,) + (4,) * 8 + (15,))
+        self.assertEqual(hash(state.snapshot()), hash((3,) + (4,) * 8 + (15,)))
+
+        state.restore(1)
+        self.assertEqual(state.count(1), 4)
+        self.assertEqual(state.total, 51)
+
+        empty = DeckState([0] * 10)
+        with self.assertRaises(ValueError):
+            empty.remove(5)
+
+    def test_deck_wrapper(self):
+        deck = Deck(deck_count=6)
+        self.assertEqual(deck.total_cards(), 312)
+        self.assertEqual(deck.card_frequencies[10], 96)
+
+        deck_copy = deck.copy()
+        deck_copy.remove_card(7)
+        self.assertEqual(deck_copy.total_cards(), 311)
+        self.assertEqual(deck_copy.get_missing_cards(), {7: 1})
+        self.assertEqual(deck.total_cards(), 312)  # Original bleibt unverändert
+
+        deck.card_frequencies[2] -= 4
+        self.assertEqual(deck.total_cards(), 308)
+        self.assertEqual(deck.get_card_counts()[1], 20)
+        self.assertEqual(deck.get_available_cards(), list(range(1, 11)))
+
+    def test_deck_without(self):
+        deck = Deck()
+        reduced = deck.without([4, 0, 0, 0, 1, 0, 0, 0, 0, 0])
+        self.assertEqual(reduced.total_cards(), 47)
+        self.assertEqual(reduced.original_card_frequencies[5], 3)
+        self.assertEqual(reduced.get_missing_cards(), {})
+        self.assertNotIn(1, reduced.get_available_cards())
+        self.assertEqual(deck.total_cards(), 52)
+        with self.assertRaises(ValueError):
+            reduced.without([1] + [0] * 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
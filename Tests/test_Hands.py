@@ -1,5 +1,7 @@
 import unittest
 from collections import Counter
+from Models.Deck import Deck
+from Models.Hand_catalogue import HandCatalogue
 from Utility.DB import DatabaseManager
 
 class TestHands(unittest.TestCase):
@@ -41,6 +43,23 @@ class TestHands(unittest.TestCase):
     def tearDown(self):
         self.db_manager.connection.close()
 
+class TestHandCatalogue(unittest.TestCase):
+    def test_catalogue(self):
+        catalogue = HandCatalogue(Deck())
+        self.assertEqual(len(catalogue), 2019)  # Gleiche Anzahl wie in der Tabelle 'Hands'
+
+        index = catalogue.find([0, 0, 0, 0, 1, 0, 0, 0, 0, 1])  # 5, 10
+        self.assertEqual(catalogue.cards[index], (5, 10))
+        self.assertEqual(catalogue.total_value[index], 15)
+        self.assertTrue(catalogue.can_double[index])
+
+        # Kind-Verweise: 5,10 + 6 ist 21, 5,10 + 7 ist Bust
+        child = catalogue.children[index][5]
+        self.assertEqual(catalogue.cards[child], (5, 6, 10))
+        self.assertEqual(catalogue.total_value[child], 21)
+        self.assertEqual(catalogue.children[index][6], -1)
+        self.assertEqual(catalogue.parent[catalogue.find([0, 0, 0, 0, 1] + [0] * 5)], 0)
+
 if __name__ == '__main__':
     unittest.main()
 
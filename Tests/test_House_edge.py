@@ -0,0 +1,31 @@
+import unittest
+from Models.Rules import Rules
+from Utility.House_edge import HouseEdgeCalculator
+
+class TestHouseEdge(unittest.TestCase):
+    def test_single_deck(self):
+        calculator = HouseEdgeCalculator()
+        result = calculator.run()
+
+        self.assertAlmostEqual(result["total_probability"], 1.0, places=12)
+        self.assertAlmostEqual(sum(result["action_shares"].values()), 1.0, places=12)
+        self.assertLess(abs(result["house_edge"]), 0.01)
+        self.assertGreater(result["seconds"], 0)  # Das Zeitziel prüft die Benchmark-Suite (Utility.Benchmark.TARGETS)
+
+        # Paar 10,10 gegen 6: zwei Zehnen aus 16 mal eine Sechs aus den übrigen 50 Karten
+        hands = {(cards, upcard): probability for cards, upcard, probability in calculator.starting_hands()}
+        self.assertAlmostEqual(hands[((10, 10), 6)], (16 * 15 / 2) * 4 / (52 * 51 / 2 * 50), places=15)
+        self.assertAlmostEqual(calculator.dealer_blackjack_probability((10, 10), 1), 14 / 49, places=15)
+
+    def test_rules_and_jobs(self):
+        rules_list = [Rules(), Rules(blackjack_payout=1.2), Rules(hit_soft_17=True)]
+        results = HouseEdgeCalculator.compare_rules(rules_list, jobs=2)
+        base = results[Rules()]["expected_return"]
+
+        self.assertEqual(HouseEdgeCalculator().run(jobs=1)["expected_return"], base)
+        # 6:5 kostet etwa 0,3 * P(Blackjack) ≈ 1,4 %, H17 etwa 0,2 %
+        self.assertAlmostEqual(base - results[Rules(blackjack_payout=1.2)]["expected_return"], 0.0139, delta=0.001)
+        self.assertGreater(base - results[Rules(hit_soft_17=True)]["expected_return"], 0.001)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+import Utility.Instrumentation as instrumentation
+from Utility.Instrumentation import instrumented
+from Utility.Pipeline import Pipeline, Stage
+
+
+@instrumented()
+def _engine(values):
+    return [value * 2 for value in values]
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def test_disabled_is_transparent(self):
+        self.assertIsNone(instrumentation.active())
+        self.assertEqual(_engine([1, 2]), [2, 4])
+
+    def test_sections_and_report(self):
+        active = instrumentation.enable(self.temp_dir.name)
+        with active.section("stage:test"):
+            for _ in range(3):
+                _engine(list(range(1000)))
+        instrumentation.disable()
+
+        sections = active.report()["sections"]
+        stage = sections["stage:test"]
+        engine = sections["_engine"]
+        self.assertEqual(stage["calls"], 1)
+        self.assertEqual(engine["calls"], 3)
+        self.assertGreater(stage["peak_memory_bytes"], 0)
+        self.assertGreaterEqual(stage["wall_seconds"], engine["wall_seconds"])
+        # Nur der äußerste Abschnitt wird profiliert
+        self.assertTrue(os.path.exists(stage["profile"]))
+        self.assertIsNone(engine["profile"])
+
+    def test_pipeline_writes_report(self):
+        def build(db_manager, pipeline):
+            _engine([1, 2, 3])
+            db_manager.connection.execute("CREATE TABLE Result (value INTEGER)")
+
+        instrumentation.enable(self.temp_dir.name)
+        try:
+            Pipeline(os.path.join(self.temp_dir.name, "blackjack.db"), stages=[Stage("result", build, tables=["Result"])]).run()
+        finally:
+            instrumentation.disable()
+
+        with open(os.path.join(self.temp_dir.name, "report.json")) as file:
+            report = json.load(file)
+        self.assertEqual(report["stages"]["result"]["status"], "built")
+        self.assertEqual(report["sections"]["_engine"]["calls"], 1)
+        self.assertIn("stage:result", report["sections"])
+
+    def tearDown(self):
+        instrumentation.disable()
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+from Utility.Lru_cache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_and_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "a" ist jetzt der jüngste Eintrag
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.info(), {"hits": 2, "misses": 1, "size": 2, "maxsize": 2})
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.info()["hits"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
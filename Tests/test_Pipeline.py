@@ -0,0 +1,171 @@
+import os
+import tempfile
+import threading
+import unittest
+from Models.Deck import Deck
+from Models.Rules import Rules
+from Utility.Composition_sweep import CompositionSweep
+from Utility.Pipeline import Pipeline, Stage, STAGES
+from Utility.Progress import ProgressReporter, QUIET
+from Utility.Stage_cache import StageCache
+
+
+def _table_stage(name, depends_on=(), calls=None):
+    """Stufe, die eine Tabelle mit einer Zeile pro Abhängigkeit anlegt und ihre Aufrufe zählt."""
+    def build(db_manager, pipeline):
+        calls.append(name)
+        with db_manager._transaction() as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {name}")
+            conn.execute(f"CREATE TABLE {name} (source TEXT)")
+            conn.executemany(f"INSERT INTO {name} (source) VALUES (?)", [(dependency,) for dependency in depends_on])
+    return Stage(name, build, depends_on=depends_on, tables=[name], inputs=("rules",))
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "blackjack.db")
+        self.calls = []
+        self.stages = [
+            _table_stage("base", calls=self.calls),
+            _table_stage("left", ["base"], self.calls),
+            _table_stage("right", ["base"], self.calls),
+            _table_stage("top", ["left", "right"], self.calls),
+            _table_stage("other", calls=self.calls),
+        ]
+
+    def test_select_and_dependents(self):
+        pipeline = Pipeline(self.db_path, stages=self.stages)
+        order = pipeline.select(["top"])
+        self.assertEqual(set(order), {"base", "left", "right", "top"})
+        self.assertEqual(order[0], "base")
+        self.assertEqual(order[-1], "top")
+        self.assertEqual(pipeline.dependents(["left"]), {"left", "top"})
+        with self.assertRaises(ValueError):
+            pipeline.select(["missing"])
+        with self.assertRaises(ValueError):
+            Pipeline(self.db_path, stages=[Stage("a", None, depends_on=["b"])])
+
+    def test_concurrent_run_skip_and_rerun(self):
+        pipeline = Pipeline(self.db_path, stages=self.stages, jobs=3)
+        timings = pipeline.run()
+        self.assertEqual(sorted(self.calls), ["base", "left", "other", "right", "top"])
+        self.assertTrue(all(timing["status"] == "built" for timing in timings.values()))
+        self.assertLess(list(timings).index("base"), list(timings).index("top"))
+
+        # Zweiter Lauf: alles aktuell
+        self.calls.clear()
+        timings = pipeline.run()
+        self.assertEqual(self.calls, [])
+        self.assertEqual({timing["status"] for timing in timings.values()}, {"skipped"})
+
+        # Nur 'right' und die abhängige Stufe 'top' werden neu berechnet
+        timings = pipeline.run(rerun=["right"])
+        self.assertEqual(self.calls, ["right", "top"])
+        self.assertEqual(set(timings), {"base", "left", "right", "top"})
+        self.assertEqual(timings["left"]["status"], "skipped")
+
+        db_manager = pipeline.connect()
+        rows = db_manager.connection.execute("SELECT source FROM top ORDER BY source").fetchall()
+        self.assertEqual(rows, [("left",), ("right",)])
+        db_manager.close()
+
+    def test_default_stages_concurrently(self):
+        # Mehrere schreibende Stufen (bulk_load) gleichzeitig auf einer neuen Datenbank
+        pipeline = Pipeline(self.db_path, jobs=4, progress=ProgressReporter(QUIET))
+        timings = pipeline.run()
+        self.assertEqual(set(timings), set(pipeline.select()))
+        self.assertEqual({timing["status"] for timing in timings.values()}, {"built"})
+
+        db_manager = pipeline.connect()
+        for table in ("Hands", "Full_player_hands", "Split_ev", "starthand_overview", "Pair_overview"):
+            self.assertGreater(db_manager.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0], 0)
+        db_manager.close()
+        self.assertEqual({timing["status"] for timing in pipeline.run().values()}, {"skipped"})
+
+    def test_overview_stages_overlap(self):
+        Pipeline(self.db_path, progress=ProgressReporter(QUIET)).run(["evs", "split_ev"])
+
+        # Beide Stufen müssen gleichzeitig in ihrem Build sein, sonst läuft die Barriere in den Timeout
+        barrier = threading.Barrier(2, timeout=30)
+
+        def overlapping(stage):
+            def build(db_manager, pipeline):
+                barrier.wait()
+                stage.build(db_manager, pipeline)
+            return Stage(stage.name, build, stage.depends_on, stage.tables, stage.inputs, stage.default)
+
+        stages = [overlapping(stage) if stage.name in ("double_overview", "pair_overview") else stage
+                  for stage in STAGES]
+        pipeline = Pipeline(self.db_path, stages=stages, jobs=2, progress=ProgressReporter(QUIET))
+        timings = pipeline.run(["double_overview", "pair_overview"])
+        self.assertEqual(timings["double_overview"]["status"], "built")
+        self.assertEqual(timings["pair_overview"]["status"], "built")
+
+        db_manager = pipeline.connect()
+        row = db_manager.connection.execute("SELECT Dealer_6 FROM Pair_overview WHERE pair_value = 8").fetchone()
+        self.assertEqual(row[0], "Split")
+        self.assertEqual(db_manager.connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        db_manager.close()
+
+    def test_fingerprints_use_relevant_rules(self):
+        def fingerprints(rules):
+            pipeline = Pipeline(self.db_path, rules=rules)
+            db_manager = pipeline.connect()
+            cache = StageCache(db_manager, version="test")
+            result = {name: cache.fingerprint(name, pipeline.stage_inputs(name))[0] for name in pipeline.stages}
+            db_manager.close()
+            return result
+
+        base = fingerprints(Rules())
+        payout = fingerprints(Rules(blackjack_payout=1.2, surrender=True, double_after_split=False))
+        hit_soft_17 = fingerprints(Rules(hit_soft_17=True))
+
+        # Auszahlung, Surrender und Split-Regeln ändern die Spielerhände nicht, nur EVs und Übersichten
+        self.assertEqual(payout["full_player_hands"], base["full_player_hands"])
+        self.assertEqual(payout["dealer_hands"], base["dealer_hands"])
+        self.assertNotEqual(payout["evs"], base["evs"])
+        self.assertNotEqual(payout["split_ev"], base["split_ev"])
+        self.assertEqual(fingerprints(Rules(surrender=True))["evs"], base["evs"])
+        self.assertNotEqual(hit_soft_17["full_player_hands"], base["full_player_hands"])
+
+    def test_payout_round_trip_rebuilds_evs(self):
+        # 'evs' ergänzt Full_player_hands ohne eigene Tabelle und darf nicht aus dem Archiv kommen
+        statuses = []
+        for payout in (1.5, 1.2, 1.5):
+            pipeline = Pipeline(self.db_path, rules=Rules(blackjack_payout=payout), progress=ProgressReporter(QUIET))
+            timings = pipeline.run(["evs"])
+            statuses.append(timings["evs"]["status"])
+            db_manager = pipeline.connect()
+            ev = db_manager.connection.execute(
+                "SELECT ev FROM Full_player_hands WHERE hand_text = '1,10' AND dealer_start = '6'").fetchone()[0]
+            db_manager.close()
+            self.assertEqual(ev, payout)
+        self.assertEqual(statuses, ["built", "built", "built"])
+
+    def test_multi_deck_evs_match_sweep(self):
+        deck = Deck(2)
+        pipeline = Pipeline(self.db_path, deck=deck)
+        pipeline.run(["evs"])
+
+        cells = CompositionSweep(deck, max_removed=0).run()[(0,) * 10]
+        db_manager = pipeline.connect()
+        self.assertIs(db_manager.deck, deck)
+        rows = db_manager.connection.execute("""
+            SELECT hand_text, dealer_start, ev FROM Full_player_hands
+            WHERE is_starthand = 1 AND is_blackjack = 0 AND dealer_start != 'Blackjack'
+        """).fetchall()
+        db_manager.close()
+        self.assertGreater(len(rows), 0)
+        for hand_text, dealer_start, ev in rows:
+            action, best, stand_ev, hit_ev, double_ev, split_ev = cells[(hand_text, int(dealer_start))]
+            self.assertAlmostEqual(ev, max(stand_ev, hit_ev), places=12)
+        # 6,10 gegen 10 mit zwei Decks (mit einem Deck wären es -0.5096)
+        evs = {(hand_text, dealer_start): ev for hand_text, dealer_start, ev in rows}
+        self.assertAlmostEqual(evs[("6,10", "10")], -0.5242, places=4)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
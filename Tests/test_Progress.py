@@ -0,0 +1,52 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Dealer_hands import DealerHands
+from Utility.Progress import ProgressReporter, ProgressCancelled, QUIET, VERBOSE
+
+class TestProgress(unittest.TestCase):
+    def test_summary_and_throttled_events(self):
+        events = []
+        reporter = ProgressReporter(QUIET, interval=0.0, callback=events.append)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            hands = list(Hands(Deck(), None, progress=reporter).iter_full_player_hands(dealer_cards=[5, 10]))
+        self.assertEqual(output.getvalue(), "")
+
+        summary = reporter.summaries[-1]
+        self.assertTrue(summary["finished"])
+        self.assertEqual(summary["done"], len(hands))
+        self.assertEqual(set(summary["units"]), {5, 10})
+        self.assertEqual(sum(summary["units"].values()), len(hands))
+
+        updates = [event for event in events if not event["finished"]]
+        self.assertGreater(len(updates), 0)
+        self.assertTrue(all(event["eta_seconds"] is not None for event in updates if event["unit_done"] > 0))
+
+    def test_interval_limits_output(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            list(Hands(Deck(), None, progress=ProgressReporter(interval=3600)).iter_full_player_hands(dealer_cards=[6]))
+        # Nur die Zusammenfassung, keine Zeile pro Hand
+        self.assertEqual(len(output.getvalue().splitlines()), 1)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            hands = list(Hands(Deck(), None, progress=ProgressReporter(VERBOSE, interval=3600))
+                         .iter_full_player_hands(dealer_cards=[6]))
+        self.assertEqual(len(output.getvalue().splitlines()), len(hands) + 1)
+
+    def test_cancel_from_callback(self):
+        reporter = ProgressReporter(QUIET, interval=0.0, callback=lambda event: event["done"] < 100)
+        with self.assertRaises(ProgressCancelled):
+            list(Hands(Deck(), None, progress=reporter).iter_full_player_hands())
+        self.assertTrue(reporter.cancelled)
+
+        # Der Dealer-Generator bricht beim nächsten Fortschritt ebenfalls ab
+        with self.assertRaises(ProgressCancelled):
+            DealerHands(Deck(), progress=reporter).generate_dealer_hands("Dealer_Hands", start_card=6)
+
+if __name__ == '__main__':
+    unittest.main()
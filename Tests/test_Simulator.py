@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Rules import Rules
+from Utility.DB import DatabaseManager
+from Utility.Simulator import Simulator
+
+class TestSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.temp_dir.name, "blackjack.db")
+        db_manager = DatabaseManager(cls.db_path)
+        db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), db_manager).generate_and_save_full_player_hands()
+        db_manager.get_ev_for_hands("Full_player_hands")
+        db_manager.create_and_fill_split_ev()
+        db_manager.create_and_fill_starthand_overview()
+        db_manager.close()
+
+    def test_shards_are_independent_of_jobs(self):
+        simulator = Simulator(self.db_path, penetration=0)
+        serial = simulator.run(4000, shards=2, jobs=1, seed=7)
+        parallel = simulator.run(4000, shards=2, jobs=2, seed=7)
+
+        self.assertEqual(serial.rounds, 4000)
+        self.assertEqual(serial.mean, parallel.mean)
+        self.assertEqual(serial.cells, parallel.cells)
+        self.assertNotEqual(serial.mean, simulator.run(4000, shards=2, seed=8).mean)
+
+    def test_house_edge_and_cells(self):
+        simulator = Simulator(self.db_path, penetration=0)
+        result = simulator.run(20000, seed=1)
+
+        low, high = result.confidence_interval()
+        self.assertLess(low, result.house_edge)
+        self.assertLess(result.house_edge, high)
+        self.assertLess(abs(result.house_edge), 0.05)
+        self.assertGreater(result.hands_per_second, 0)
+        self.assertGreaterEqual(result.hands, result.rounds)
+
+        # Eine Starthand mit Blackjack wird immer mit 1,5 ausgezahlt, wenn der Dealer keinen hat
+        count, mean, standard_error = result.cell_mean("1,10", 6)
+        self.assertEqual(mean, 1.5)
+        self.assertEqual(standard_error, 0.0)
+
+        comparison = simulator.compare_with_exact(result, min_count=100)
+        self.assertGreater(len(comparison), 0)
+        exact = simulator.exact_cell_evs()
+        self.assertAlmostEqual(exact[("1,10", 6)], 1.5)
+
+    def test_shoe_with_penetration(self):
+        simulator = Simulator(self.db_path, deck_count=6, penetration=0.75, rules=Rules(hit_soft_17=True))
+        result = simulator.run(5000, seed=3)
+        self.assertEqual(result.rounds, 5000)
+        self.assertLess(abs(result.house_edge), 0.1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
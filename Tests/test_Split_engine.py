@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Rules import Rules
+from Utility.Composition_sweep import CompositionSweep
+from Utility.DB import DatabaseManager
+from Utility.Split_engine import SplitEngine
+
+class TestSplitEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sweep = CompositionSweep(max_removed=0)
+
+    def test_split_ev_below_naive_estimate(self):
+        engine = self.sweep.split_engine
+        cells = self.sweep.evaluate((0,) * 10)
+
+        # Das Entfernen der Paarkarten macht Asse gegen 10 deutlich schlechter als 2 * EV eines einzelnen Asses
+        self.assertAlmostEqual(engine.split_ev(1, 10), cells[("1,1", 10)][5], places=12)
+        self.assertGreater(engine.split_ev(1, 10), 0)
+
+        # Vier Fünfen + Dealer-Fünf ist im Einzeldeck nicht möglich
+        self.assertIsNone(engine.split_ev(5, 5, (4, 4, 4, 4, 2, 4, 4, 4, 4, 16)))
+
+    def test_rules_change_split_ev(self):
+        no_resplit = SplitEngine(self.sweep, Rules(max_split_hands=2))
+        no_das = SplitEngine(self.sweep, Rules(double_after_split=False))
+        resplit_aces = SplitEngine(self.sweep, Rules(resplit_aces=True))
+        engine = self.sweep.split_engine
+
+        self.assertNotEqual(no_resplit.split_ev(8, 10), engine.split_ev(8, 10))
+        self.assertLess(no_das.split_ev(2, 6), engine.split_ev(2, 6))
+        self.assertNotEqual(resplit_aces.split_ev(1, 6), engine.split_ev(1, 6))
+        # Ohne Resplit von Assen bleibt max_split_hands für Asse wirkungslos
+        self.assertAlmostEqual(no_resplit.split_ev(1, 6), engine.split_ev(1, 6), places=12)
+
+    def test_overviews_use_split_ev(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_manager = DatabaseManager(os.path.join(temp_dir, "blackjack.db"))
+            db_manager.create_table_full_player_hands("Full_player_hands")
+            Hands(Deck(), db_manager).generate_and_save_full_player_hands(dealer_cards=[6, 10])
+            db_manager.get_ev_for_hands("Full_player_hands")
+            db_manager.create_and_fill_split_ev()
+            db_manager.create_and_fill_starthand_overview()
+            db_manager.create_and_fill_pair_overview()
+
+            cursor = db_manager.connection.cursor()
+            self.assertEqual(cursor.execute("SELECT COUNT(*) FROM Split_ev").fetchone()[0], 100)
+            ev = cursor.execute("SELECT ev FROM Split_ev WHERE pair_value = 8 AND dealer_start = '10'").fetchone()[0]
+            self.assertAlmostEqual(ev, self.sweep.split_engine.split_ev(8, 10), places=12)
+
+            pairs = dict(cursor.execute("SELECT pair_value, Dealer_6 FROM Pair_overview").fetchall())
+            self.assertEqual(pairs[8], "Split")
+            self.assertEqual(pairs[1], "Split")
+            self.assertNotEqual(pairs[10], "Split")
+            row = cursor.execute("SELECT Dealer_6 FROM starthand_overview WHERE hand_text = '8,8'").fetchone()
+            self.assertEqual(row[0], "Split")
+            db_manager.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Rules import Rules
+from Utility.DB import DatabaseManager
+from Utility.Stage_cache import StageCache
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(os.path.join(self.temp_dir.name, "blackjack.db"))
+        self.stage_cache = StageCache(self.db_manager, version="test")
+        self.builds = []
+
+    def run_full_hands(self, rules):
+        def build():
+            self.builds.append(rules)
+            self.db_manager.drop_table("Full_player_hands")
+            self.db_manager.create_table_full_player_hands("Full_player_hands")
+            Hands(Deck(), self.db_manager, rules).generate_and_save_full_player_hands(dealer_cards=[6])
+            self.db_manager.create_hand_lookup_index()
+        return self.stage_cache.run("full_player_hands", ["Full_player_hands"], build,
+                                    inputs={"deck": Deck(), "rules": rules})
+
+    def win_stand(self):
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("SELECT win_stand FROM Full_player_hands WHERE hand_text = '10,10' AND dealer_start = '6'")
+        return cursor.fetchone()[0]
+
+    def test_skip_archive_and_restore(self):
+        s17, h17 = Rules(), Rules(hit_soft_17=True)
+        self.assertEqual(self.run_full_hands(s17), "built")
+        s17_win = self.win_stand()
+        self.assertEqual(self.run_full_hands(s17), "skipped")
+
+        # Neue Regeln: die S17-Tabelle wird archiviert, nicht gelöscht
+        self.assertEqual(self.run_full_hands(h17), "built")
+        self.assertNotEqual(self.win_stand(), s17_win)
+        fingerprint = self.stage_cache.fingerprint("full_player_hands", {"deck": Deck(), "rules": s17})[0]
+        self.assertTrue(self.db_manager.table_exists(StageCache.archive_name("Full_player_hands", fingerprint)))
+
+        # Zurück zu S17: Wiederherstellen ohne Neuberechnung, inklusive Index
+        self.assertEqual(self.run_full_hands(s17), "restored")
+        self.assertEqual(self.win_stand(), s17_win)
+        self.assertEqual(self.builds, [s17, h17])
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute("SELECT tbl_name FROM sqlite_master WHERE name = 'idx_Full_player_hands_hand_dealer'")
+        self.assertEqual(cursor.fetchone()[0], "Full_player_hands")
+        self.assertEqual(len(self.stage_cache.entries()), 2)
+
+    def test_dependencies_and_version(self):
+        self.run_full_hands(Rules())
+        evs = []
+        run_evs = lambda: self.stage_cache.run("evs", [], lambda: evs.append(1), depends_on=["full_player_hands"])
+        self.assertEqual(run_evs(), "built")
+        self.assertEqual(run_evs(), "skipped")
+
+        # Eine geänderte vorgelagerte Stufe ändert auch den Fingerabdruck der abhängigen
+        self.run_full_hands(Rules(blackjack_payout=1.2))
+        self.assertEqual(run_evs(), "built")
+
+        other_version = StageCache(self.db_manager, version="other")
+        self.assertNotEqual(other_version.fingerprint("evs")[0], self.stage_cache.fingerprint("evs")[0])
+
+    def tearDown(self):
+        self.db_manager.close()
+        self.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Utility.DB import DatabaseManager
+from Utility.Strategy_server import StrategyServer, fetch, run_load
+
+class TestStrategyServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.temp_dir.name, "blackjack.db")
+        db_manager = DatabaseManager(cls.db_path)
+        db_manager.create_table_full_player_hands("Full_player_hands")
+        Hands(Deck(), db_manager).generate_and_save_full_player_hands(dealer_cards=[6, 10])
+        db_manager.get_ev_for_hands("Full_player_hands")
+        db_manager.create_and_fill_split_ev()
+        db_manager.create_and_fill_pair_overview()
+        db_manager.close()
+
+    def run_with_server(self, scenario):
+        async def run():
+            server = await StrategyServer(self.db_path, port=0, batch_window=0.005).start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.stop()
+        return asyncio.run(run())
+
+    def test_endpoints(self):
+        async def scenario(server):
+            return [
+                await fetch(server.host, server.port, "/action?cards=6,10&upcard=10"),
+                await fetch(server.host, server.port, "/action?cards=10,6&upcard=10"),
+                await fetch(server.host, server.port, "/action?cards=10,6&upcard=3"),
+                await fetch(server.host, server.port, "/action?cards=x&upcard=3"),
+                await fetch(server.host, server.port, "/overview?table=Pair_overview&hand=8"),
+                await fetch(server.host, server.port, "/overview?table=Hands&hand=8"),
+                await fetch(server.host, server.port, "/metrics"),
+            ]
+
+        action, sorted_action, unknown, invalid, overview, forbidden, (status, metrics) = self.run_with_server(scenario)
+        self.assertEqual(action[0], 200)
+        self.assertEqual(action[1]["hand_text"], "6,10")
+        self.assertEqual(action[1]["action"], "Hit")
+        self.assertEqual(sorted_action, action)
+        self.assertEqual(unknown[0], 404)
+        self.assertEqual(invalid[0], 400)
+        self.assertEqual(overview[1]["Dealer_6"], "Split")
+        self.assertEqual(forbidden[0], 400)
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["requests"], 6)
+        self.assertEqual(metrics["errors"], 3)
+        self.assertEqual(metrics["cache"]["hits"], 1)
+
+    def test_load_generator(self):
+        paths = [f"/action?cards={first},{second}&upcard={upcard}"
+                 for first in range(1, 11) for second in range(1, 11) for upcard in (6, 10)] * 3
+
+        async def scenario(server):
+            load = await run_load(server.host, server.port, concurrency=20, paths=paths)
+            return load, (await fetch(server.host, server.port, "/metrics"))[1]
+
+        load, metrics = self.run_with_server(scenario)
+        self.assertEqual(load["requests"], len(paths))
+        self.assertEqual(load["errors"], 0)
+        self.assertEqual(metrics["requests"], len(paths))
+        self.assertGreater(metrics["qps"], 0)
+        self.assertLessEqual(metrics["p50_ms"], metrics["p99_ms"])
+        # Gleichzeitige Fehlschläge werden zusammengefasst
+        self.assertLess(metrics["batches"], metrics["cache"]["misses"])
+
+    def test_malformed_request_line(self):
+        async def scenario(server):
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b"GARBAGE\r\n\r\nGET /action?cards=6,10&upcard=10 HTTP/1.1\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response, (await fetch(server.host, server.port, "/metrics"))[1]
+
+        response, metrics = self.run_with_server(scenario)
+        self.assertTrue(response.startswith(b"HTTP/1.1 400"))
+        self.assertIn(b"HTTP/1.1 200", response)
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["errors"], 1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+import sqlite3
+import threading
+import time
+
+from Models.Deck import Deck
+from Utility.Calculations import BLACKJACK_UPCARD, CARD_KEY_UNITS, UPCARD_SHIFT, decode_hand_key
+
+ACTIONS = ["Hit", "Stand", "Double", "Split"]
+
+
+class Advisor:
+    # Latenzziel für best_action: p99 unter 1 ms (siehe benchmark)
+    LATENCY_TARGET_MS = 1.0
+
+    def __init__(self, db_path="Data/blackjack.db", table_name="Full_player_hands", deck=None, columns_dir=None,
+                 split_columns_dir=None):
+        """
+        Beantwortet Strategieanfragen für laufende Tische aus einem Index im Speicher.
+        Die berechneten EVs werden einmal aus der Datenbank geladen und nach dem gepackten Handschlüssel
+        (Kartenzählung und Dealer-Karte, siehe calc.encode_hand_key) indiziert; Anfragen berühren die Datenbank nicht mehr.
+        Paare erhalten zusätzlich ihren Split-EV aus der Tabelle 'Split_ev' (SplitEngine), wie die Übersichtstabellen.
+
+        Latenzziel: best_action antwortet mit p99 unter 1 ms (LATENCY_TARGET_MS), nachprüfbar mit benchmark().
+
+        Args:
+            db_path (str): Pfad zur Datenbank mit der gefüllten Spielerhände-Tabelle (inklusive ev).
+            table_name (str): Name der Spielerhände-Tabelle.
+            deck (Deck, optional): Deck, für das die Datenbank berechnet wurde. Wenn nicht angegeben, wird ein Standarddeck verwendet.
+            columns_dir (str, optional): Spaltenexport der Tabelle (ColumnStore). Wenn angegeben, wird der Index
+                                         aus den .npy-Dateien gebaut und die Datenbank nicht geöffnet.
+            split_columns_dir (str, optional): Spaltenexport der Tabelle 'Split_ev' zu columns_dir.
+        """
+        self.db_path = db_path
+        self.table_name = table_name
+        self.columns_dir = columns_dir
+        self.split_columns_dir = split_columns_dir
+        self.deck = deck if deck is not None else Deck()
+        self.limits = [self.deck.original_card_frequencies.get(card, 0) for card in range(1, 11)]
+        self.version = 0
+        self._index = {}
+        self._reload_lock = threading.Lock()
+        self.reload()
+
+    def load_index(self):
+        """
+        Liest die Tabelle schreibgeschützt und baut daraus einen neuen Index.
+
+        Returns:
+            dict: Handschlüssel -> (minimum_value, is_blackjack, can_double, can_split, stand_ev, ev, split_ev).
+                  split_ev ist None, wenn die Hand kein Paar ist oder 'Split_ev' für dieses Deck fehlt.
+        """
+        if self.columns_dir is not None:
+            from Utility.Columnar import ColumnStore  # NumPy nur für den Spaltenexport nötig
+
+            split_store = ColumnStore(self.split_columns_dir) if self.split_columns_dir is not None else None
+            return self.load_index_from_columns(ColumnStore(self.columns_dir), split_store, self.deck)
+
+        connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            split_evs = {}
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Split_ev'").fetchone():
+                split_evs = dict(connection.execute("SELECT hand_key, ev FROM Split_ev WHERE deck = ?",
+                                                    (self._deck_text(self.deck),)))
+            cursor = connection.execute(f"""
+                SELECT hand_key, minimum_value, is_blackjack, can_double, can_split, win_stand, loss_stand, ev
+                FROM {self.table_name}
+                WHERE dealer_start != 'Blackjack'
+            """)
+            index = {}
+            for hand_key, minimum_value, is_blackjack, can_double, can_split, win_stand, loss_stand, ev in cursor:
+                stand_ev = (win_stand or 0.0) - (loss_stand or 0.0)
+                index[hand_key] = (
+                    minimum_value, bool(is_blackjack), bool(can_double), bool(can_split),
+                    stand_ev, stand_ev if ev is None else ev, split_evs.get(hand_key)
+                )
+            return index
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _deck_text(deck):
+        """Deck-Zusammensetzung in der Form der Spalte 'deck' von 'Split_ev' (DatabaseManager._split_ev_source)."""
+        return ",".join(str(count) for count in deck.get_card_counts())
+
+    @staticmethod
+    def load_index_from_columns(store, split_store=None, deck=None):
+        """
+        Baut den Index direkt aus einem Spaltenexport, ohne SQLite. Die Spalten werden als Memory-Map geladen
+        und vektorisiert aufbereitet; Python-Objekte entstehen nur für die Einträge des Index.
+
+        Args:
+            store (ColumnStore): Export der Spielerhände-Tabelle (mindestens hand_key, minimum_value,
+                                 is_blackjack, can_double, can_split, win_stand, loss_stand und ev).
+            split_store (ColumnStore, optional): Export der Tabelle 'Split_ev' (hand_key, ev, deck). Ohne ihn
+                                                 enthält der Index keine Split-EVs.
+            deck (Deck, optional): Deck, dessen Split-EVs verwendet werden. Standard ist ein Standarddeck.
+
+        Returns:
+            dict: Wie load_index.
+        """
+        import numpy as np
+
+        columns = store.load_columns(["hand_key", "minimum_value", "is_blackjack", "can_double", "can_split",
+                                      "win_stand", "loss_stand", "ev"])
+        keep = (columns["hand_key"] >> UPCARD_SHIFT) != BLACKJACK_UPCARD
+        stand_ev = np.nan_to_num(columns["win_stand"][keep]) - np.nan_to_num(columns["loss_stand"][keep])
+        ev = columns["ev"][keep]
+        ev = np.where(np.isnan(ev), stand_ev, ev)
+        hand_keys = columns["hand_key"][keep].tolist()
+
+        split_evs = {}
+        if split_store is not None:
+            split = split_store.load_columns(["hand_key", "ev", "deck"])
+            same_deck = split["deck"] == Advisor._deck_text(deck if deck is not None else Deck())
+            split_evs = dict(zip(split["hand_key"][same_deck].tolist(), split["ev"][same_deck].tolist()))
+
+        return dict(zip(hand_keys, zip(
+            columns["minimum_value"][keep].tolist(), columns["is_blackjack"][keep].astype(bool).tolist(),
+            columns["can_double"][keep].astype(bool).tolist(), columns["can_split"][keep].astype(bool).tolist(),
+            stand_ev.tolist(), ev.tolist(), [split_evs.get(hand_key) for hand_key in hand_keys])))
+
+    def reload(self):
+        """
+        Lädt den Index neu. Der neue Index wird vollständig aufgebaut und dann per Referenztausch aktiviert,
+        laufende Anfragen arbeiten ungestört mit dem alten Index weiter.
+
+        Returns:
+            int: Anzahl der Einträge im neuen Index.
+        """
+        with self._reload_lock:  # Nur gleichzeitige Reloads werden serialisiert, nie die Leser
+            index = self.load_index()
+            self._index = index
+            self.version += 1
+        return len(index)
+
+    def reload_in_background(self):
+        """
+        Startet reload() in einem Hintergrund-Thread.
+
+        Returns:
+            threading.Thread: Der gestartete Thread.
+        """
+        thread = threading.Thread(target=self.reload, daemon=True)
+        thread.start()
+        return thread
+
+    def __len__(self):
+        return len(self._index)
+
+    def best_action(self, player_cards, upcard, seen_cards=None):
+        """
+        Empfiehlt die beste Aktion für eine Spielerhand gegen die Dealer-Karte.
+
+        Hit und Double werden eine Karte tief aus dem Restdeck (ohne Hand, Dealer-Karte und gesehene Karten)
+        und den EVs der Folgehände im Index berechnet; ohne gesehene Karten entspricht Hit genau der Rückwärtsinduktion.
+        Split ist der exakte Split-EV aus 'Split_ev' (SplitEngine, volles Deck), mit dem auch starthand_overview und
+        Pair_overview entscheiden; gesehene Karten verändern ihn nicht. Ohne 'Split_ev' wird Split nicht angeboten.
+
+        Args:
+            player_cards (list[int]): Die Karten des Spielers.
+            upcard (int): Die offene Dealer-Karte (1 bis 10).
+            seen_cards (list[int], optional): Weitere bereits gesehene Karten, die nicht mehr im Deck sind.
+
+        Returns:
+            dict: {"action": beste Aktion, "ev": {Aktion: EV}}; nicht erlaubte Aktionen fehlen in "ev".
+
+        Raises:
+            KeyError: Wenn die Hand nicht im Index ist (z. B. über 21 oder nicht im Deck möglich).
+        """
+        index = self._index  # Ein Lesezugriff, damit ein Reload mitten in der Anfrage nichts ändert
+        counts = [0] * 10
+        hand_key = upcard << UPCARD_SHIFT
+        for card in player_cards:
+            counts[card - 1] += 1
+            hand_key += CARD_KEY_UNITS[card - 1]
+
+        entry = index.get(hand_key)
+        if entry is None:
+            raise KeyError(f"Hand {list(player_cards)} gegen {upcard} ist nicht im Index.")
+        minimum_value, is_blackjack, can_double, can_split, stand_ev, ev, split_ev = entry
+
+        if is_blackjack:
+            return {"action": "Stand", "ev": {"Stand": ev}}
+
+        # Restdeck
+        remaining = list(self.limits)
+        remaining[upcard - 1] -= 1
+        for card in seen_cards or []:
+            remaining[card - 1] -= 1
+        for card in range(10):
+            remaining[card] = max(0, remaining[card] - counts[card])
+        total_cards = sum(remaining)
+
+        evs = {"Stand": stand_ev}
+        if total_cards > 0:
+            hit_ev = 0.0
+            double_ev = 0.0
+            for card in range(1, 11):
+                available = remaining[card - 1]
+                if available <= 0:
+                    continue
+                probability = available / total_cards
+                if minimum_value + card > 21:
+                    hit_ev -= probability
+                    double_ev -= probability
+                    continue
+                child = index.get(hand_key + CARD_KEY_UNITS[card - 1])
+                if child is None:
+                    hit_ev -= probability  # Pessimistische Annahme wie im EVEngine
+                    double_ev -= probability
+                    continue
+                hit_ev += probability * child[5]
+                double_ev += probability * child[4]
+            evs["Hit"] = hit_ev
+            if can_double:
+                evs["Double"] = 2 * double_ev
+
+        if can_split and split_ev is not None:
+            evs["Split"] = split_ev
+
+        action = max(ACTIONS, key=lambda name: evs.get(name, float("-inf")))
+        return {"action": action, "ev": evs}
+
+    def benchmark(self, samples=10000):
+        """
+        Misst die Latenz von best_action über zufällig gewählte Hände aus dem Index.
+
+        Args:
+            samples (int): Anzahl der Anfragen.
+
+        Returns:
+            dict: Latenzen in Millisekunden (p50, p90, p99, max) und ob das Latenzziel eingehalten wurde.
+        """
+        import random
+
+        queries = []
+        for hand_key in random.Random(0).choices(list(self._index), k=samples):
+            counts, upcard = decode_hand_key(hand_key)
+            cards = [card for card in range(1, 11) for _ in range(counts[card - 1])]
+            if cards:
+                queries.append((cards, upcard))
+
+        latencies = []
+        for cards, upcard in queries:
+            start = time.perf_counter()
+            self.best_action(cards, upcard)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        latencies.sort()
+        result = {
+            "samples": len(latencies),
+            "p50_ms": latencies[int(len(latencies) * 0.50)],
+            "p90_ms": latencies[int(len(latencies) * 0.90)],
+            "p99_ms": latencies[int(len(latencies) * 0.99)],
+            "max_ms": latencies[-1],
+        }
+        result["meets_target"] = result["p99_ms"] < self.LATENCY_TARGET_MS
+        return result
@@ -0,0 +1,144 @@
+import numpy as np
+
+from Models.Deck import Deck
+
+# Reihenfolge der Ergebnisse in allen Matrizen (wie die Schlüssel von calc.probability_distribution)
+OUTCOMES = ["<=16", "17", "18", "19", "20", "21", "Blackjack", "Bust"]
+BLACKJACK = OUTCOMES.index("Blackjack")
+BUST = OUTCOMES.index("Bust")
+
+CARD_VALUES = np.arange(1, 11)
+
+
+def _build_payoff_matrix():
+    """
+    Erstellt die 8×8×3-Matrix (Spieler-Ergebnis × Dealer-Ergebnis × [Gewinn, Verlust, Unentschieden])
+    nach der Win/Loss/Draw-Tabelle in Calculations.py.
+    """
+    payoff = np.zeros((len(OUTCOMES), len(OUTCOMES), 3))
+    for player, player_outcome in enumerate(OUTCOMES):
+        for dealer, dealer_outcome in enumerate(OUTCOMES):
+            if dealer_outcome == "<=16":
+                continue  # Der Dealer bleibt nie unter 17 stehen
+            if player_outcome == "Bust":
+                result = 1
+            elif dealer_outcome == "Bust":
+                result = 0
+            elif player_outcome == "<=16":
+                result = 1
+            elif player_outcome == "Blackjack":
+                result = 2 if dealer_outcome == "Blackjack" else 0
+            elif dealer_outcome == "Blackjack":
+                result = 1
+            else:
+                player_value, dealer_value = int(player_outcome), int(dealer_outcome)
+                result = 0 if player_value > dealer_value else 1 if player_value < dealer_value else 2
+            payoff[player, dealer, result] = 1.0
+    return payoff
+
+
+# Gewinn/Verlust/Unentschieden für jede Kombination aus Spieler- und Dealer-Ergebnis
+PAYOFF_MATRIX = _build_payoff_matrix()
+
+
+def dealer_vector(dealer_hand_distribution):
+    """
+    Wandelt eine Dealer-Verteilung (Dictionary wie von DealerHands.dealer_distribution) in einen Vektor um.
+
+    Args:
+        dealer_hand_distribution (dict): Wahrscheinlichkeiten für 17, 18, 19, 20, 21, Blackjack und Bust.
+
+    Returns:
+        np.ndarray: Vektor der Länge 8 in der Reihenfolge von OUTCOMES.
+    """
+    return np.array([dealer_hand_distribution.get(outcome, 0.0) for outcome in OUTCOMES])
+
+
+def probability_distribution_batch(counts, upcard=None, deck=None):
+    """
+    Batch-Version von calc.probability_distribution für viele Hände gleichzeitig.
+
+    Args:
+        counts (array-like): 2-D-Array (Hände × 10) mit der Kartenzählung 1 bis 10 jeder Hand.
+        upcard (int or str, optional): Bekannte Dealer-Karte, die aus dem Deck entfernt wird ('Blackjack' entfernt nichts).
+        deck (Deck, optional): Deck für die Kartenhäufigkeiten. Wenn nicht angegeben, wird ein Standarddeck verwendet.
+
+    Returns:
+        np.ndarray: Matrix (Hände × 8) mit den Wahrscheinlichkeiten in der Reihenfolge von OUTCOMES.
+    """
+    if deck is None:
+        deck = Deck()
+
+    counts = np.asarray(counts, dtype=np.int64).reshape(-1, 10)
+    original = np.array([deck.original_card_frequencies.get(card, 0) for card in range(1, 11)])
+    dealer = np.zeros(10, dtype=np.int64)
+    if isinstance(upcard, (int, np.integer)):
+        dealer[upcard - 1] = 1
+
+    # Verbleibende Karten unter Berücksichtigung der Hand und der Dealer-Karte
+    remaining = np.maximum(original - counts - dealer, 0)
+    total = remaining.sum(axis=1)
+
+    minimum_value = counts @ CARD_VALUES
+    has_ace = counts[:, 0] > 0
+    length = counts.sum(axis=1)
+
+    # Wert der Hand nach Ziehen jeder Karte (Hände × 10)
+    new_value = minimum_value[:, None] + CARD_VALUES[None, :]
+    soft = (has_ace[:, None] | (CARD_VALUES[None, :] == 1)) & (new_value <= 11)
+    new_value = np.where(soft, new_value + 10, new_value)
+
+    # Ergebnis-Index pro Hand und Karte
+    outcome = np.where(new_value <= 16, 0, new_value - 16)
+    outcome = np.where((new_value == 21) & (length[:, None] == 1), BLACKJACK, outcome)
+    outcome = np.where(new_value > 21, BUST, outcome)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        draw_probabilities = np.where(total[:, None] > 0, remaining / total[:, None], 0.0)
+
+    probabilities = np.zeros((counts.shape[0], len(OUTCOMES)))
+    rows = np.repeat(np.arange(counts.shape[0]), 10)
+    np.add.at(probabilities, (rows, outcome.ravel()), draw_probabilities.ravel())
+
+    # Hände, die schon über 21 liegen, sind sicher Bust
+    busted = minimum_value > 21
+    probabilities[busted] = 0.0
+    probabilities[busted, BUST] = 1.0
+    return probabilities
+
+
+def hit_probabilities_batch(probabilities, dealer_hand_distribution):
+    """
+    Batch-Version von calc.hit_probabilities: eine Matrixmultiplikation über alle Hände.
+
+    Args:
+        probabilities (np.ndarray): Matrix (Hände × 8) aus probability_distribution_batch.
+        dealer_hand_distribution (dict or np.ndarray): Dealer-Verteilung als Dictionary oder Vektor der Länge 8.
+
+    Returns:
+        np.ndarray: Matrix (Hände × 3) mit Gewinn-, Verlust- und Unentschieden-Wahrscheinlichkeiten.
+    """
+    if isinstance(dealer_hand_distribution, dict):
+        dealer_hand_distribution = dealer_vector(dealer_hand_distribution)
+    outcome_payoff = np.tensordot(PAYOFF_MATRIX, dealer_hand_distribution, axes=([1], [0]))  # 8 × 3
+    return np.asarray(probabilities) @ outcome_payoff
+
+
+def stand_probabilities_batch(total_values, is_blackjack, dealer_hand_distribution):
+    """
+    Batch-Version von calc.stand_probabilities. Wie dort verliert eine Hand über 21 beim Stehen immer.
+
+    Args:
+        total_values (array-like): Gesamtwerte der Spielerhände.
+        is_blackjack (array-like): Ob die jeweilige Hand ein Blackjack ist.
+        dealer_hand_distribution (dict or np.ndarray): Dealer-Verteilung als Dictionary oder Vektor der Länge 8.
+
+    Returns:
+        np.ndarray: Matrix (Hände × 3) mit Gewinn-, Verlust- und Unentschieden-Wahrscheinlichkeiten.
+    """
+    total_values = np.asarray(total_values)
+    # Werte über 21 sind Bust und verlieren wie in calc.stand_probabilities gegen jedes Dealer-Ergebnis
+    outcome = np.where(total_values > 21, BUST, np.where(total_values <= 16, 0, total_values - 16))
+    outcome = np.where(np.asarray(is_blackjack, dtype=bool), BLACKJACK, outcome)
+    stand_outcomes = np.eye(len(OUTCOMES))[outcome]
+    return hit_probabilities_batch(stand_outcomes, dealer_hand_distribution)
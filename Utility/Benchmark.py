@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from contextlib import nullcontext
+
+from Models.Deck import Deck
+from Models.Dealer_hands import DealerHands
+from Utility.Advisor import Advisor
+from Utility.Pipeline import Pipeline, OVERVIEW_STAGES
+import Utility.Calculations as calc
+
+# Standardpfad der JSON-Baseline
+BASELINE_PATH = "Data/benchmark_baseline.json"
+
+# Makro-Benchmarks: Funktion aus Main.py -> Stufen der Pipeline, die sie ausführt
+MACRO_TASKS = {
+    "All_Hands_in_DB": ["hands"],
+    "Full_Hands": ["full_player_hands"],
+    "EVs": ["evs"],
+    "Strategy_Overview": OVERVIEW_STAGES,
+}
+
+# Absolute Zeitziele in Sekunden pro Makro-Aufgabe (für jede Deckanzahl), unabhängig von der Baseline
+TARGETS = {
+    "Advisor_p99": Advisor.LATENCY_TARGET_MS / 1000,
+    "House_edge": 10.0,  # Exakter Hausvorteil aller Starthände (HouseEdgeCalculator.run)
+}
+
+
+def time_call(function, repeat=5, number=1):
+    """
+    Misst eine Funktion wie timeit: repeat Durchläufe mit je number Aufrufen, gewertet wird der schnellste.
+
+    Args:
+        function (callable): Die Funktion ohne Argumente.
+        repeat (int): Anzahl der Durchläufe.
+        number (int): Aufrufe pro Durchlauf.
+
+    Returns:
+        float: Sekunden pro Aufruf im schnellsten Durchlauf.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def micro_benchmarks(deck=None):
+    """
+    Die Mikro-Benchmarks für die häufig aufgerufenen Funktionen aus Calculations und die Dealer-Enumeration.
+
+    Args:
+        deck (Deck, optional): Deck-Zusammensetzung. Wenn nicht angegeben, wird ein Standarddeck verwendet.
+
+    Returns:
+        dict: Name -> (Funktion ohne Argumente, Aufrufe pro Durchlauf).
+    """
+    deck = deck if deck is not None else Deck()
+    hand = [10, 2, 1, 3]
+    benchmarks = {
+        "hand_value": (lambda: calc.hand_value(hand), 10000),
+        "hand_value_minimum": (lambda: calc.hand_value(hand, minimum=True), 10000),
+        "hand_frequency": (lambda: calc.hand_frequency([2, 3, 5], deck), 1000),
+        "bust_probability": (lambda: calc.bust_probability([10, 2, 3], deck), 1000),
+        "probability_distribution": (lambda: calc.probability_distribution([10, 2, 3], deck, [6]), 1000),
+        "hand_probability": (lambda: calc.hand_probability([10, 2, 1, 1, 5], deck, [10, 2]), 1000),
+    }
+    # Die Enumeration ohne Cache, für jede Dealer-Karte einzeln
+    for upcard in deck.get_available_cards():
+        benchmarks[f"just_generate_dealer_hands_{upcard}"] = (
+            lambda upcard=upcard: DealerHands(deck).just_generate_dealer_hands(upcard, deck), 1)
+    return benchmarks
+
+
+class BenchmarkSuite:
+    def __init__(self, decks=(1, 2, 6), repeat=5, threshold=0.25, jobs=1):
+        """
+        Benchmark-Suite aus Mikro-Benchmarks (Calculations, Dealer-Enumeration) und Makro-Benchmarks
+        (die Pipeline-Aufgaben aus Main.py für verschiedene Deckanzahlen).
+
+        Args:
+            decks (iterable[int]): Deckanzahlen der Makro-Benchmarks.
+            repeat (int): Durchläufe pro Mikro-Benchmark (der schnellste zählt).
+            threshold (float): Erlaubte Verlangsamung gegenüber der Baseline, z. B. 0.25 für 25 %.
+            jobs (int): An die Pipeline übergebene Anzahl paralleler Jobs.
+        """
+        self.decks = list(decks)
+        self.repeat = repeat
+        self.threshold = threshold
+        self.jobs = jobs
+
+    def run_micro(self, deck=None):
+        """
+        Führt die Mikro-Benchmarks aus.
+
+        Returns:
+            dict: 'micro/<Name>' -> Sekunden pro Aufruf.
+        """
+        results = {}
+        for name, (function, number) in micro_benchmarks(deck).items():
+            results[f"micro/{name}"] = time_call(function, self.repeat, number)
+            print(f"{name}: {results[f'micro/{name}'] * 1e6:.2f} µs")
+        return results
+
+    def run_macro(self, deck_count, db_path=None):
+        """
+        Führt die Makro-Benchmarks für eine Deckanzahl in einer leeren Datenbank aus.
+        Die Aufgaben laufen in der Reihenfolge aus Main.py; die Vorstufen einer Aufgabe sind dann bereits
+        gebaut und werden über den StageCache übersprungen, sodass jede Messung nur ihre eigenen Stufen enthält.
+
+        Args:
+            deck_count (int): Anzahl der Decks.
+            db_path (str, optional): Pfad einer neuen Datenbank, die danach erhalten bleibt. Standard ist eine
+                                     temporäre Datenbank, die am Ende gelöscht wird.
+
+        Returns:
+            dict: 'macro/<Decks>/<Aufgabe>' -> Sekunden.
+        """
+        results = {}
+        with tempfile.TemporaryDirectory() if db_path is None else nullcontext() as temp_dir:
+            db_path = db_path if db_path is not None else os.path.join(temp_dir, "blackjack.db")
+            pipeline = Pipeline(db_path, deck=Deck(deck_count), jobs=self.jobs)
+            for task, stages in MACRO_TASKS.items():
+                start = time.perf_counter()
+                pipeline.run(stages)
+                results[f"macro/{deck_count}/{task}"] = time.perf_counter() - start
+                print(f"{task} ({deck_count} Decks): {results[f'macro/{deck_count}/{task}']:.4f} Sekunden")
+
+            # Latenz des Advisors auf der eben gebauten Datenbank (p99 von best_action)
+            advisor = Advisor(pipeline.db_path, deck=pipeline.deck)
+            results[f"macro/{deck_count}/Advisor_p99"] = advisor.benchmark(samples=5000)["p99_ms"] / 1000
+            print(f"Advisor p99 ({deck_count} Decks): {results[f'macro/{deck_count}/Advisor_p99'] * 1000:.4f} ms")
+
+        from Utility.House_edge import HouseEdgeCalculator  # NumPy nur für die Makro-Benchmarks nötig
+
+        results[f"macro/{deck_count}/House_edge"] = HouseEdgeCalculator(Deck(deck_count)).run()["seconds"]
+        print(f"House_edge ({deck_count} Decks): {results[f'macro/{deck_count}/House_edge']:.4f} Sekunden")
+        return results
+
+    def run(self, macro=True):
+        """
+        Führt alle Benchmarks aus.
+
+        Args:
+            macro (bool): Ob die Makro-Benchmarks laufen sollen.
+
+        Returns:
+            dict: Benchmark-Name -> Sekunden.
+        """
+        results = self.run_micro()
+        if macro:
+            for deck_count in self.decks:
+                results.update(self.run_macro(deck_count))
+        return results
+
+    def compare(self, results, baseline):
+        """
+        Vergleicht Ergebnisse mit einer Baseline. Benchmarks, die nur auf einer Seite vorkommen, werden ignoriert.
+
+        Args:
+            results (dict): Aktuelle Ergebnisse aus run.
+            baseline (dict): Ergebnisse der Baseline.
+
+        Returns:
+            list[tuple]: Regressionen als (Name, Baseline, aktuell, Verhältnis), absteigend nach Verhältnis.
+        """
+        regressions = []
+        for name, seconds in results.items():
+            reference = baseline.get(name)
+            if reference and seconds > reference * (1 + self.threshold):
+                regressions.append((name, reference, seconds, seconds / reference))
+        return sorted(regressions, key=lambda regression: -regression[3])
+
+    @staticmethod
+    def check_targets(results, targets=None):
+        """
+        Prüft die absoluten Zeitziele (z. B. die Latenz des Advisors), die nicht von einer Baseline abhängen.
+
+        Args:
+            results (dict): Ergebnisse aus run.
+            targets (dict, optional): Aufgabe -> Höchstdauer in Sekunden. Standard ist TARGETS.
+
+        Returns:
+            list[tuple]: Verfehlte Ziele als (Name, Ziel, aktuell).
+        """
+        targets = targets if targets is not None else TARGETS
+        missed = []
+        for name, seconds in results.items():
+            limit = targets.get(name.rsplit("/", 1)[-1])
+            if limit is not None and seconds >= limit:
+                missed.append((name, limit, seconds))
+        return missed
+
+    @staticmethod
+    def save_baseline(results, path=BASELINE_PATH):
+        """Speichert Ergebnisse samt Umgebung als JSON-Baseline."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "created_at": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results}, file, indent=2,
+                      sort_keys=True)
+
+    @staticmethod
+    def load_baseline(path=BASELINE_PATH):
+        """
+        Lädt eine JSON-Baseline.
+
+        Returns:
+            dict or None: Benchmark-Name -> Sekunden oder None, wenn keine Baseline existiert.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            return json.load(file)["results"]
+
+
+def main(argv=None):
+    """
+    Kommandozeile: führt die Benchmarks aus, prüft die Zeitziele und vergleicht mit der Baseline
+    (Exit-Code 1 bei Regression oder verfehltem Zeitziel).
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks für Calculations und die Pipeline-Stufen")
+    parser.add_argument("--decks", nargs="+", type=int, default=[1, 2, 6], help="Deckanzahlen der Makro-Benchmarks")
+    parser.add_argument("--micro-only", action="store_true", help="Nur die Mikro-Benchmarks ausführen")
+    parser.add_argument("--repeat", type=int, default=5, help="Durchläufe pro Mikro-Benchmark")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Erlaubte Verlangsamung (0.25 = 25 %%)")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Pfad der JSON-Baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Ergebnisse als neue Baseline speichern")
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(args.decks, repeat=args.repeat, threshold=args.threshold, jobs=args.jobs)
+    results = suite.run(macro=not args.micro_only)
+
+    missed = suite.check_targets(results)
+    for name, limit, seconds in missed:
+        print(f"Zeitziel verfehlt {name}: {seconds:.6f} Sekunden (Ziel unter {limit:.6f})")
+
+    baseline = suite.load_baseline(args.baseline)
+    if args.update_baseline or baseline is None:
+        suite.save_baseline(results, args.baseline)
+        print(f"Baseline in '{args.baseline}' gespeichert.")
+        return 1 if missed else 0
+
+    regressions = suite.compare(results, baseline)
+    for name, reference, seconds, ratio in regressions:
+        print(f"Regression {name}: {reference:.6f} -> {seconds:.6f} Sekunden ({(ratio - 1) * 100:.1f} % langsamer)")
+    if regressions or missed:
+        return 1
+    print(f"Keine Regression über {args.threshold * 100:.0f} % gegenüber der Baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,6 @@
 from collections import Counter
 from Models.Deck import Deck
+from Models.Hand_state import HandState
 import math
 
 def hand_frequency_with_order(current_hand, original_frequencies, cards_to_ignore=1):
@@ -41,7 +42,7 @@ def hand_frequency(cards, deck=None):
     Berechnet die Häufigkeit einer Hand basierend auf den fehlenden Karten.
 
     Args:
-        cards (list): Eine Liste mit den fehlenden Karten.
+        cards (list or HandState): Eine Liste mit den fehlenden Karten oder ein HandState.
         deck (Deck, optional): Eine Instanz des Decks, um die Kartenhäufigkeiten zu erhalten.
                                Wenn nicht angegeben, wird ein Standarddeck verwendet.
 
@@ -54,7 +55,10 @@ def hand_frequency(cards, deck=None):
     # Hole die ursprünglichen Frequenzen aus dem Deck
     original_card_frequencies = deck.card_frequencies
 
-    card_counts = Counter(cards)  # Zähle, wie viele Karten welchen Typs fehlen
+    if isinstance(cards, HandState):
+        card_counts = {card: count for card, count in zip(range(1, 11), cards.counts) if count}
+    else:
+        card_counts = Counter(cards)  # Zähle, wie viele Karten welchen Typs fehlen
     frequency = 1
 
     # Berechne die Häufigkeit basierend auf den Karten im Deck
@@ -73,7 +77,7 @@ def bust_probability(current_hand, deck=None):
     """
     Berechnet die Wahrscheinlichkeit, dass eine Hand überboten wird.
     Args:
-        current_hand (list[int]): Die aktuelle Hand.
+        current_hand (list[int] or HandState): Die aktuelle Hand.
         deck (Deck, optional): Eine Instanz des Decks, um die Kartenhäufigkeiten zu erhalten.
                        Wenn nicht angegeben, wird ein Standarddeck verwendet.
     Returns:
@@ -160,7 +164,7 @@ def probability_distribution(current_hand, deck=None, dealer_cards=None):
     unter Berücksichtigung bekannter Dealer-Karten.
 
     Args:
-        current_hand (list[int]): Die aktuelle Hand.
+        current_hand (list[int] or HandState): Die aktuelle Hand.
         deck (Deck, optional): Eine Instanz des Decks, um die Kartenhäufigkeiten zu erhalten.
                                Wenn nicht angegeben, wird ein Standarddeck verwendet.
         dealer_cards (list[int], optional): Bekannte Karten des Dealers, die aus dem Deck entfernt werden.
@@ -200,11 +204,15 @@ def probability_distribution(current_hand, deck=None, dealer_cards=None):
 
     probabilities = {"<=16": 0.0, "17": 0.0, "18": 0.0, "19": 0.0, "20": 0.0, "21": 0.0, "Blackjack": 0.0, "Bust": 0.0}
 
+    # Wert der neuen Hand aus dem Minimalwert ableiten, ohne die Hand zu kopieren
+    has_ace = current_hand.count(1) > 0
+
     # Wahrscheinlichkeiten berechnen
     for card, count in remaining_frequencies.items():
         if count > 0:
-            new_hand = current_hand + [card]
-            new_value = hand_value(new_hand)
+            new_value = minimum_value + card
+            if (has_ace or card == 1) and new_value <= 11:
+                new_value += 10
 
             if new_value <= 16:
                 probabilities["<=16"] += count / total_cards_left
@@ -232,12 +240,16 @@ def hand_value(hand, minimum=False):
     Berechnet den Wert einer Hand.
 
     Args:
-        hand (dict or list): Die Hand als Wörterbuch (Kartenwert -> Anzahl) oder Liste.
+        hand (dict, list or HandState): Die Hand als Wörterbuch (Kartenwert -> Anzahl), Liste oder HandState.
         minimum (bool): Wenn True, wird der minimale Wert der Hand berechnet.
 
     Returns:
         int: Der berechnete Wert der Hand.
     """
+    # HandState führt die Werte bereits mit
+    if isinstance(hand, HandState):
+        return hand.minimum_value if minimum else hand.total_value
+
     # Wenn die Hand eine Liste ist, wandle sie in ein Wörterbuch um
     if isinstance(hand, list):
         hand = Counter(hand)
@@ -267,10 +279,8 @@ def hand_probability(hand, deck=None, start_cards=None):
     """
     probability = 1.0
     if deck is None:
-        deck_copy = Deck()
-    else:
-        deck_copy = deck.copy()  # Hole eine Kopie des Decks
-    total_cards = deck_copy.total_cards()  # Gesamtzahl der Karten im Deck
+        deck = Deck()
+    state = deck.state.copy()  # Kopie des kompakten Deck-Zustands, das Deck selbst bleibt unverändert
 
     # Zählt, wie oft jede Startkarte in der Hand vorkommt
     start_card_counts = {card: start_cards.count(card) for card in set(start_cards)} if start_cards else {}
@@ -281,10 +291,9 @@ def hand_probability(hand, deck=None, start_cards=None):
             start_card_counts[card] -= 1  # Ignoriere genau eine Instanz dieser Karte
             continue
 
-        if deck_copy.card_frequencies[card] > 0:
-            probability *= deck_copy.card_frequencies[card] / total_cards
-            deck_copy.remove_card(card)  # Entferne die gezogene Karte aus der Kopie des Decks
-            total_cards -= 1
+        if state.counts[card - 1] > 0:
+            probability *= state.counts[card - 1] / state.total
+            state.remove(card)  # Entferne die gezogene Karte aus der Kopie des Decks
         else:
             return 0  # Falls eine Karte nicht mehr verfügbar ist, ist die Wahrscheinlichkeit 0
 
@@ -356,9 +365,13 @@ def stand_probabilities(total_value, is_blackjack, dealer_hand_distribution):
 
     Returns:
         tuple: Ein Tupel (win_prob, loss_prob, draw_prob) mit den Wahrscheinlichkeiten für Gewinn, Verlust und Unentschieden.
+               Eine Hand über 21 ist Bust und verliert immer, auch gegen einen Dealer-Bust.
     """
     win_prob, loss_prob, draw_prob = 0.0, 0.0, 0.0
 
+    if total_value > 21 and not is_blackjack:
+        return win_prob, sum(dealer_hand_distribution.values()), draw_prob
+
     for dealer_outcome, dealer_prob in dealer_hand_distribution.items():
         if dealer_outcome == 'Bust':
             win_prob += dealer_prob
@@ -381,3 +394,89 @@ def stand_probabilities(total_value, is_blackjack, dealer_hand_distribution):
     return win_prob, loss_prob, draw_prob
 
 
+
+
+# Gepackter Handschlüssel: 5 Bit pro Kartenanzahl (Ass in den untersten Bits), darüber 4 Bit für die Dealer-Karte.
+# Eine Hand bis 21 enthält höchstens 21 Asse, die 5 Bit reichen also für jede Deckanzahl; der Schlüssel belegt
+# 54 Bit und passt in eine vorzeichenbehaftete 64-Bit-Ganzzahl (SQLite INTEGER, NumPy int64).
+HAND_KEY_BITS = 5
+HAND_KEY_MASK = (1 << HAND_KEY_BITS) - 1
+UPCARD_SHIFT = 10 * HAND_KEY_BITS
+BLACKJACK_UPCARD = 11  # Dealer-Startkarte 'Blackjack'
+# Summand, um eine Karte zum Schlüssel hinzuzufügen (Index 0 = Ass): Kind-Schlüssel = Schlüssel + CARD_KEY_UNITS[i]
+CARD_KEY_UNITS = tuple(1 << (HAND_KEY_BITS * index) for index in range(10))
+
+
+def upcard_code(dealer_start):
+    """
+    Wandelt eine Dealer-Startkarte in das Feld des Handschlüssels um.
+
+    Args:
+        dealer_start (int, str or None): Dealer-Karte 1 bis 10, 'Blackjack' oder None (keine Dealer-Karte).
+
+    Returns:
+        int: 0 ohne Dealer-Karte, 1 bis 10 oder BLACKJACK_UPCARD.
+    """
+    if dealer_start is None or dealer_start == "":
+        return 0
+    if dealer_start == "Blackjack":
+        return BLACKJACK_UPCARD
+    return int(dealer_start)
+
+
+def encode_hand_key(counts, upcard=None):
+    """
+    Packt einen Kartenzählvektor und die Dealer-Karte in eine Ganzzahl.
+
+    Args:
+        counts (iterable[int]): Anzahl der Karten 1 bis 10.
+        upcard (int, str or None): Dealer-Karte wie bei upcard_code.
+
+    Returns:
+        int: Der Handschlüssel.
+
+    Raises:
+        ValueError: Wenn eine Anzahl nicht in 5 Bit passt.
+    """
+    key = upcard_code(upcard) << UPCARD_SHIFT
+    for index, count in enumerate(counts):
+        if not 0 <= count <= HAND_KEY_MASK:
+            raise ValueError(f"Anzahl {count} der Karte {index + 1} passt nicht in den Handschlüssel.")
+        key |= count << (HAND_KEY_BITS * index)
+    return key
+
+
+def decode_hand_key(key):
+    """
+    Entpackt einen Handschlüssel.
+
+    Args:
+        key (int): Der Handschlüssel.
+
+    Returns:
+        tuple: (Kartenzählung als Tupel mit 10 Einträgen, Dealer-Karte als int, 'Blackjack' oder None).
+    """
+    counts = tuple((key >> (HAND_KEY_BITS * index)) & HAND_KEY_MASK for index in range(10))
+    code = key >> UPCARD_SHIFT
+    upcard = None if code == 0 else "Blackjack" if code == BLACKJACK_UPCARD else code
+    return counts, upcard
+
+
+def hand_key_of_cards(cards, upcard=None):
+    """
+    Handschlüssel einer Liste von Karten (die Reihenfolge spielt keine Rolle).
+
+    Args:
+        cards (iterable[int]): Die Karten der Hand.
+        upcard (int, str or None): Dealer-Karte wie bei upcard_code.
+
+    Returns:
+        int: Der Handschlüssel.
+
+    Raises:
+        ValueError: Wenn eine Karte mehr als HAND_KEY_MASK-mal vorkommt (wie bei encode_hand_key).
+    """
+    counts = [0] * 10
+    for card in cards:
+        counts[card - 1] += 1
+    return encode_hand_key(counts, upcard)
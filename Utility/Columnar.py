@@ -0,0 +1,204 @@
+import json
+import os
+import time
+
+import numpy as np
+
+# Name der Manifest-Datei im Exportverzeichnis
+MANIFEST_NAME = "manifest.json"
+
+# Füllwert für NULL in Ganzzahl-Spalten (Gleitkomma: NaN, Text: '', Wahrheitswerte: False). Ob ein Wert NULL war,
+# steht in einer eigenen Maske '<Spalte>.null.npy', die nur für Spalten mit NULL-Werten geschrieben wird.
+INTEGER_NULL = -1
+
+
+def _column_kind(declared_type):
+    """Ordnet den deklarierten SQLite-Typ einer Spalte einer NumPy-Spaltenart zu."""
+    declared_type = (declared_type or "").upper()
+    if "BOOL" in declared_type:
+        return "bool"
+    if "INT" in declared_type:
+        return "int"
+    if "FLOAT" in declared_type or "REAL" in declared_type or "DOUB" in declared_type:
+        return "float"
+    return "text"
+
+
+class ColumnStore:
+    def __init__(self, directory):
+        """
+        Spaltenweiser Export einer Hände-Tabelle: eine .npy-Datei pro Spalte und ein manifest.json.
+        Auswertungen laden nur die benötigten Spalten per np.load(mmap_mode='r'), ohne Kopie und ohne
+        für jede Zeile ein Python-Tupel zu erzeugen wie fetch_all_hands.
+
+        Args:
+            directory (str): Verzeichnis des Exports.
+        """
+        self.directory = directory
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        """Das Manifest des Exports (Tabelle, Zeilenzahl und pro Spalte Datei, dtype, Art und NULL-Wert)."""
+        if self._manifest is None:
+            with open(os.path.join(self.directory, MANIFEST_NAME)) as file:
+                self._manifest = json.load(file)
+        return self._manifest
+
+    @property
+    def rows(self):
+        return self.manifest["rows"]
+
+    @property
+    def columns(self):
+        return list(self.manifest["columns"])
+
+    def export(self, connection, table_name="Full_player_hands", columns=None, batch_size=100000):
+        """
+        Schreibt eine Tabelle spaltenweise in das Verzeichnis. Die Spaltendateien werden vorab als
+        Memory-Map angelegt und blockweise gefüllt, sodass nie die ganze Tabelle im Speicher liegt.
+
+        Args:
+            connection (sqlite3.Connection): Verbindung zur Datenbank.
+            table_name (str): Name der Tabelle.
+            columns (list[str], optional): Zu exportierende Spalten. Standard sind alle Spalten.
+            batch_size (int): Zeilen pro Block.
+
+        Returns:
+            dict: Das geschriebene Manifest.
+        """
+        declared = {name: declared_type for _, name, declared_type, *_ in
+                    connection.execute(f"PRAGMA table_info({table_name})")}
+        columns = list(columns) if columns is not None else list(declared)
+        kinds = {column: _column_kind(declared[column]) for column in columns}
+        rows = connection.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+
+        # NULL-Werte schon in SQL ersetzen, Texte auf die größte Länge der Spalte auslegen
+        selects, dtypes, nulls = [], {}, {}
+        for column in columns:
+            kind = kinds[column]
+            if kind == "int":
+                selects.append(f"COALESCE({column}, {INTEGER_NULL})")
+                dtypes[column], nulls[column] = np.dtype(np.int64), INTEGER_NULL
+            elif kind == "bool":
+                selects.append(f"COALESCE({column}, 0)")
+                dtypes[column], nulls[column] = np.dtype(np.bool_), False
+            elif kind == "float":
+                selects.append(column)
+                dtypes[column], nulls[column] = np.dtype(np.float64), None  # NULL wird zu NaN
+            else:
+                selects.append(f"COALESCE(CAST({column} AS TEXT), '')")
+                width = connection.execute(f"SELECT MAX(LENGTH({column})) FROM {table_name}").fetchone()[0] or 1
+                dtypes[column], nulls[column] = np.dtype(f"<U{width}"), ""
+
+        # NULL-Masken für Spalten, deren Füllwert mit echten Werten verwechselt werden könnte
+        masked = [column for column in columns if kinds[column] != "float" and connection.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {table_name} WHERE {column} IS NULL)").fetchone()[0]]
+        selects += [f"{column} IS NULL" for column in masked]
+
+        os.makedirs(self.directory, exist_ok=True)
+        files = {column: f"{column}.npy" for column in columns}
+        mask_files = {column: f"{column}.null.npy" for column in masked}
+        arrays = [np.lib.format.open_memmap(os.path.join(self.directory, files[column]), mode="w+",
+                                            dtype=dtypes[column], shape=(rows,)) for column in columns]
+        arrays += [np.lib.format.open_memmap(os.path.join(self.directory, mask_files[column]), mode="w+",
+                                             dtype=np.bool_, shape=(rows,)) for column in masked]
+
+        cursor = connection.execute(f"SELECT {', '.join(selects)} FROM {table_name} ORDER BY rowid")
+        offset = 0
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for array, values in zip(arrays, zip(*batch)):
+                array[offset:offset + len(batch)] = np.array(values, dtype=array.dtype)
+            offset += len(batch)
+        for array in arrays:
+            array.flush()
+        del arrays
+
+        self._manifest = {
+            "table": table_name,
+            "rows": rows,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "columns": {column: {"file": files[column], "dtype": dtypes[column].str, "kind": kinds[column],
+                                 "declared_type": declared[column], "null": nulls[column],
+                                 "null_mask": mask_files.get(column)} for column in columns},
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), "w") as file:
+            json.dump(self._manifest, file, indent=2)
+        print(f"{rows} Zeilen aus '{table_name}' in {len(columns)} Spalten nach '{self.directory}' exportiert.")
+        return self._manifest
+
+    def load(self, column, mmap=True):
+        """
+        Lädt eine Spalte.
+
+        Args:
+            column (str): Name der Spalte.
+            mmap (bool): Schreibgeschützt als Memory-Map laden (ohne Kopie) statt vollständig einzulesen.
+
+        Returns:
+            numpy.ndarray: Die Spalte.
+
+        Raises:
+            KeyError: Wenn die Spalte nicht exportiert wurde.
+        """
+        entry = self.manifest["columns"][column]
+        return np.load(os.path.join(self.directory, entry["file"]), mmap_mode="r" if mmap else None)
+
+    def null_mask(self, column):
+        """
+        NULL-Maske einer Spalte.
+
+        Returns:
+            numpy.ndarray or None: True für NULL-Werte; None, wenn die Spalte keine NULL-Werte enthält
+                                   (Gleitkomma-Spalten verwenden stattdessen NaN).
+        """
+        mask_file = self.manifest["columns"][column].get("null_mask")
+        if mask_file is None:
+            return None
+        return np.load(os.path.join(self.directory, mask_file), mmap_mode="r")
+
+    def load_columns(self, columns, mmap=True):
+        """
+        Lädt mehrere Spalten.
+
+        Returns:
+            dict: Spaltenname -> numpy.ndarray.
+        """
+        return {column: self.load(column, mmap) for column in columns}
+
+    def import_into(self, connection, table_name=None):
+        """
+        Schreibt den Export zurück in eine SQLite-Tabelle (Spaltentypen wie im Original, NULL-Werte wiederhergestellt).
+
+        Args:
+            connection (sqlite3.Connection): Verbindung zur Zieldatenbank.
+            table_name (str, optional): Name der Zieltabelle. Standard ist der Name der exportierten Tabelle.
+
+        Returns:
+            int: Anzahl der eingefügten Zeilen.
+        """
+        table_name = table_name or self.manifest["table"]
+        entries = self.manifest["columns"]
+        columns = list(entries)
+        definitions = ", ".join(f"{column} {entries[column]['declared_type'] or ''}".strip() for column in columns)
+
+        values = []
+        for column in columns:
+            column_values = self.load(column).tolist()
+            if entries[column]["kind"] == "float":
+                column_values = [None if value != value else value for value in column_values]  # NaN -> NULL
+            elif entries[column]["kind"] == "bool":
+                column_values = [int(value) for value in column_values]
+            mask = self.null_mask(column)
+            if mask is not None:
+                column_values = [None if is_null else value for value, is_null in zip(column_values, mask.tolist())]
+            values.append(column_values)
+
+        with connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({definitions})")
+            connection.executemany(f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES "
+                                   f"({', '.join(['?'] * len(columns))})", zip(*values))
+        return self.rows
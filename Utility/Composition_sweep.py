@@ -0,0 +1,363 @@
+import time
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from Models.Deck import Deck
+from Models.Dealer_hands import DealerHands
+from Models.Hand_catalogue import get_catalogue
+from Models.Rules import Rules
+import Utility.Batch_calculations as batch
+from Utility.Split_engine import SplitEngine
+
+
+class CompositionSweep:
+    def __init__(self, deck=None, max_removed=2, rules=None):
+        """
+        Berechnet Strategie und EV aller Starthände für jede Deck-Zusammensetzung, aus der bis zu
+        max_removed Karten entfernt wurden, in einem Durchlauf.
+
+        Geteilt werden zwischen den Zusammensetzungen:
+            - das Handverzeichnis des vollen Decks (Hände einer kleineren Zusammensetzung sind eine Teilmenge,
+              sie werden über die Kartenlimits ausgewählt),
+            - der DP-Speicher der Dealer-Verteilungen (Zustände aus Restdeck und Dealer-Wert kommen in
+              benachbarten Zusammensetzungen wieder vor) sowie der gemeinsame Dealer-Cache,
+            - die EVs der Hände pro (Zusammensetzung, Dealer-Karte, Regeln), die auch der SplitEngine nutzt.
+
+        Mit run_matrix werden mehrere Regelvarianten in einem Durchlauf berechnet; die Ziehwahrscheinlichkeiten
+        hängen nicht von den Regeln ab und werden pro Zusammensetzung nur einmal berechnet.
+
+        Die Entscheidungen folgen 'starthand_overview' (Surrender vor Split vor Double vor Hit/Stand), die EVs dem
+        EVEngine, der Split-EV kommt aus dem SplitEngine; ohne entfernte Karten stimmt das Ergebnis mit der
+        Datenbank-Pipeline überein.
+
+        Args:
+            deck (Deck, optional): Ausgangsdeck. Wenn nicht angegeben, wird ein Standarddeck verwendet.
+            max_removed (int): Maximale Anzahl entfernter Karten pro Zusammensetzung.
+            rules (Rules, optional): Spielregeln. Standard sind die Standardregeln.
+        """
+        self.deck = deck if deck is not None else Deck()
+        self.max_removed = max_removed
+        self.rules = rules if rules is not None else Rules()
+        self.dealer_hands = DealerHands(self.deck)
+        self.dealer_memo = {}
+        self.seconds = 0.0
+        self._hand_values = {}
+
+        # Statische Eigenschaften des vollen Handverzeichnisses als Arrays
+        catalogue = get_catalogue(self.deck)
+        self.catalogue = catalogue
+        self.counts = np.array(catalogue.counts, dtype=np.int64)
+        self.length = self.counts.sum(axis=1)
+        self.total_value = np.array(catalogue.total_value)
+        self.minimum_value = np.array(catalogue.minimum_value)
+        self.is_blackjack = np.array(catalogue.is_blackjack, dtype=bool)
+        self.children = np.array(catalogue.children, dtype=np.int64)
+        self.levels = [np.flatnonzero(self.length == length) for length in range(self.length.max(), -1, -1)]
+        self.starthands = np.flatnonzero(np.array(catalogue.is_starthand, dtype=bool))
+        self.hand_texts = [",".join(map(str, cards)) for cards in catalogue.cards]
+        self.split_engines = {}
+        self.split_engine = self.split_engine_for(self.rules)
+
+    def split_engine_for(self, rules):
+        """
+        SplitEngine für eine Regelvariante (einer pro Regeln, alle nutzen die EVs dieses Objekts).
+
+        Args:
+            rules (Rules): Spielregeln.
+
+        Returns:
+            SplitEngine: Der Engine für diese Regeln.
+        """
+        engine = self.split_engines.get(rules)
+        if engine is None:
+            engine = self.split_engines[rules] = SplitEngine(self, rules)
+        return engine
+
+    def iter_removals(self):
+        """
+        Erzeugt alle Vektoren entfernter Karten mit 0 bis max_removed Karten, benachbarte nacheinander.
+
+        Yields:
+            tuple[int]: Anzahl der entfernten Karten 1 bis 10.
+        """
+        limits = self.deck.get_card_counts()
+        for removed in range(self.max_removed + 1):
+            for cards in combinations_with_replacement(range(1, 11), removed):
+                removal = [0] * 10
+                for card in cards:
+                    removal[card - 1] += 1
+                if all(removal[card] <= limits[card] for card in range(10)):
+                    yield tuple(removal)
+
+    def dealer_distribution(self, upcard, deck, rules=None):
+        """
+        Dealer-Verteilung einer Zusammensetzung über den gemeinsamen Cache und den geteilten DP-Speicher.
+
+        Args:
+            upcard (int): Dealer-Karte.
+            deck (Deck): Deck der Zusammensetzung.
+            rules (Rules, optional): Spielregeln. Standard sind die Regeln des Objekts.
+
+        Returns:
+            dict: Verteilung wie DealerHands.dealer_distribution.
+        """
+        dealer_hands = DealerHands(deck, cache=self.dealer_hands.cache, rules=rules or self.rules)
+        key = dealer_hands.cache_key(upcard, deck)
+        distribution = dealer_hands.cache.get(key)
+        if distribution is None:
+            distribution = dealer_hands.dealer_distribution_dp(upcard, memo=self.dealer_memo)
+            dealer_hands.cache.put(key, distribution)
+        return distribution
+
+    def evaluate(self, removal, rules=None, upcards=None):
+        """
+        Berechnet die Strategiezellen einer Zusammensetzung.
+
+        Args:
+            removal (tuple[int]): Anzahl der entfernten Karten 1 bis 10.
+            rules (Rules, optional): Spielregeln. Standard sind die Regeln des Objekts.
+            upcards (list[int], optional): Nur diese Dealer-Karten berechnen. Standard sind alle verfügbaren.
+
+        Returns:
+            dict: (hand_text, Dealer-Karte) -> (action, ev, stand_ev, hit_ev, double_ev, split_ev).
+        """
+        rules = rules or self.rules
+        return self.evaluate_rules(removal, [rules], upcards)[rules]
+
+    def evaluate_rules(self, removal, rules_list, upcards=None):
+        """
+        Berechnet die Strategiezellen einer Zusammensetzung für mehrere Regelvarianten.
+        Ziehwahrscheinlichkeiten werden pro Dealer-Karte einmal berechnet, Dealer-Verteilungen pro Dealer-Regeln.
+
+        Args:
+            removal (tuple[int]): Anzahl der entfernten Karten 1 bis 10.
+            rules_list (list[Rules]): Die Regelvarianten.
+            upcards (list[int], optional): Nur diese Dealer-Karten berechnen. Standard sind alle verfügbaren.
+
+        Returns:
+            dict: Rules -> Zellen wie bei evaluate.
+        """
+        deck = self.deck.without(removal)
+        counts = tuple(deck.get_card_counts())
+        cells = {rules: {} for rules in rules_list}
+        for upcard in deck.get_available_cards():
+            if upcards is not None and upcard not in upcards:
+                continue
+            available = self.available(deck, upcard)
+            included = np.all(self.counts <= available, axis=1)
+            starthands = self.starthands[included[self.starthands]]
+            probabilities = None
+            for rules in rules_list:
+                values = self._hand_values.get((counts, upcard, rules.hand_key()))
+                if values is None:
+                    if probabilities is None:
+                        probabilities = batch.probability_distribution_batch(self.counts, upcard, deck)
+                    values = self.hand_values(counts, upcard, rules, probabilities)
+                stand_ev, hit_ev, ev, double_ev = values[:4]
+                surrender_ev = rules.surrender_ev(values[5])
+                split_engine = self.split_engine_for(rules)
+
+                for index in starthands:
+                    hand_text = self.hand_texts[index]
+                    split_ev = None
+                    if self.catalogue.can_split[index]:
+                        split_ev = split_engine.split_ev(self.catalogue.cards[index][0], upcard, counts)
+
+                    # Entscheidung wie in starthand_overview
+                    if rules.surrender and surrender_ev > max(ev[index], double_ev[index],
+                                                              -1 if split_ev is None else split_ev):
+                        action, best = "Surrender", surrender_ev
+                    elif split_ev is not None and split_ev > max(ev[index], double_ev[index]):
+                        action, best = "Split", split_ev
+                    elif double_ev[index] > max(ev[index], 0):
+                        action, best = "Double", double_ev[index]
+                    else:
+                        action = "Hit" if hit_ev[index] > stand_ev[index] and not self.is_blackjack[index] else "Stand"
+                        best = ev[index]
+                    cells[rules][(hand_text, upcard)] = (action, float(best), float(stand_ev[index]),
+                                                         float(hit_ev[index]), float(double_ev[index]), split_ev)
+        return cells
+
+    def hand_values(self, counts, upcard, rules=None, probabilities=None):
+        """
+        EVs aller Hände für eine Zusammensetzung und Dealer-Karte, gespeichert pro (Zusammensetzung, Dealer-Karte,
+        Regeln der Hand-EVs). Wird von evaluate und vom SplitEngine verwendet.
+
+        Args:
+            counts (tuple[int]): Zusammensetzung des Decks als Anzahlen der Karten 1 bis 10.
+            upcard (int): Dealer-Karte.
+            rules (Rules, optional): Spielregeln. Standard sind die Regeln des Objekts.
+            probabilities (np.ndarray, optional): Bereits berechnete Ziehwahrscheinlichkeiten der Zusammensetzung.
+
+        Returns:
+            tuple: stand_ev, hit_ev, ev und double_ev pro Hand des Verzeichnisses, der Stand-EV einer 21 ohne Blackjack
+                   und die Wahrscheinlichkeit eines Dealer-Blackjacks (ohne Peek, sonst 0).
+        """
+        rules = rules or self.rules
+        key = (counts, upcard, rules.hand_key())
+        values = self._hand_values.get(key)
+        if values is None:
+            base = self.deck.get_card_counts()
+            deck = self.deck.without([total - count for total, count in zip(base, counts)])
+            dealer = self.dealer_distribution(upcard, deck, rules)
+            stand_ev, hit_ev, ev, double_ev = self.evaluate_upcard(deck, upcard, self.available(deck, upcard), dealer,
+                                                                   rules, probabilities)
+            win, loss, _ = batch.stand_probabilities_batch([21], [False], dealer)[0]
+            values = (stand_ev, hit_ev, ev, double_ev, win - loss, dealer.get("Blackjack", 0.0))
+            self._hand_values[key] = values
+        return values
+
+    @staticmethod
+    def available(deck, upcard):
+        """Verfügbare Anzahl pro Karte für die Spielerhände: Zusammensetzung ohne die Dealer-Karte."""
+        available = np.array(deck.get_card_counts())
+        available[upcard - 1] -= 1
+        return available
+
+    def evaluate_upcard(self, deck, upcard, available, dealer, rules=None, probabilities=None):
+        """
+        Stand/Hit-Wahrscheinlichkeiten (Batch) und Rückwärtsinduktion der EVs für eine Dealer-Karte.
+
+        Args:
+            deck (Deck): Deck der Zusammensetzung.
+            upcard (int): Dealer-Karte.
+            available (np.ndarray): Ergebnis von available(deck, upcard).
+            dealer (dict): Dealer-Verteilung für die Zusammensetzung.
+            rules (Rules, optional): Spielregeln (Blackjack-Auszahlung). Standard sind die Regeln des Objekts.
+            probabilities (np.ndarray, optional): Ziehwahrscheinlichkeiten aus probability_distribution_batch;
+                                                  sie hängen nicht von den Regeln ab.
+
+        Returns:
+            tuple[np.ndarray]: stand_ev, hit_ev, ev und double_ev pro Hand des Verzeichnisses
+                               (Hände, die in der Zusammensetzung nicht möglich sind, haben keinen gültigen Wert).
+        """
+        rules = rules or self.rules
+        included = np.all(self.counts <= available, axis=1)
+        if probabilities is None:
+            probabilities = batch.probability_distribution_batch(self.counts, upcard, deck)
+        hit = batch.hit_probabilities_batch(probabilities, dealer)
+        stand = batch.stand_probabilities_batch(self.total_value, self.is_blackjack, dealer)
+
+        # Hände bis 6 werden wie in Hands._iter_catalogue als sicher verloren geführt
+        low = self.total_value <= 6
+        hit[low] = stand[low] = (0.0, 1.0, 0.0)
+        stand_ev = stand[:, 0] - stand[:, 1]
+        double_ev = 2 * (hit[:, 0] - hit[:, 1])
+
+        # Ziehwahrscheinlichkeiten aus dem Restdeck jeder Hand
+        remaining = np.maximum(available[None, :] - self.counts, 0)
+        total = remaining.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            draw = np.where(total[:, None] > 0, remaining / total[:, None], 0.0)
+
+        # Rückwärtsinduktion: Hände mit mehr Karten zuerst (wie EVEngine)
+        ev = np.full(len(self.counts), -1.0)
+        hit_ev = stand_ev.copy()
+        for level in self.levels:
+            level = level[included[level]]
+            if not len(level):
+                continue
+            children = self.children[level]
+            child_ev = np.where(children >= 0, ev[np.maximum(children, 0)], -1.0)
+            level_hit = np.where(total[level] > 0, (draw[level] * child_ev).sum(axis=1), stand_ev[level])
+            hit_ev[level] = level_hit
+            # Spieler-Blackjack: ohne Peek ist ein Dealer-Blackjack ein Unentschieden (Auszahlung mal Gewinnchance)
+            blackjack_ev = rules.blackjack_payout if rules.peek else rules.blackjack_payout * stand[level, 0]
+            ev[level] = np.where(self.is_blackjack[level], blackjack_ev, np.maximum(level_hit, stand_ev[level]))
+        return stand_ev, hit_ev, ev, double_ev
+
+    def run(self):
+        """
+        Durchläuft alle Zusammensetzungen.
+
+        Returns:
+            dict: Vektor der entfernten Karten -> Zellen aus evaluate.
+        """
+        results = {}
+        start = time.perf_counter()
+        for removal in self.iter_removals():
+            results[removal] = self.evaluate(removal)
+        self.seconds = time.perf_counter() - start
+        return results
+
+    def run_matrix(self, rules_list):
+        """
+        Durchläuft alle Zusammensetzungen für mehrere Regelvarianten in einem Lauf. Handverzeichnis und
+        Ziehwahrscheinlichkeiten werden geteilt, Dealer-Verteilungen zwischen Varianten mit gleichen Dealer-Regeln,
+        Hand-EVs zwischen Varianten, die sich nur in Split- oder Surrender-Regeln unterscheiden.
+
+        Args:
+            rules_list (list[Rules]): Die Regelvarianten, z. B. aus Rules.matrix.
+
+        Returns:
+            dict: Rules -> Ergebnis wie bei run.
+        """
+        results = {rules: {} for rules in rules_list}
+        start = time.perf_counter()
+        for removal in self.iter_removals():
+            for rules, cells in self.evaluate_rules(removal, rules_list).items():
+                results[rules][removal] = cells
+        self.seconds = time.perf_counter() - start
+        return results
+
+    @staticmethod
+    def iter_rows(results):
+        """
+        Wandelt die Ergebnisse in Zeilen für DatabaseManager.save_composition_rows um.
+
+        Args:
+            results (dict): Ergebnis von run.
+
+        Yields:
+            list: Zeile in der Reihenfolge von COMPOSITION_COLUMNS.
+        """
+        for removal, cells in results.items():
+            removal_text = ",".join(map(str, removal))
+            for (hand_text, upcard), (action, ev, stand_ev, hit_ev, double_ev, split_ev) in cells.items():
+                yield [removal_text, *removal, hand_text, str(upcard), action, ev, stand_ev, hit_ev, double_ev, split_ev]
+
+    @staticmethod
+    def effect_of_removal(results):
+        """
+        Effekt des Entfernens je einer Karte: EV-Änderung jeder Strategiezelle gegenüber dem vollen Deck.
+
+        Args:
+            results (dict): Ergebnis von run (muss das volle Deck und die einzelnen Entfernungen enthalten).
+
+        Returns:
+            dict: (hand_text, Dealer-Karte) -> (action, ev, [EV-Änderung für Karte 1 bis 10 oder None]).
+        """
+        base = results[(0,) * 10]
+        effects = {}
+        for cell, (action, ev, *_) in base.items():
+            changes = []
+            for card in range(1, 11):
+                removal = tuple(1 if index == card - 1 else 0 for index in range(10))
+                removed_cell = results.get(removal, {}).get(cell)
+                changes.append(None if removed_cell is None else removed_cell[1] - ev)
+            effects[cell] = (action, ev, changes)
+        return effects
+
+    def save(self, db_manager, results):
+        """
+        Speichert die Zellen aller Zusammensetzungen und den Effekt des Entfernens.
+
+        Args:
+            db_manager (DatabaseManager): Datenbankmanager.
+            results (dict): Ergebnis von run.
+
+        Returns:
+            int: Anzahl der gespeicherten Zellen.
+        """
+        db_manager.drop_table("Composition_strategy")
+        db_manager.drop_table("Composition_effect_of_removal")
+        db_manager.create_table_composition_strategy()
+        db_manager.create_table_effect_of_removal()
+        count = db_manager.save_composition_rows(self.iter_rows(results))
+        if self.max_removed >= 1:
+            db_manager.save_effect_of_removal_rows(
+                [hand_text, str(upcard), action, ev, *changes]
+                for (hand_text, upcard), (action, ev, changes) in self.effect_of_removal(results).items()
+            )
+        return count
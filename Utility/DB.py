@@ -1,21 +1,172 @@
+import json
 import sqlite3
-import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from itertools import islice
 
 from Models.Deck import Deck
+from Models.Dealer_hands import DealerHands
+from Models.Rules import Rules
+from Utility.EV_engine import EVEngine
+from Utility.Instrumentation import instrumented
 import Utility.Calculations as calc
 
+# Spalten der Hände-Tabellen in der Reihenfolge, in der save_hands bzw. save_full_hands sie befüllen
+HAND_COLUMNS = ["hand_type", "start_card"] + [f"c{i}" for i in range(1, 11)] + [
+    "hand_key", "hand_text", "total_value", "minimum_value",
+    "is_blackjack", "is_starthand", "is_busted",
+    "can_double", "can_split", "bust_chance", "frequency", "probability"
+]
+
+FULL_HAND_COLUMNS = [
+                        "hand_type"
+                    ] + [f"c{i}" for i in range(1, 11)] + [
+                        "hand_key", "hand_text", "dealer_start", "total_value", "minimum_value",
+                        "is_blackjack", "is_starthand",
+                        "can_double", "can_split", "frequency", "probability",
+                        "prob_16", "prob_17", "prob_18", "prob_19", "prob_20", "prob_21",
+                        "prob_blackjack", "prob_bust",
+                        "win_hit", "loss_hit", "win_stand", "loss_stand",
+                        "hit_stand", "action", "ev"
+                    ]
+
+# Spalten der Ergebnistabelle des Zusammensetzungs-Sweeps (Schlüssel: removal, hand_text, dealer_start)
+COMPOSITION_COLUMNS = ["removal"] + [f"r{i}" for i in range(1, 11)] + [
+    "hand_text", "dealer_start", "action", "ev", "stand_ev", "hit_ev", "double_ev", "split_ev"
+]
+
+SPLIT_EV_COLUMNS = ["pair_value", "dealer_start", "hand_key", "ev", "deck", "rules"]
+
+EFFECT_OF_REMOVAL_COLUMNS = ["hand_text", "dealer_start", "action", "ev"] + [f"eor_{i}" for i in range(1, 11)]
+
+
+class BulkLoadStats:
+    def __init__(self):
+        """Messwerte eines bulk_load()-Blocks: geschriebene Zeilen, Dauer und Durchsatz."""
+        self.rows = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        """Durchsatz in Zeilen pro Sekunde."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self):
+        """Gibt die Messwerte als Dictionary zurück (z. B. für Berichte)."""
+        return {"rows": self.rows, "seconds": self.seconds, "rows_per_second": self.rows_per_second}
+
+
 class DatabaseManager:
-    def __init__(self, db_path="Data/Blackjack.db"):
+    def __init__(self, db_path="Data/Blackjack.db", batch_size=10000, rules=None, deck=None, write_lock=None):
         """
         Initialisiert den Datenbank-Manager mit einer Verbindung zur angegebenen SQLite-Datenbank.
 
         Args:
             db_path (str): Pfad zur SQLite-Datenbankdatei.
+            batch_size (int): Anzahl der Zeilen pro executemany-Block beim Speichern von Händen.
+            rules (Rules, optional): Spielregeln für EV-Berechnung, Split-EVs und Übersichten.
+            deck (Deck, optional): Deck-Zusammensetzung, für die EVs und Split-EVs berechnet werden
+                                   (dieselbe wie bei der Generierung der Hände). Standard ist ein Standarddeck.
+            write_lock (threading.RLock, optional): Schreibsperre, die sich mehrere Verbindungen teilen (parallele
+                                   Stufen der Pipeline). Schreibtransaktionen und bulk_load() halten sie, Lesezugriffe
+                                   nicht. Standard ist eine eigene Sperre.
         """
-        self.deck = Deck()
+        self.deck = deck if deck is not None else Deck()
+        self.rules = rules if rules is not None else Rules()
         self.db_path = db_path
+        self.batch_size = batch_size
         self.card_columns = [f"c{card}" for card in self.deck.get_available_cards()]
         self.connection = sqlite3.connect(self.db_path)
+        self.rows_written = 0              # Über _save_rows eingefügte Zeilen (für den Durchsatz)
+        self.last_bulk_load = None         # BulkLoadStats des letzten bulk_load()-Blocks
+        self._bulk_loading = False
+        self._deferred_indexes = []
+        self.write_lock = write_lock if write_lock is not None else threading.RLock()
+
+    # Einstellungen für schnelles Einlesen großer Datenmengen
+    BULK_LOAD_PRAGMAS = {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "temp_store": "MEMORY",
+        "cache_size": -262144,  # negativ = KiB, also 256 MiB
+    }
+
+    @contextmanager
+    def bulk_load(self, pragmas=None):
+        """
+        Kontext für große Ladevorgänge: setzt schnelle SQLite-Einstellungen, führt alle Schreibvorgänge
+        in einer einzigen Transaktion aus, erstellt Sekundärindizes erst am Ende und stellt danach die
+        vorherigen Einstellungen wieder her. Der Block hält die Schreibsperre; im WAL-Modus bleibt der
+        Journal-Modus unverändert, damit andere Verbindungen währenddessen lesen können.
+
+        Args:
+            pragmas (dict, optional): Abweichende PRAGMA-Werte; Standard ist BULK_LOAD_PRAGMAS.
+
+        Yields:
+            BulkLoadStats: Wird nach Ende des Blocks mit Zeilenanzahl, Dauer und Zeilen pro Sekunde gefüllt.
+        """
+        pragmas = dict(self.BULK_LOAD_PRAGMAS, **(pragmas or {}))
+        stats = BulkLoadStats()
+        with self.write_lock:
+            self.connection.commit()  # PRAGMA journal_mode ist innerhalb einer Transaktion nicht erlaubt
+            if self.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+                pragmas.pop("journal_mode", None)
+
+            previous = {name: self.connection.execute(f"PRAGMA {name}").fetchone()[0] for name in pragmas}
+            for name, value in pragmas.items():
+                self.connection.execute(f"PRAGMA {name} = {value}")
+
+            rows_before = self.rows_written
+            start_time = time.perf_counter()
+            self._bulk_loading = True
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield stats
+                self._bulk_loading = False
+                for sql in self._deferred_indexes:
+                    self.connection.execute(sql)
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                raise
+            finally:
+                self._bulk_loading = False
+                self._deferred_indexes = []
+                stats.rows = self.rows_written - rows_before
+                stats.seconds = time.perf_counter() - start_time
+                self.last_bulk_load = stats
+                for name, value in previous.items():
+                    self.connection.execute(f"PRAGMA {name} = {value}")
+
+    def _transaction(self):
+        """
+        Gibt den Kontext für einen Schreibvorgang zurück: normalerweise eine Transaktion, die die Schreibsperre
+        hält und am Ende bestätigt wird, innerhalb von bulk_load() einen Kontext ohne Commit, damit alles in einer
+        Transaktion bleibt.
+        """
+        return nullcontext(self.connection) if self._bulk_loading else self._locked_transaction()
+
+    @contextmanager
+    def _locked_transaction(self):
+        """Transaktion unter der Schreibsperre (Commit bzw. Rollback am Ende, danach wird die Sperre frei)."""
+        with self.write_lock, self.connection:
+            yield self.connection
+
+    def _create_index(self, sql, defer=False):
+        """
+        Erstellt einen Index oder merkt ihn sich innerhalb von bulk_load() für das Ende des Ladevorgangs vor.
+
+        Args:
+            sql (str): CREATE INDEX IF NOT EXISTS-Anweisung.
+            defer (bool): Ob der Index während bulk_load() aufgeschoben werden darf.
+        """
+        if defer and self._bulk_loading:
+            if sql not in self._deferred_indexes:
+                self._deferred_indexes.append(sql)
+            return
+        with self._transaction() as conn:
+            conn.execute(sql)
 
     def drop_table(self, table_name):
         """
@@ -24,7 +175,7 @@ class DatabaseManager:
         Args:
             table_name (str): Der Name der Tabelle, die gelöscht werden soll.
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(f'''
                 DROP TABLE IF EXISTS {table_name};
@@ -34,14 +185,14 @@ class DatabaseManager:
     def fetch_all_hands(self, table_name):
         """
         Ruft alle gespeicherten Hände aus der Datenbank ab.
+        Für Auswertungen über einzelne Spalten ist der Spaltenexport (Utility.Columnar.ColumnStore) günstiger.
 
         Returns:
             list: Eine Liste von Tupeln, die alle Hände und deren Eigenschaften repräsentieren.
         """
-        with self.connection as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT * FROM {table_name}")
-            return cursor.fetchall()
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT * FROM {table_name}")
+        return cursor.fetchall()
 
     def close(self):
         """
@@ -56,7 +207,7 @@ class DatabaseManager:
         Args:
             table_name (str): Name der Tabelle.
         """
-        with self.connection as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
 
             # SQL für einheitliche Hände-Tabelle
@@ -66,6 +217,7 @@ class DatabaseManager:
                     hand_type TEXT NOT NULL,                  -- Typ der Hand: 'player' oder 'dealer'
                     start_card INTEGER,                       -- Startkarte der Hand
                     {", ".join(f"{col} INTEGER" for col in self.card_columns)},
+                    hand_key INTEGER,                         -- Gepackte Kartenzählung und Startkarte (calc.encode_hand_key)
                     hand_text VARCHAR UNIQUE,                 -- Textuelle Darstellung der Hand
                     total_value INTEGER,                      -- Gesamtwert der Hand
                     minimum_value INTEGER,                    -- Minimalwert der Hand
@@ -85,6 +237,10 @@ class DatabaseManager:
             cursor.execute(sql)
             print(f"Tabelle '{table_name}' wurde erfolgreich erstellt.")
 
+        # Dealerhände sind geordnet, derselbe Schlüssel kann also mehrfach vorkommen
+        self._create_index(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_hand_key ON {table_name} (hand_key)",
+                           defer=True)
+
     def create_table_full_player_hands(self, table_name="Full_player_hands"):
         """
         Erstellt eine einheitliche Tabelle für Blackjack-Hände, die sowohl Spieler- als auch Dealerhände abdecken kann.
@@ -93,7 +249,7 @@ class DatabaseManager:
             table_name (str): Name der Tabelle.
         """
 
-        with self.connection as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
 
             # SQL für einheitliche Hände-Tabelle
@@ -102,6 +258,7 @@ class DatabaseManager:
                     hand_id INTEGER PRIMARY KEY AUTOINCREMENT, -- Eindeutige ID
                     hand_type TEXT NOT NULL,                   -- Typ der Hand: 'player' oder 'dealer'
                     {", ".join(f"{col} INTEGER" for col in self.card_columns)},
+                    hand_key INTEGER,                          -- Gepackte Kartenzählung und Dealer-Karte (calc.encode_hand_key)
                     hand_text VARCHAR,                         -- Textuelle Darstellung der Hand
                     dealer_start TEXT NOT NULL,                -- Differenzierung nach Dealer-Karten
                     total_value INTEGER,                       -- Gesamtwert der Hand
@@ -139,23 +296,201 @@ class DatabaseManager:
             cursor.execute(sql)
             print(f"Tabelle '{table_name}' wurde erfolgreich erstellt.")
 
+        # Index für Übersichten und Nachschlagen; innerhalb von bulk_load() erst nach dem Einfügen
+        self.create_hand_lookup_index(table_name, defer=True)
+
+    def create_table_composition_strategy(self, table_name="Composition_strategy"):
+        """
+        Erstellt die Ergebnistabelle des Zusammensetzungs-Sweeps: Aktion und EVs jeder Starthand
+        gegen jede Dealer-Karte, pro Vektor der entfernten Karten (r1 bis r10).
+
+        Args:
+            table_name (str): Name der Tabelle.
+        """
+        with self._transaction() as conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    removal TEXT NOT NULL,                     -- Entfernte Karten als Text, z. B. '0,0,0,0,1,0,0,0,0,0'
+                    {", ".join(f"r{i} INTEGER" for i in range(1, 11))},
+                    hand_text VARCHAR NOT NULL,                -- Starthand
+                    dealer_start TEXT NOT NULL,                -- Dealer-Startkarte
+                    action VARCHAR,                            -- Beste Aktion: 'Hit', 'Stand', 'Double' oder 'Split'
+                    ev FLOAT,                                  -- EV der besten Aktion
+                    stand_ev FLOAT,
+                    hit_ev FLOAT,
+                    double_ev FLOAT,
+                    split_ev FLOAT,                            -- NULL, wenn die Hand kein Paar ist
+                    PRIMARY KEY (removal, hand_text, dealer_start)
+                )
+            ''')
+
+    def create_table_effect_of_removal(self, table_name="Composition_effect_of_removal"):
+        """
+        Erstellt die Tabelle mit dem Effekt des Entfernens je einer Karte (EV-Änderung) pro Strategiezelle.
+
+        Args:
+            table_name (str): Name der Tabelle.
+        """
+        with self._transaction() as conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    hand_text VARCHAR NOT NULL,
+                    dealer_start TEXT NOT NULL,
+                    action VARCHAR,                            -- Beste Aktion im vollen Deck
+                    ev FLOAT,                                  -- EV im vollen Deck
+                    {", ".join(f"eor_{i} FLOAT" for i in range(1, 11))},  -- EV-Änderung nach Entfernen der Karte i
+                    PRIMARY KEY (hand_text, dealer_start)
+                )
+            ''')
+
+    def save_composition_rows(self, rows, table_name="Composition_strategy", batch_size=None):
+        """
+        Speichert Zeilen des Zusammensetzungs-Sweeps.
+
+        Args:
+            rows (iterable): Zeilen in der Reihenfolge von COMPOSITION_COLUMNS.
+            table_name (str): Name der Tabelle.
+            batch_size (int, optional): Zeilen pro executemany-Block. Standard ist self.batch_size.
+
+        Returns:
+            int: Anzahl der gespeicherten Zeilen.
+        """
+        return self._save_rows(table_name, COMPOSITION_COLUMNS, rows, batch_size)
+
+    def save_effect_of_removal_rows(self, rows, table_name="Composition_effect_of_removal", batch_size=None):
+        """
+        Speichert den Effekt des Entfernens pro Strategiezelle.
+
+        Args:
+            rows (iterable): Zeilen in der Reihenfolge von EFFECT_OF_REMOVAL_COLUMNS.
+            table_name (str): Name der Tabelle.
+            batch_size (int, optional): Zeilen pro executemany-Block. Standard ist self.batch_size.
+
+        Returns:
+            int: Anzahl der gespeicherten Zeilen.
+        """
+        return self._save_rows(table_name, EFFECT_OF_REMOVAL_COLUMNS, rows, batch_size)
+
+    def create_table_split_ev(self, table_name="Split_ev"):
+        """
+        Erstellt die Tabelle mit dem Split-EV jedes Paars gegen jede Dealer-Karte.
+
+        Args:
+            table_name (str): Name der Tabelle.
+        """
+        with self._transaction() as conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    pair_value INTEGER NOT NULL,               -- Kartenwert des Paars
+                    dealer_start TEXT NOT NULL,                -- Dealer-Startkarte
+                    hand_key INTEGER NOT NULL UNIQUE,          -- Handschlüssel des Paars (Join mit Full_player_hands)
+                    ev FLOAT,                                  -- EV des Splits (Summe aller Teilhände)
+                    deck TEXT NOT NULL,                        -- Kartenanzahlen des Decks (kommagetrennt)
+                    rules TEXT NOT NULL,                       -- Regeln als JSON (Rules.key())
+                    PRIMARY KEY (pair_value, dealer_start)
+                )
+            ''')
+
+    @instrumented()
+    def create_and_fill_split_ev(self, table_name="Split_ev", deck=None, rules=None):
+        """
+        Berechnet die Split-EVs mit dem SplitEngine und speichert sie in 'Split_ev'.
+        Die Übersichten verwenden diese Tabelle für die Split-Entscheidung; Deck und Regeln werden mitgespeichert
+        und dort geprüft.
+
+        Args:
+            table_name (str): Name der Tabelle.
+            deck (Deck, optional): Deck-Zusammensetzung. Standard ist das Deck des DatabaseManagers.
+            rules (Rules, optional): Spielregeln. Standard sind die Regeln des DatabaseManagers.
+
+        Returns:
+            int: Anzahl der gespeicherten Zeilen.
+        """
+        from Utility.Composition_sweep import CompositionSweep  # NumPy nur für die Split-EVs nötig
+
+        deck = deck if deck is not None else self.deck
+        rules = rules if rules is not None else self.rules
+        self.drop_table(table_name)
+        self.create_table_split_ev(table_name)
+        sweep = CompositionSweep(deck, max_removed=0, rules=rules)
+        deck_text, rules_text = self._split_ev_source(deck, rules)
+        rows = ([pair_value, dealer_start, calc.hand_key_of_cards([pair_value, pair_value], dealer_start), ev,
+                 deck_text, rules_text]
+                for pair_value, dealer_start, ev in sweep.split_engine.iter_rows())
+        return self._save_rows(table_name, SPLIT_EV_COLUMNS, rows)
+
+    @staticmethod
+    def _split_ev_source(deck, rules):
+        """Deck und Regeln in der Form, in der sie in 'Split_ev' gespeichert werden."""
+        return ",".join(str(count) for count in deck.get_card_counts()), json.dumps(list(rules.key()))
+
+    def _check_split_ev(self, table_name="Split_ev"):
+        """
+        Prüft, ob 'Split_ev' existiert und für Deck und Regeln des DatabaseManagers berechnet wurde.
+
+        Raises:
+            ValueError: Wenn die Tabelle fehlt oder zu einem anderen Deck bzw. anderen Regeln gehört.
+        """
+        if not self.table_exists(table_name):
+            raise ValueError(f"Tabelle '{table_name}' fehlt, zuerst create_and_fill_split_ev() ausführen.")
+        sources = self.connection.execute(f"SELECT DISTINCT deck, rules FROM {table_name}").fetchall()
+        expected = self._split_ev_source(self.deck, self.rules)
+        if sources != [expected]:
+            raise ValueError(f"Tabelle '{table_name}' wurde für Deck/Regeln {sources} berechnet, erwartet {expected}.")
+
+    def create_table_stage_metadata(self, table_name="Stage_metadata"):
+        """
+        Erstellt die Tabelle mit den Fingerabdrücken der Pipeline-Stufen (siehe StageCache).
+
+        Args:
+            table_name (str): Name der Tabelle.
+        """
+        with self._transaction() as conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    stage TEXT NOT NULL,                       -- Name der Stufe
+                    fingerprint TEXT NOT NULL,                 -- SHA-256 der Eingaben der Stufe
+                    inputs TEXT,                               -- Eingaben als JSON (zur Nachvollziehbarkeit)
+                    tables TEXT,                               -- Ausgabetabellen, kommagetrennt
+                    indexes TEXT,                              -- CREATE INDEX-Anweisungen archivierter Tabellen (JSON)
+                    active INTEGER NOT NULL DEFAULT 0,         -- 1 = Tabellen liegen unter ihrem eigentlichen Namen
+                    seconds FLOAT,                             -- Dauer der Berechnung
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (stage, fingerprint)
+                )
+            ''')
+
+    def table_exists(self, table_name):
+        """
+        Prüft, ob eine Tabelle existiert.
+
+        Args:
+            table_name (str): Name der Tabelle.
+
+        Returns:
+            bool: True, wenn die Tabelle existiert.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+        return cursor.fetchone() is not None
+
     def create_stats_table(self):
         """Erstellt die Tabelle für die Dealerhand-Statistiken mit relativen Häufigkeiten, falls sie nicht existiert."""
-        cursor = self.connection.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS dealer_hand_stats (
-                start_card TEXT PRIMARY KEY,
-                count_17 REAL DEFAULT 0,
-                count_18 REAL DEFAULT 0,
-                count_19 REAL DEFAULT 0,
-                count_20 REAL DEFAULT 0,
-                count_21 REAL DEFAULT 0,
-                count_blackjack REAL DEFAULT 0,
-                count_busted REAL DEFAULT 0
-            )
-        """)
-        self.connection.commit()
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dealer_hand_stats (
+                    start_card TEXT PRIMARY KEY,
+                    count_17 REAL DEFAULT 0,
+                    count_18 REAL DEFAULT 0,
+                    count_19 REAL DEFAULT 0,
+                    count_20 REAL DEFAULT 0,
+                    count_21 REAL DEFAULT 0,
+                    count_blackjack REAL DEFAULT 0,
+                    count_busted REAL DEFAULT 0
+                )
+            """)
 
+    @instrumented()
     def update_dealer_hand_statistics(self):
         """Berechnet die relativen Häufigkeiten der Dealerhände nach Startkarte."""
         cursor = self.connection.cursor()
@@ -179,122 +514,92 @@ class DatabaseManager:
         cursor.execute(query)
         results = cursor.fetchall()
 
-        # Tabelle leeren, um alte Werte zu überschreiben
-        cursor.execute("DELETE FROM dealer_hand_stats")
-
-        # Ergebnisse mit relativen Häufigkeiten speichern
-        for row in results:
-            start_card, count_17, count_18, count_19, count_20, count_21, count_blackjack, count_busted, total_hands = row
-
-            # Berechnung der relativen Häufigkeiten (0 falls total_hands = 0)
-            relative_values = [
-                start_card,
-                count_17 / total_hands if total_hands else 0,
-                count_18 / total_hands if total_hands else 0,
-                count_19 / total_hands if total_hands else 0,
-                count_20 / total_hands if total_hands else 0,
-                count_21 / total_hands if total_hands else 0,
-                count_blackjack / total_hands if total_hands else 0,
-                count_busted / total_hands if total_hands else 0
-            ]
-
-            cursor.execute("""
+        # Relative Häufigkeiten berechnen (0 falls total_hands = 0)
+        rows = []
+        for start_card, *counts, total_hands in results:
+            rows.append([start_card] + [count / total_hands if total_hands else 0 for count in counts])
+
+        # Tabelle leeren, um alte Werte zu überschreiben, und die Ergebnisse speichern
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM dealer_hand_stats")
+            conn.executemany("""
                 INSERT INTO dealer_hand_stats (start_card, count_17, count_18, count_19, count_20, count_21, count_blackjack, count_busted)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, relative_values)
-
-        self.connection.commit()
+            """, rows)
 
     def inspect_table_columns(self, table_name):
         """Inspects the columns of a given table."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
+        cursor = self.connection.cursor()
+        cursor.execute(f"PRAGMA table_info({table_name});")
+        columns = cursor.fetchall()
 
-            print("Tabellenstruktur:")
-            for col in columns:
-                print(
-                    f"Spalten-ID: {col[0]}, Name: {col[1]}, Typ: {col[2]}, Not Null: {col[3]}, Default: {col[4]}, Primary Key: {col[5]}")
+        print("Tabellenstruktur:")
+        for col in columns:
+            print(
+                f"Spalten-ID: {col[0]}, Name: {col[1]}, Typ: {col[2]}, Not Null: {col[3]}, Default: {col[4]}, Primary Key: {col[5]}")
 
-    def save_hands(self, table_name, hands):
+    def save_hands(self, table_name, hands, batch_size=None):
         """
-        Speichert mehrere Hände auf einmal in der angegebenen Tabelle (Batch-Insert).
+        Speichert mehrere Hände in der angegebenen Tabelle (Batch-Insert).
+        Die Hände können auch als Generator übergeben werden; sie werden dann blockweise gespeichert,
+        ohne dass alle Hände gleichzeitig im Speicher liegen.
 
         Args:
             table_name (str): Name der Tabelle.
-            hands (list of dict): Eine Liste von Händen mit ihren Attributen.
+            hands (iterable of dict): Die Hände mit ihren Attributen (Liste oder Generator).
+            batch_size (int, optional): Zeilen pro executemany-Block. Standard ist self.batch_size.
+
+        Returns:
+            int: Anzahl der gespeicherten Hände.
         """
-        if not hands:
-            return  # Falls keine Hände übergeben wurden, nichts tun
+        rows = (self._hand_row(hand_data) for hand_data in hands)
+        return self._save_rows(table_name, HAND_COLUMNS, rows, batch_size)
 
-        # Spalten definieren
-        columns = ["hand_type", "start_card"] + [f"c{i}" for i in range(1, 11)] + [
-            "hand_text", "total_value", "minimum_value",
-            "is_blackjack", "is_starthand", "is_busted",
-            "can_double", "can_split", "bust_chance", "frequency", "probability"
-        ]
+    def save_full_hands(self, table_name, hands, batch_size=None):
+        """
+        Speichert mehrere Spielerhände in der angegebenen Tabelle (Batch-Insert).
+        Die Hände können auch als Generator übergeben werden; sie werden dann blockweise gespeichert.
 
-        # SQL-Anweisung vorbereiten
-        placeholders = ", ".join(["?"] * len(columns))
-        sql = f'''
-            INSERT INTO {table_name} ({", ".join(columns)})
-            VALUES ({placeholders})
-        '''
+        Args:
+            table_name (str): Name der Tabelle.
+            hands (iterable of dict): Die Hände mit ihren Attributen (Liste oder Generator).
+            batch_size (int, optional): Zeilen pro executemany-Block. Standard ist self.batch_size.
 
-        # Werte für Batch-Insert vorbereiten
-        values = []
-        for hand_data in hands:
-            hand_text = ",".join(map(str, hand_data["hand"]))
-            card_frequencies = [hand_data["hand"].count(i) for i in range(1, 11)]
+        Returns:
+            int: Anzahl der gespeicherten Hände.
+        """
+        rows = (self._full_hand_row(hand_data) for hand_data in hands)
+        return self._save_rows(table_name, FULL_HAND_COLUMNS, rows, batch_size)
 
-            values.append([
-                hand_data["hand_type"],
-                hand_data["start_card"] if hand_data["hand_type"] == "dealer" else None,
-                *card_frequencies,
-                hand_text,
-                hand_data["total_value"],
-                hand_data["minimum_value"],
-                hand_data["is_blackjack"],
-                hand_data["is_starthand"],
-                hand_data["is_busted"],
-                hand_data["can_double"],
-                hand_data["can_split"],
-                hand_data["bust_chance"],
-                hand_data["frequency"],
-                hand_data["probability"]
-            ])
-        # Datenbank-Insert in einer einzigen Transaktion
-        try:
-            with self.connection as conn:
-                conn.executemany(sql, values)  # Alle Hände auf einmal einfügen
-            print(f"{len(hands)} Hände erfolgreich in '{table_name}' gespeichert.")
-        except sqlite3.IntegrityError as e:
-            print(f"Fehler beim Speichern der Hände: {e}")
+    def save_full_hand_rows(self, table_name, rows, batch_size=None):
+        """
+        Speichert bereits aufbereitete Zeilen (z. B. aus parallelen Workern) in einer Spielerhände-Tabelle.
+
+        Args:
+            table_name (str): Name der Tabelle.
+            rows (iterable): Zeilen in der Reihenfolge von FULL_HAND_COLUMNS.
+            batch_size (int, optional): Zeilen pro executemany-Block. Standard ist self.batch_size.
+
+        Returns:
+            int: Anzahl der gespeicherten Zeilen.
+        """
+        return self._save_rows(table_name, FULL_HAND_COLUMNS, rows, batch_size)
 
-    def save_full_hands(self, table_name, hands):
+    def _save_rows(self, table_name, columns, rows, batch_size=None):
         """
-        Speichert mehrere Hände auf einmal in der angegebenen Tabelle (Batch-Insert).
+        Fügt Zeilen blockweise mit executemany in einer einzigen Transaktion ein.
 
         Args:
             table_name (str): Name der Tabelle.
-            hands (list of dict): Eine Liste von Händen mit ihren Attributen.
-        """
-        if not hands:
-            return  # Falls keine Hände übergeben wurden, nichts tun
-
-        # Spalten definieren
-        columns = [
-                      "hand_type"
-                  ] + [f"c{i}" for i in range(1, 11)] + [
-                      "hand_text", "dealer_start", "total_value", "minimum_value",
-                      "is_blackjack", "is_starthand",
-                      "can_double", "can_split", "frequency", "probability",
-                      "prob_16", "prob_17", "prob_18", "prob_19", "prob_20", "prob_21",
-                      "prob_blackjack", "prob_bust",
-                      "win_hit", "loss_hit", "win_stand", "loss_stand",
-                      "hit_stand", "action", "ev"
-                  ]
+            columns (list[str]): Spaltennamen in der Reihenfolge der Zeilenwerte.
+            rows (iterable): Zeilen als Listen oder Tupel.
+            batch_size (int, optional): Zeilen pro executemany-Block. Standard ist self.batch_size.
+
+        Returns:
+            int: Anzahl der gespeicherten Zeilen.
+        """
+        if batch_size is None:
+            batch_size = self.batch_size
 
         # SQL-Anweisung vorbereiten
         placeholders = ", ".join(["?"] * len(columns))
@@ -303,49 +608,86 @@ class DatabaseManager:
             VALUES ({placeholders})
         '''
 
-        # Werte für Batch-Insert vorbereiten
-        values = []
-        for hand_data in hands:
-            hand_text = ",".join(map(str, hand_data["hand"]))
-            card_frequencies = [hand_data["hand"].count(i) for i in range(1, 11)]
-
-            values.append([
-                hand_data["hand_type"],
-                *card_frequencies,
-                hand_text,
-                ",".join(map(str, hand_data["dealer_start"])),  # Liste in String umwandeln
-                hand_data["total_value"],
-                hand_data["minimum_value"],
-                hand_data["is_blackjack"],
-                hand_data["is_starthand"],
-                hand_data["can_double"],
-                hand_data["can_split"],
-                hand_data["frequency"],
-                hand_data["probability"],
-                hand_data["probabilities"]["<=16"],
-                hand_data["probabilities"]["17"],
-                hand_data["probabilities"]["18"],
-                hand_data["probabilities"]["19"],
-                hand_data["probabilities"]["20"],
-                hand_data["probabilities"]["21"],
-                hand_data["probabilities"]["Blackjack"],
-                hand_data["probabilities"]["Bust"],
-                hand_data.get("win_hit", 0),
-                hand_data.get("loss_hit", 0),
-                hand_data.get("win_stand", 0),
-                hand_data.get("loss_stand", 0),
-                hand_data.get("hit_stand"),
-                hand_data.get("action"),
-                hand_data.get("ev", 0)
-            ])
-
-        # Datenbank-Insert in einer einzigen Transaktion
+        count = 0
+        rows = iter(rows)
+        # Datenbank-Insert in einer einzigen Transaktion, aber in Blöcken fester Größe
         try:
-            with self.connection as conn:
-                conn.executemany(sql, values)  # Alle Hände auf einmal einfügen
-            print(f"{len(hands)} Hände erfolgreich in '{table_name}' gespeichert.")
+            with self._transaction() as conn:
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    conn.executemany(sql, batch)
+                    count += len(batch)
+                    self.rows_written += len(batch)
+            if count:
+                print(f"{count} Hände erfolgreich in '{table_name}' gespeichert.")
         except sqlite3.IntegrityError as e:
             print(f"Fehler beim Speichern der Hände: {e}")
+        return count
+
+    @staticmethod
+    def _hand_row(hand_data):
+        """Wandelt eine Hand aus den Generatoren in eine Zeile für HAND_COLUMNS um."""
+        hand_text = ",".join(map(str, hand_data["hand"]))
+        card_frequencies = [hand_data["hand"].count(i) for i in range(1, 11)]
+        start_card = hand_data["start_card"] if hand_data["hand_type"] == "dealer" else None
+
+        return [
+            hand_data["hand_type"],
+            start_card,
+            *card_frequencies,
+            calc.encode_hand_key(card_frequencies, start_card),
+            hand_text,
+            hand_data["total_value"],
+            hand_data["minimum_value"],
+            hand_data["is_blackjack"],
+            hand_data["is_starthand"],
+            hand_data["is_busted"],
+            hand_data["can_double"],
+            hand_data["can_split"],
+            hand_data["bust_chance"],
+            hand_data["frequency"],
+            hand_data["probability"]
+        ]
+
+    @staticmethod
+    def _full_hand_row(hand_data):
+        """Wandelt eine Spielerhand aus den Generatoren in eine Zeile für FULL_HAND_COLUMNS um."""
+        hand_text = ",".join(map(str, hand_data["hand"]))
+        card_frequencies = [hand_data["hand"].count(i) for i in range(1, 11)]
+        dealer_start = hand_data["dealer_start"]
+
+        return [
+            hand_data["hand_type"],
+            *card_frequencies,
+            calc.encode_hand_key(card_frequencies, dealer_start[0] if dealer_start else None),
+            hand_text,
+            ",".join(map(str, hand_data["dealer_start"])),  # Liste in String umwandeln
+            hand_data["total_value"],
+            hand_data["minimum_value"],
+            hand_data["is_blackjack"],
+            hand_data["is_starthand"],
+            hand_data["can_double"],
+            hand_data["can_split"],
+            hand_data["frequency"],
+            hand_data["probability"],
+            hand_data["probabilities"]["<=16"],
+            hand_data["probabilities"]["17"],
+            hand_data["probabilities"]["18"],
+            hand_data["probabilities"]["19"],
+            hand_data["probabilities"]["20"],
+            hand_data["probabilities"]["21"],
+            hand_data["probabilities"]["Blackjack"],
+            hand_data["probabilities"]["Bust"],
+            hand_data.get("win_hit", 0),
+            hand_data.get("loss_hit", 0),
+            hand_data.get("win_stand", 0),
+            hand_data.get("loss_stand", 0),
+            hand_data.get("hit_stand"),
+            hand_data.get("action"),
+            hand_data.get("ev", 0)
+        ]
 
     def print_hand_count(self, table_name):
         """
@@ -355,11 +697,10 @@ class DatabaseManager:
             table_name (str): Name der Tabelle, in der die Hände gespeichert sind.
         """
         print(f"Anzahl gespeicherter Hände in der Tabelle '{table_name}':")
-        with self.connection:
-            cursor = self.connection.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")  # Tabellennamen korrekt einfügen
-            count = cursor.fetchone()[0]
-            print(f"{count} Hände sind in der Datenbank gespeichert.")
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")  # Tabellennamen korrekt einfügen
+        count = cursor.fetchone()[0]
+        print(f"{count} Hände sind in der Datenbank gespeichert.")
 
     def get_dealer_hand_statistics(self):
         """Gibt eine Auswertung der Dealerhände nach Startkarte zurück."""
@@ -386,10 +727,10 @@ class DatabaseManager:
         results = cursor.fetchall()
         return results
 
+    @instrumented()
     def create_player_dealer_startcard_overview(self, table_name):
         # Bestehende Tabelle löschen
         self.drop_table("Player_dealer_startcard_overview")
-        cursor = self.connection.cursor()
 
         # SQL-Query mit formatiertem Tabellen-Namen
         query = f"""
@@ -417,10 +758,19 @@ class DatabaseManager:
             ORDER BY hand_type DESC, total_value, start_card;
         """
 
-        cursor.execute(query)
-        self.connection.commit()
+        with self._transaction() as conn:
+            conn.execute(query)
 
+    @instrumented()
     def get_ev_for_hands(self, table_name):
+        """
+        Berechnet die Erwartungswerte aller Hände per Rückwärtsinduktion im Speicher (EVEngine)
+        und schreibt EV und optimale Aktion (Hit/Stand) gesammelt zurück.
+        Die Verbindung bleibt geöffnet, damit weitere Schritte sie nutzen können.
+
+        Args:
+            table_name (str): Name der Spielerhände-Tabelle.
+        """
         try:
             print("Starte get_ev_for_hands Methode")
             cursor = self.connection.cursor()
@@ -428,130 +778,22 @@ class DatabaseManager:
             # Spalte 'ev' hinzufügen, falls nicht vorhanden
             cursor.execute(f"PRAGMA table_info({table_name})")
             if "ev" not in {row[1] for row in cursor.fetchall()}:
-                cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN ev FLOAT")
-
-            # Einfache Fälle direkt berechnen
-            cursor.execute(f"""
-                UPDATE {table_name}
-                SET ev = win_stand - loss_stand
-                WHERE action = 'Stand'
-            """)
-
-            cursor.execute(f"""
-                UPDATE {table_name}
-                SET ev = 
-                    CASE
-                        WHEN dealer_start = 'Blackjack' AND is_blackjack = 1 THEN 0
-                        WHEN is_blackjack = 1 THEN 1.5
-                        WHEN dealer_start = 'Blackjack' THEN -1
-                    END
-                WHERE dealer_start = 'Blackjack' OR is_blackjack = 1
-            """)
-
-            # Cache aller Hände aufbauen
-            cursor.execute(f"""
-                SELECT c1,c2,c3,c4,c5,c6,c7,c8,c9,c10,
-                       minimum_value, dealer_start, ev
-                FROM {table_name}
-                --WHERE (c1 = 4 OR c2 = 4)  --# debugging
-            """)
-            hand_cache = {
-                (c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, min_val, dealer): ev
-                for c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, min_val, dealer, ev in cursor.fetchall()
-            }
-            print(f"Anzahl der gefundenen Hände: {len(hand_cache)}")
-
-            # Hände mit 'Hit' verarbeiten
-            cursor.execute(f"""
-                SELECT hand_id, minimum_value, dealer_start, 
-                       c1,c2,c3,c4,c5,c6,c7,c8,c9,c10
-                FROM {table_name}
-                WHERE action = 'Hit'
-                ORDER BY (c1+c2+c3+c4+c5+c6+c7+c8+c9+c10) DESC
-            """)
+                with self._transaction() as conn:
+                    conn.execute(f"ALTER TABLE {table_name} ADD COLUMN ev FLOAT")
 
-            for hand in cursor.fetchall():
-                hand_id, min_value, dealer_start, *card_counts = hand
-
-                # Deck-Status zurücksetzen
-                deck = Deck()
-
-                # Dealer-Karte entfernen
-                deck.remove_card(int(dealer_start))
-
-                # Karten aus dem Deck entfernen basierend auf der aktuellen Hand
-                for card_value, count in enumerate(card_counts, start=1):
-                    for _ in range(count):
-                        try:
-                            deck.remove_card(card_value)
-                        except ValueError:
-                            print(f"Ungültige Hand {hand_id}: Zu viele Karten des Werts {card_value}")
-                            continue
-
-                # Wahrscheinlichkeiten korrekt berechnen
-                total_cards = deck.total_cards()
-                probabilities = {}
-                for card in deck.get_available_cards():
-                    available = deck.card_frequencies[card]
-                    probabilities[card] = available / total_cards if total_cards > 0 else 0
-
-                expected_value = 0.0
-
-                for card in deck.get_available_cards():
-                    if deck.card_frequencies[card] == 0:
-                        continue  # Karte nicht mehr verfügbar
-
-                    new_min = min_value + card
-                    if new_min > 21:
-                        expected_value += probabilities[card] * (-1)  # Bust
-                        continue
-
-                    new_counts = list(card_counts)
-                    new_counts[card - 1] += 1
-                    cache_key = tuple(int(count) for count in new_counts[:10]) + (int(new_min),) + ((dealer_start,) if isinstance(dealer_start, str) else dealer_start)
-                    # cache_key = tuple(new_counts + [new_min, dealer_start])
-
-                    if cache_key not in hand_cache:
-                        # Hier beginnen die Debugging-Ausgaben
-                        sys.stdout.flush()
-                        print("Debug-Ausgabe")
-                        print(f"Original new_counts: {new_counts}")
-                        print(f"Processed new_counts: {tuple(int(count) for count in new_counts[:10])}")
-                        print(f"new_min: {new_min}")
-                        print(f"dealer_start: {dealer_start}")
-                        print(f"Final cache_key: {cache_key}")
-                        print(f"Is key in cache: {cache_key in hand_cache}")
-                        print("Key not found in cache!")
-                        print(f"Warnung: Folgehand nicht im Cache: {cache_key}")
-                        next_ev = -1  # Pessimistische Annahme, wenn die Hand fehlt
-                    else:
-                        next_ev = hand_cache[cache_key]
-
-                    expected_value += probabilities[card] * next_ev
-
-                    #print(f"Nach Ziehen von Karte {card}: EV = {expected_value:.4f}")
-
-                #print(f"Finale EV für diese Hand: {expected_value:.4f}")
-
-                # Update der Datenbank
-                cursor.execute(f"""
-                    UPDATE {table_name}
-                    SET ev = ?
-                    WHERE hand_id = ?
-                """, (expected_value, hand_id))
-
-            self.connection.commit()
+            engine = EVEngine(self.connection, table_name, self.deck, transaction=self._transaction, rules=self.rules)
+            count = engine.run()
+            print(f"EV für {count} Hände berechnet.")
+            if engine.missing_children:
+                print(f"Warnung: {engine.missing_children} Folgehände nicht gefunden (EV -1 angenommen).")
 
         except sqlite3.Error as e:
             print(f"Datenbankfehler: {e}")
             self.connection.rollback()
-        finally:
-            if self.connection:
-                self.connection.close()
 
+    @instrumented()
     def create_and_fill_player_dealer_strategy_table(self):
         self.drop_table("Player_dealer_strategy_table")
-        cursor = self.connection.cursor()
 
         query = """
             CREATE TABLE Player_dealer_strategy_table AS
@@ -583,12 +825,12 @@ class DatabaseManager:
             ORDER BY total_value;
         """
 
-        cursor.execute(query)
-        self.connection.commit()
+        with self._transaction() as conn:
+            conn.execute(query)
 
+    @instrumented()
     def create_and_fill_player_dealer_strategy_table_soft(self):
         self.drop_table("Player_dealer_strategy_table_soft")
-        cursor = self.connection.cursor()
 
         query = """
             CREATE TABLE Player_dealer_strategy_table_soft AS
@@ -620,212 +862,183 @@ class DatabaseManager:
             ORDER BY total_value;
         """
 
-        cursor.execute(query)
-        self.connection.commit()
+        with self._transaction() as conn:
+            conn.execute(query)
+
+    def create_hand_lookup_index(self, table_name="Full_player_hands", defer=False):
+        """
+        Erstellt die Indizes zum Nachschlagen einer Hand für eine Dealer-Startkarte: den eindeutigen Index auf
+        hand_key (Joins der Übersichten, Folgehände) und den Index auf (hand_text, dealer_start) für Anfragen
+        mit der Textdarstellung (StrategyServer).
+
+        Args:
+            table_name (str): Name der Spielerhände-Tabelle.
+            defer (bool): Innerhalb von bulk_load() erst am Ende des Ladevorgangs erstellen.
+        """
+        self._create_index(f"""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_hand_key
+            ON {table_name} (hand_key)
+        """, defer=defer)
+        self._create_index(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table_name}_hand_dealer
+            ON {table_name} (hand_text, dealer_start)
+        """, defer=defer)
+
+    @staticmethod
+    def _dealer_pivot_columns(value_column="decision"):
+        """Erzeugt die Spalten Dealer_1 bis Dealer_10, die eine Entscheidung pro Dealer-Startkarte auffächern."""
+        return ",\n".join(
+            f"MAX(CASE WHEN dealer_start = '{i}' THEN {value_column} END) AS Dealer_{i}" for i in range(1, 11)
+        )
+
+    @staticmethod
+    def _dealer_upsert_columns():
+        """Erzeugt die SET-Klausel für ON CONFLICT mit den Spalten Dealer_1 bis Dealer_10."""
+        return ", ".join(f"Dealer_{i} = excluded.Dealer_{i}" for i in range(1, 11))
+
+    def _fill_dealer_overview(self, table_name, key_column, key_type, rows):
+        """
+        Erstellt eine Übersicht mit einer Zeile pro Schlüssel und den Spalten Dealer_1 bis Dealer_10 (falls sie
+        nicht existiert) und schreibt die bereits gelesenen Zeilen per Upsert. Nur dieser kurze Schritt hält die
+        Schreibsperre; die Auswertung davor läuft als reine Leseabfrage parallel zu anderen Stufen.
+
+        Args:
+            table_name (str): Name der Übersicht.
+            key_column (str): Schlüsselspalte (z. B. 'hand_text').
+            key_type (str): SQL-Typ der Schlüsselspalte.
+            rows (list[tuple]): Schlüssel und Entscheidungen für Dealer_1 bis Dealer_10.
+        """
+        dealer_columns = [f"Dealer_{i}" for i in range(1, 11)]
+        with self._transaction() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table_name} (
+                    {key_column} {key_type} PRIMARY KEY,
+                    {", ".join(f"{column} TEXT" for column in dealer_columns)}
+                )
+            """)
+            conn.executemany(f"""
+                INSERT INTO {table_name} ({key_column}, {", ".join(dealer_columns)})
+                VALUES ({", ".join("?" * (len(dealer_columns) + 1))})
+                ON CONFLICT({key_column}) DO UPDATE SET {self._dealer_upsert_columns()}
+            """, rows)
 
+    @instrumented()
     def create_and_fill_double_overview(self):
         """
         Erstellt die Tabelle 'Double_overview' und füllt sie basierend auf den Daten in 'Full_player_hands'.
         Double gilt, wenn (win_hit - loss_hit) * 2 größer ist als ev. Andernfalls wird die ursprüngliche Aktion übernommen.
 
         Die Tabelle enthält jede einzelne Starthand als Zeile und die Dealer-Startkarte als Spalte.
+        Sie wird mit einer einzigen SELECT-Anweisung ausgewertet; nur das Einfügen hält die Schreibsperre.
         """
-        cursor = self.connection.cursor()
+        self.create_hand_lookup_index()
 
-        # Tabelle erstellen
-        dealer_columns = ", ".join([f"'Dealer_{i}' TEXT" for i in range(1, 11)])
-        cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS Double_overview (
-                hand_text VARCHAR PRIMARY KEY,
-                {dealer_columns}
+        # Alle Starthände in einem Schritt auswerten und nach Dealer-Startkarte auffächern
+        rows = self.connection.execute(f"""
+            SELECT
+                hand_text,
+                {self._dealer_pivot_columns()}
+            FROM (
+                SELECT
+                    hand_text,
+                    dealer_start,
+                    CASE
+                        WHEN ev IS NULL OR win_hit IS NULL OR loss_hit IS NULL THEN action
+                        WHEN (win_hit - loss_hit) * 2 > MAX(ev, 0) THEN 'Double'
+                        ELSE action
+                    END AS decision
+                FROM Full_player_hands
+                WHERE is_starthand = 1
             )
-        """)
-
-        # Alle Starthände und Dealer-Karten abrufen
-        cursor.execute("SELECT DISTINCT hand_text FROM Full_player_hands WHERE is_starthand = 1")
-        hands = [row[0] for row in cursor.fetchall()]
-
-        for hand_text in hands:
-            values = []
-            for dealer_card in range(1, 11):
-                # Dealer-Karte als String für die Abfrage
-                dealer_card_str = str(dealer_card)
-
-                # Erwartungswert und Wahrscheinlichkeiten abrufen
-                cursor.execute("""
-                    SELECT action, ev, win_hit, loss_hit 
-                    FROM Full_player_hands 
-                    WHERE hand_text = ? AND dealer_start = ?
-                """, (hand_text, dealer_card_str))
-                result = cursor.fetchone()
-
-                if result:
-                    action, ev, win_hit, loss_hit = result
-
-                    # Überprüfen auf None und Standardaktion verwenden, wenn nötig
-                    if ev is None or win_hit is None or loss_hit is None:
-                        values.append(f"'{action}'")
-                    else:
-                        # Double-Bedingung prüfen
-                        if (win_hit - loss_hit) * 2 > max(ev,0):
-                            values.append("'Double'")
-                        else:
-                            values.append(f"'{action}'")
-                else:
-                    values.append("NULL")
-
-            # Einfügen oder Aktualisieren
-            cursor.execute(f"""
-                INSERT INTO Double_overview (hand_text, {', '.join([f"'Dealer_{i}'" for i in range(1, 11)])})
-                VALUES (?, {', '.join(values)})
-                ON CONFLICT(hand_text) DO UPDATE SET
-                {', '.join([f"'Dealer_{i}'=excluded.'Dealer_{i}'" for i in range(1, 11)])}
-            """, (hand_text,))
-
-        self.connection.commit()
+            GROUP BY hand_text
+        """).fetchall()
+        self._fill_dealer_overview("Double_overview", "hand_text", "VARCHAR", rows)
         print("Tabelle 'Double_overview' erfolgreich erstellt und gefüllt.")
 
+    @instrumented()
     def create_and_fill_starthand_overview(self):
         """
         Erstellt die Tabelle 'starthand_overview' mit allen Starthänden.
-        Für jede Kombination aus Starthand und Dealer-Startkarte wird die beste Aktion ('Hit', 'Stand', 'Double', 'Split') gespeichert.
-        """
-        cursor = self.connection.cursor()
+        Für jede Kombination aus Starthand und Dealer-Startkarte wird die beste Aktion ('Hit', 'Stand', 'Double', 'Split')
+        gespeichert, bei erlaubtem Surrender auch 'Surrender', wenn alle anderen Aktionen weniger als der Surrender-EV
+        bringen (Rules.surrender_ev: -0.5, ohne Peek zusätzlich der halbe Einsatz bei einem Dealer-Blackjack).
+        Der Split-EV kommt aus der Tabelle 'Split_ev' (SplitEngine), ausgewertet wird mit einer einzigen Leseabfrage.
 
-        # Tabelle erstellen
-        dealer_columns = ", ".join([f"'Dealer_{i}' TEXT" for i in range(1, 11)])
-        cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS starthand_overview (
-                hand_text VARCHAR PRIMARY KEY,
-                {dealer_columns}
+        Raises:
+            ValueError: Wenn 'Split_ev' fehlt oder für ein anderes Deck bzw. andere Regeln berechnet wurde.
+        """
+        self.create_hand_lookup_index()
+        self._check_split_ev()
+
+        # Surrender-EV pro Dealer-Karte aus der Dealer-Verteilung, mit der die Hände berechnet wurden
+        dealer_hands = DealerHands(self.deck, rules=self.rules)
+        surrender_ev = "CASE p.dealer_start " + " ".join(
+            f"WHEN '{upcard}' THEN "
+            f"{self.rules.surrender_ev(dealer_hands.dealer_distribution(upcard, self.deck).get('Blackjack', 0.0))!r}"
+            for upcard in self.deck.get_available_cards()) + " ELSE -0.5 END"
+
+        # Surrender (falls erlaubt), Split: EV aus Split_ev, danach Double, sonst Aktion
+        rows = self.connection.execute(f"""
+            SELECT
+                hand_text,
+                {self._dealer_pivot_columns()}
+            FROM (
+                SELECT
+                    p.hand_text,
+                    p.dealer_start,
+                    CASE
+                        WHEN p.action IS NULL OR p.ev IS NULL OR p.win_hit IS NULL OR p.loss_hit IS NULL THEN NULL
+                        WHEN {int(self.rules.surrender)} = 1
+                            AND {surrender_ev} > MAX(p.ev, (p.win_hit - p.loss_hit) * 2, COALESCE(s.ev, -1))
+                            THEN 'Surrender'
+                        WHEN s.ev IS NOT NULL AND s.ev > MAX(p.ev, (p.win_hit - p.loss_hit) * 2) THEN 'Split'
+                        WHEN (p.win_hit - p.loss_hit) * 2 > MAX(p.ev, 0) THEN 'Double'
+                        ELSE p.action
+                    END AS decision
+                FROM Full_player_hands AS p
+                LEFT JOIN Split_ev AS s
+                    ON p.can_split = 1 AND s.hand_key = p.hand_key
+                WHERE p.is_starthand = 1
             )
-        """)
-
-        # Alle Starthände abrufen
-        cursor.execute("SELECT DISTINCT hand_text FROM Full_player_hands WHERE is_starthand = 1")
-        hands = [row[0] for row in cursor.fetchall()]
-
-        for hand_text in hands:
-            values = []
-            cards = hand_text.split(",")
-            is_pair = len(cards) == 2 and cards[0] == cards[1]
-            base_card = int(cards[0]) if is_pair else None
-
-            for dealer_card in range(1, 11):
-                dealer_str = str(dealer_card)
-
-                # Werte für aktuelle Hand abrufen
-                cursor.execute("""
-                    SELECT action, ev, win_hit, loss_hit
-                    FROM Full_player_hands
-                    WHERE hand_text = ? AND dealer_start = ?
-                """, (hand_text, dealer_str))
-                row = cursor.fetchone()
-
-                if not row or any(v is None for v in row):
-                    values.append("NULL")
-                    continue
-
-                action, ev, win_hit, loss_hit = row
-                best_action = action
-
-                # Split prüfen
-                if is_pair:
-                    cursor.execute("""
-                        SELECT ev FROM Full_player_hands
-                        WHERE hand_text = ? AND dealer_start = ?
-                    """, (str(base_card), dealer_str))
-                    ev_split_row = cursor.fetchone()
-                    if ev_split_row and ev_split_row[0] is not None:
-                        ev_split_total = ev_split_row[0] * 2
-                        if ev_split_total > max(ev, (win_hit - loss_hit) * 2):
-                            best_action = "Split"
-
-                # Double prüfen (nur wenn kein Split empfohlen wurde)
-                if best_action not in ("Split",):
-                    if (win_hit - loss_hit) * 2 > max(ev, 0):
-                        best_action = "Double"
-
-                values.append(f"'{best_action}'")
-
-            # Einfügen oder Aktualisieren
-            cursor.execute(f"""
-                INSERT INTO starthand_overview (hand_text, {', '.join([f"'Dealer_{i}'" for i in range(1, 11)])})
-                VALUES (?, {', '.join(values)})
-                ON CONFLICT(hand_text) DO UPDATE SET
-                {', '.join([f"'Dealer_{i}'=excluded.'Dealer_{i}'" for i in range(1, 11)])}
-            """, (hand_text,))
-
-        self.connection.commit()
+            GROUP BY hand_text
+        """).fetchall()
+        self._fill_dealer_overview("starthand_overview", "hand_text", "VARCHAR", rows)
         print("Tabelle 'starthand_overview' erfolgreich erstellt und gefüllt.")
 
+    @instrumented()
     def create_and_fill_pair_overview(self):
         """
         Erstellt und füllt die Tabelle 'Pair_overview' mit 10 Zeilen (1,1 bis 10,10) und 10 Spalten (Dealer_1 bis Dealer_10).
-        Eine Aktion ist 'Split', wenn ev_single_card * 2 > max(ev, (win_hit - loss_hit) * 2).
-        Ansonsten wird wie bei Double entschieden.
-        """
-        cursor = self.connection.cursor()
+        Eine Aktion ist 'Split', wenn der Split-EV aus 'Split_ev' > max(ev, (win_hit - loss_hit) * 2).
+        Ansonsten wird wie bei Double entschieden. Ausgewertet wird mit einer einzigen Leseabfrage.
 
-        # Tabelle erstellen
-        dealer_columns = ", ".join([f"Dealer_{i} TEXT" for i in range(1, 11)])
-        cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS Pair_overview (
-                pair_value INTEGER PRIMARY KEY,
-                {dealer_columns}
+        Raises:
+            ValueError: Wenn 'Split_ev' fehlt oder für ein anderes Deck bzw. andere Regeln berechnet wurde.
+        """
+        self.create_hand_lookup_index()
+        self._check_split_ev()
+
+        # Nur Paare 1,1 bis 10,10, verknüpft mit ihrem Split-EV
+        rows = self.connection.execute(f"""
+            SELECT
+                pair_value,
+                {self._dealer_pivot_columns()}
+            FROM (
+                SELECT
+                    CAST(substr(p.hand_text, 1, instr(p.hand_text, ',') - 1) AS INTEGER) AS pair_value,
+                    p.dealer_start,
+                    CASE
+                        WHEN p.ev IS NULL OR p.win_hit IS NULL OR p.loss_hit IS NULL OR s.ev IS NULL THEN p.action
+                        WHEN s.ev > MAX(p.ev, (p.win_hit - p.loss_hit) * 2) THEN 'Split'
+                        WHEN (p.win_hit - p.loss_hit) * 2 > MAX(p.ev, 0) THEN 'Double'
+                        ELSE p.action
+                    END AS decision
+                FROM Full_player_hands AS p
+                LEFT JOIN Split_ev AS s
+                    ON s.hand_key = p.hand_key
+                WHERE p.can_split = 1
             )
-        """)
-
-        # Nur Paare 1,1 bis 10,10
-        for pair_value in range(1, 11):
-            hand_text = f"{pair_value},{pair_value}"
-            row_values = []
-
-            for dealer_card in range(1, 11):
-                dealer_str = str(dealer_card)
-
-                # Hole Daten der Paare (2 gleiche Karten)
-                cursor.execute("""
-                    SELECT ev, win_hit, loss_hit, action 
-                    FROM Full_player_hands 
-                    WHERE hand_text = ? AND dealer_start = ?
-                """, (hand_text, dealer_str))
-                result = cursor.fetchone()
-
-                # Hole den EV der Einzelkarte für Vergleich
-                cursor.execute("""
-                    SELECT ev 
-                    FROM Full_player_hands 
-                    WHERE hand_text = ? AND dealer_start = ?
-                """, (str(pair_value), dealer_str))
-                ev_single_result = cursor.fetchone()
-
-                if result and ev_single_result:
-                    ev, win_hit, loss_hit, action = result
-                    ev_single = ev_single_result[0]
-
-                    if None in (ev, win_hit, loss_hit, ev_single):
-                        row_values.append(f"'{action}'")
-                    elif ev_single * 2 > max(ev, (win_hit - loss_hit) * 2):
-                        row_values.append("'Split'")
-                    elif (win_hit - loss_hit) * 2 > max(ev, 0):
-                        row_values.append("'Double'")
-                    else:
-                        row_values.append(f"'{action}'")
-                else:
-                    row_values.append("NULL")
-
-            # Daten einfügen oder aktualisieren
-            cursor.execute(f"""
-                INSERT INTO Pair_overview (pair_value, {', '.join([f"Dealer_{i}" for i in range(1, 11)])})
-                VALUES (?, {', '.join(row_values)})
-                ON CONFLICT(pair_value) DO UPDATE SET
-                {', '.join([f"Dealer_{i} = excluded.Dealer_{i}" for i in range(1, 11)])}
-            """, (pair_value,))
-
-        self.connection.commit()
+            GROUP BY pair_value
+        """).fetchall()
+        self._fill_dealer_overview("Pair_overview", "pair_value", "INTEGER", rows)
         print("Tabelle 'Pair_overview' erfolgreich erstellt und gefüllt.")
-
-
-
-
@@ -0,0 +1,165 @@
+from Models.Deck import Deck
+from Models.Rules import Rules
+from Utility.Calculations import CARD_KEY_UNITS
+
+
+class EVEngine:
+    def __init__(self, connection, table_name="Full_player_hands", deck=None, transaction=None, rules=None):
+        """
+        Berechnet die Erwartungswerte (EV) aller Spielerhände per Rückwärtsinduktion im Speicher
+        und schreibt sie anschließend gesammelt in die Datenbank zurück.
+
+        Args:
+            connection (sqlite3.Connection): Bestehende Verbindung; sie wird vom Engine nicht geschlossen.
+            table_name (str): Name der Spielerhände-Tabelle.
+            deck (Deck, optional): Deck, aus dem die Ziehwahrscheinlichkeiten berechnet werden.
+                                   Wenn nicht angegeben, wird ein Standarddeck verwendet.
+            transaction (callable, optional): Liefert den Kontext für den Schreibvorgang
+                                              (z. B. DatabaseManager._transaction). Standard ist die Verbindung.
+            rules (Rules, optional): Spielregeln (Blackjack-Auszahlung). Standard sind die Standardregeln.
+        """
+        self.connection = connection
+        self.transaction = transaction if transaction is not None else (lambda: connection)
+        self.table_name = table_name
+        self.deck = deck if deck is not None else Deck()
+        self.rules = rules if rules is not None else Rules()
+        self.blackjack_payout = self.rules.blackjack_payout
+        self.missing_children = 0
+
+    def run(self):
+        """
+        Lädt die Hände, berechnet die EVs und schreibt sie zurück.
+
+        Returns:
+            int: Anzahl der aktualisierten Hände.
+        """
+        hands = self.load()
+        results = self.compute(hands)
+        self.write(results)
+        return len(results)
+
+    def load(self):
+        """
+        Lädt die für die EV-Berechnung nötigen Spalten, gruppiert nach Dealer-Startkarte.
+
+        Returns:
+            dict: dealer_start -> Liste von Tupeln
+                  (hand_id, Kartenzählung, hand_key, minimum_value, is_blackjack, win_stand, loss_stand).
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(f"""
+            SELECT hand_id, c1, c2, c3, c4, c5, c6, c7, c8, c9, c10, hand_key,
+                   minimum_value, dealer_start, is_blackjack, win_stand, loss_stand
+            FROM {self.table_name}
+        """)
+        hands = {}
+        for hand_id, *rest in cursor.fetchall():
+            counts = tuple(rest[:10])
+            hand_key, minimum_value, dealer_start, is_blackjack, win_stand, loss_stand = rest[10:]
+            hands.setdefault(dealer_start, []).append(
+                (hand_id, counts, hand_key, minimum_value, bool(is_blackjack), win_stand or 0.0, loss_stand or 0.0)
+            )
+        return hands
+
+    def compute(self, hands):
+        """
+        Rückwärtsinduktion über den Handgraphen: Hände mit mehr Karten werden zuerst berechnet,
+        sodass der EV jeder Folgehand bereits feststeht. EV = max(EV Stand, EV Hit).
+
+        Args:
+            hands (dict): Ergebnis von load().
+
+        Returns:
+            list[tuple]: (hand_id, ev, action) für jede Hand.
+        """
+        results = []
+        for dealer_start, dealer_hands in hands.items():
+            if dealer_start == "Blackjack":
+                # Dealer hat Blackjack: Unentschieden bei eigenem Blackjack, sonst verloren
+                for hand_id, _, _, _, is_blackjack, _, _ in dealer_hands:
+                    results.append((hand_id, 0.0 if is_blackjack else -1.0, "Stand"))
+                continue
+            results.extend(self._compute_for_dealer_card(int(dealer_start), dealer_hands))
+        return results
+
+    def _compute_for_dealer_card(self, dealer_card, dealer_hands):
+        """
+        Berechnet die EVs aller Hände für eine Dealer-Startkarte.
+
+        Args:
+            dealer_card (int): Die Dealer-Startkarte.
+            dealer_hands (list[tuple]): Die Hände dieser Startkarte aus load().
+
+        Returns:
+            list[tuple]: (hand_id, ev, action) für jede Hand.
+        """
+        # Restdeck ohne Dealer-Karte; die Karten der Hand werden pro Hand abgezogen
+        base_counts = self.deck.get_card_counts()
+        base_counts[dealer_card - 1] -= 1
+        base_total = sum(base_counts)
+
+        # EVs nach Handschlüssel; der Schlüssel einer Folgehand ist hand_key + CARD_KEY_UNITS[Karte - 1]
+        ev_by_key = {}
+        results = []
+        for hand_id, counts, hand_key, minimum_value, is_blackjack, win_stand, loss_stand in sorted(
+                dealer_hands, key=lambda hand: sum(hand[1]), reverse=True):
+            stand_ev = win_stand - loss_stand
+            if is_blackjack:
+                # Mit Peek ist ein Dealer-Blackjack ausgeschlossen, ohne Peek ist er ein Unentschieden
+                # (ausgezahlt wird dann nur mit der Gewinnwahrscheinlichkeit win_stand)
+                ev = self.blackjack_payout if self.rules.peek else self.blackjack_payout * win_stand
+                ev_by_key[hand_key] = ev
+                results.append((hand_id, ev, "Stand"))
+                continue
+
+            total_cards = base_total - sum(counts)
+            hit_ev = 0.0
+            if total_cards > 0:
+                for card in range(1, 11):
+                    available = base_counts[card - 1] - counts[card - 1]
+                    if available <= 0:
+                        continue
+                    probability = available / total_cards
+                    if minimum_value + card > 21:
+                        hit_ev -= probability  # Bust
+                        continue
+                    child_ev = ev_by_key.get(hand_key + CARD_KEY_UNITS[card - 1])
+                    if child_ev is None:
+                        self.missing_children += 1
+                        child_ev = -1.0  # Pessimistische Annahme, wenn die Folgehand fehlt
+                    hit_ev += probability * child_ev
+            else:
+                hit_ev = stand_ev
+
+            if hit_ev > stand_ev:
+                ev, action = hit_ev, "Hit"
+            else:
+                ev, action = stand_ev, "Stand"
+            ev_by_key[hand_key] = ev
+            results.append((hand_id, ev, action))
+        return results
+
+    def write(self, results):
+        """
+        Schreibt die Ergebnisse über eine temporäre Staging-Tabelle mit einem einzigen UPDATE zurück.
+
+        Args:
+            results (list[tuple]): (hand_id, ev, action) für jede Hand.
+        """
+        with self.transaction() as conn:
+            conn.execute("DROP TABLE IF EXISTS temp.ev_staging")
+            conn.execute("""
+                CREATE TEMP TABLE ev_staging (
+                    hand_id INTEGER PRIMARY KEY,
+                    ev FLOAT,
+                    action VARCHAR
+                )
+            """)
+            conn.executemany("INSERT INTO temp.ev_staging (hand_id, ev, action) VALUES (?, ?, ?)", results)
+            conn.execute(f"""
+                UPDATE {self.table_name}
+                SET ev = s.ev, action = s.action
+                FROM temp.ev_staging AS s
+                WHERE {self.table_name}.hand_id = s.hand_id
+            """)
+            conn.execute("DROP TABLE temp.ev_staging")
@@ -0,0 +1,168 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Models.Deck import Deck
+from Models.Rules import Rules
+from Utility.Composition_sweep import CompositionSweep
+import Utility.Calculations as calc
+
+
+def _upcard_cells(deck, rules, upcard):
+    """
+    Worker-Funktion: berechnet die Zellen aller Starthände gegen eine Dealer-Karte.
+
+    Returns:
+        dict: (hand_text, Dealer-Karte) -> (action, ev) wie in CompositionSweep.evaluate.
+    """
+    cells = CompositionSweep(deck, max_removed=0, rules=rules).evaluate((0,) * 10, upcards=[upcard])
+    return {cell: values[:2] for cell, values in cells.items()}
+
+
+class HouseEdgeCalculator:
+    def __init__(self, deck=None, rules=None):
+        """
+        Exakter Hausvorteil einer Runde: jede Kombination aus Starthand und Dealer-Karte wird mit ihrer
+        Wahrscheinlichkeit gewichtet und mit der besten Aktion (inklusive Split und Double) bewertet.
+
+        Die Zellen-EVs setzen wie die Tabellen einen Dealer ohne Blackjack voraus (Peek). Mit Peek wird der
+        Dealer-Blackjack pro Zelle aus dem Restdeck (ohne Starthand und Dealer-Karte) hinzugerechnet;
+        ohne Peek (ENHC) ist er bereits in den Zellen enthalten. Spieler-Blackjacks werden in beiden Fällen mit der
+        Blackjack-Wahrscheinlichkeit des Dealers aus dem Restdeck der Starthand bewertet.
+
+        Args:
+            deck (Deck, optional): Deck-Zusammensetzung. Wenn nicht angegeben, wird ein Standarddeck verwendet.
+            rules (Rules, optional): Spielregeln. Standard sind die Standardregeln.
+        """
+        self.deck = deck if deck is not None else Deck()
+        self.rules = rules if rules is not None else Rules()
+        self.seconds = 0.0
+
+    def starting_hands(self):
+        """
+        Alle Starthände mit Dealer-Karte und ihrer exakten Wahrscheinlichkeit.
+        Die Anzahl der Kombinationen einer Starthand kommt aus calc.hand_frequency, die Dealer-Karte
+        wird aus dem Restdeck gezogen.
+
+        Yields:
+            tuple: (Karten der Starthand, Dealer-Karte, Wahrscheinlichkeit).
+        """
+        counts = self.deck.get_card_counts()
+        total_cards = sum(counts)
+        combinations = math.comb(total_cards, 2) * (total_cards - 2)
+        for first in range(1, 11):
+            for second in range(first, 11):
+                frequency = calc.hand_frequency([first, second], self.deck)
+                if frequency == 0:
+                    continue
+                for upcard in range(1, 11):
+                    available = counts[upcard - 1] - (first == upcard) - (second == upcard)
+                    if available > 0:
+                        yield (first, second), upcard, frequency * available / combinations
+
+    def dealer_blackjack_probability(self, cards, upcard):
+        """
+        Wahrscheinlichkeit, dass die verdeckte Karte den Dealer-Blackjack ergibt.
+
+        Args:
+            cards (tuple[int]): Karten der Starthand.
+            upcard (int): Dealer-Karte.
+
+        Returns:
+            float: Wahrscheinlichkeit für einen Dealer-Blackjack.
+        """
+        if upcard not in (1, 10):
+            return 0.0
+        remaining = self.deck.get_card_counts()
+        for card in (*cards, upcard):
+            remaining[card - 1] -= 1
+        return remaining[11 - upcard - 1] / sum(remaining)
+
+    def cell_evs(self, jobs=1):
+        """
+        Beste Aktion und EV jeder Starthand gegen jede Dealer-Karte.
+
+        Args:
+            jobs (int): Anzahl der Prozesse; die Dealer-Karten werden auf die Prozesse verteilt.
+
+        Returns:
+            dict: (hand_text, Dealer-Karte) -> (action, ev).
+        """
+        return self.cell_evs_for_rules([self.rules], self.deck, jobs)[self.rules]
+
+    @staticmethod
+    def cell_evs_for_rules(rules_list, deck=None, jobs=1):
+        """
+        cell_evs für mehrere Regelvarianten; alle (Regeln, Dealer-Karte)-Paare laufen über einen Prozesspool.
+
+        Args:
+            rules_list (list[Rules]): Die Regelvarianten.
+            deck (Deck, optional): Deck-Zusammensetzung.
+            jobs (int): Anzahl der Prozesse; 1 rechnet im aktuellen Prozess.
+
+        Returns:
+            dict: Rules -> Zellen wie bei cell_evs.
+        """
+        deck = deck if deck is not None else Deck()
+        tasks = [(rules, upcard) for rules in rules_list for upcard in deck.get_available_cards()]
+        arguments = ([deck] * len(tasks), [rules for rules, _ in tasks], [upcard for _, upcard in tasks])
+        if jobs <= 1:
+            results = list(map(_upcard_cells, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+                results = list(executor.map(_upcard_cells, *arguments))
+
+        cells = {rules: {} for rules in rules_list}
+        for (rules, _), upcard_cells in zip(tasks, results):
+            cells[rules].update(upcard_cells)
+        return cells
+
+    def run(self, jobs=1, cells=None):
+        """
+        Berechnet den erwarteten Ertrag einer Runde.
+
+        Args:
+            jobs (int): Anzahl der Prozesse für cell_evs.
+            cells (dict, optional): Bereits berechnete Zellen aus cell_evs.
+
+        Returns:
+            dict: expected_return (pro Einsatz), house_edge, Wahrscheinlichkeitsanteile der Aktionen und Dauer.
+        """
+        start = time.perf_counter()
+        if cells is None:
+            cells = self.cell_evs(jobs)
+
+        expected_return = 0.0
+        total_probability = 0.0
+        action_shares = {}
+        for cards, upcard, probability in self.starting_hands():
+            action, ev = cells[(",".join(map(str, cards)), upcard)]
+            dealer_blackjack = self.dealer_blackjack_probability(cards, upcard)
+            if sum(cards) == 11 and 1 in cards:
+                # Spieler-Blackjack: Unentschieden gegen einen Dealer-Blackjack
+                ev = (1 - dealer_blackjack) * self.rules.blackjack_payout
+            elif self.rules.peek:
+                ev = (1 - dealer_blackjack) * ev - dealer_blackjack
+            expected_return += probability * ev
+            total_probability += probability
+            action_shares[action] = action_shares.get(action, 0.0) + probability
+
+        self.seconds = time.perf_counter() - start
+        return {"expected_return": expected_return, "house_edge": -expected_return,
+                "total_probability": total_probability, "action_shares": action_shares, "seconds": self.seconds}
+
+    @classmethod
+    def compare_rules(cls, rules_list, deck=None, jobs=1):
+        """
+        Hausvorteil für mehrere Regelvarianten in einem Lauf.
+
+        Args:
+            rules_list (list[Rules]): Die Regelvarianten, z. B. aus Rules.matrix.
+            deck (Deck, optional): Deck-Zusammensetzung.
+            jobs (int): Anzahl der Prozesse.
+
+        Returns:
+            dict: Rules -> Ergebnis von run.
+        """
+        cells = cls.cell_evs_for_rules(rules_list, deck, jobs)
+        return {rules: cls(deck, rules).run(cells=cells[rules]) for rules in rules_list}
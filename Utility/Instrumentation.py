@@ -0,0 +1,173 @@
+import cProfile
+import functools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Umgebungsvariable mit dem Ausgabeverzeichnis; ist sie gesetzt, instrumentiert die Pipeline jeden Lauf
+PROFILE_ENV = "BLACKJACK_PROFILE"
+
+# Aktive Instrumentierung des Prozesses (None = ausgeschaltet, die Dekoratoren rufen dann direkt auf)
+_active = None
+
+
+class Instrumentation:
+    def __init__(self, output_dir, profile=True, memory=True):
+        """
+        Opt-in-Messungen für Pipeline-Stufen und Engines: Wand- und CPU-Zeit, Anzahl der Aufrufe,
+        Spitzenspeicher über tracemalloc und cProfile-Dumps.
+
+        Ein cProfile-Dump entsteht nur für den äußersten Abschnitt eines Threads (in der Pipeline die Stufe),
+        da sich Profiler nicht verschachteln lassen. tracemalloc misst prozessweit; laufen Stufen gleichzeitig,
+        enthält der Spitzenwert eines Abschnitts auch die Allokationen der parallelen Stufen.
+        Arbeit in Worker-Prozessen (z. B. Hands mit jobs > 1) wird nicht erfasst.
+
+        Args:
+            output_dir (str): Verzeichnis für report.json und die .prof-Dateien.
+            profile (bool): cProfile-Dumps schreiben.
+            memory (bool): Spitzenspeicher mit tracemalloc messen.
+        """
+        self.output_dir = output_dir
+        self.profile = profile
+        self.memory = memory
+        self.sections = {}
+        self.started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def section(self, name):
+        """
+        Misst einen Abschnitt. Wiederholte Abschnitte mit gleichem Namen werden aufsummiert.
+
+        Args:
+            name (str): Name des Abschnitts, z. B. 'stage:evs' oder 'DatabaseManager.get_ev_for_hands'.
+        """
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        profiler = None
+        if self.profile and depth == 0:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Ein anderer Profiler ist bereits aktiv (ab Python 3.12 nur einer pro Prozess)
+                profiler = None
+        if self.memory and depth == 0:
+            with self._lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            # Spitzenspeicher nur für den äußersten Abschnitt, innere würden den Wert der Stufe erben
+            peak = tracemalloc.get_traced_memory()[1] if depth == 0 and tracemalloc.is_tracing() else None
+            if profiler is not None:
+                profiler.disable()
+            self._local.depth = depth
+            self._record(name, wall, cpu, peak, profiler)
+
+    def _record(self, name, wall, cpu, peak, profiler):
+        """Summiert eine Messung und schreibt den cProfile-Dump."""
+        with self._lock:
+            entry = self.sections.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                                    "peak_memory_bytes": None, "profile": None})
+            entry["calls"] += 1
+            entry["wall_seconds"] += wall
+            entry["cpu_seconds"] += cpu
+            if peak is not None:
+                entry["peak_memory_bytes"] = max(peak, entry["peak_memory_bytes"] or 0)
+            if profiler is not None:
+                os.makedirs(self.output_dir, exist_ok=True)
+                path = os.path.join(self.output_dir, re.sub(r"[^\w.-]", "_", name) + ".prof")
+                profiler.dump_stats(path)
+                entry["profile"] = path
+
+    def report(self):
+        """
+        Die bisherigen Messungen.
+
+        Returns:
+            dict: started_at und sections (Name -> calls, wall_seconds, cpu_seconds, peak_memory_bytes, profile).
+        """
+        with self._lock:
+            return {"started_at": self.started_at, "sections": {name: dict(entry) for name, entry in self.sections.items()}}
+
+    def write_report(self, extra=None):
+        """
+        Schreibt den Bericht als report.json in das Ausgabeverzeichnis.
+
+        Args:
+            extra (dict, optional): Zusätzliche Einträge, z. B. die Stufenzeiten der Pipeline.
+
+        Returns:
+            str: Pfad des Berichts.
+        """
+        report = self.report()
+        report.update(extra or {})
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, "report.json")
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        return path
+
+
+def enable(output_dir=None, profile=True, memory=True):
+    """
+    Schaltet die Instrumentierung für den Prozess ein.
+
+    Args:
+        output_dir (str, optional): Ausgabeverzeichnis. Standard ist der Wert von BLACKJACK_PROFILE
+                                    oder 'Data/profile/<Zeitstempel>'.
+
+    Returns:
+        Instrumentation: Die aktive Instrumentierung.
+    """
+    global _active
+    if output_dir is None:
+        output_dir = os.environ.get(PROFILE_ENV) or os.path.join("Data", "profile", time.strftime("%Y%m%d-%H%M%S"))
+    _active = Instrumentation(output_dir, profile=profile, memory=memory)
+    return _active
+
+
+def disable():
+    """Schaltet die Instrumentierung aus und beendet tracemalloc."""
+    global _active
+    _active = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def active():
+    """Die aktive Instrumentierung oder None."""
+    return _active
+
+
+def instrumented(name=None):
+    """
+    Dekorator für Engine-Methoden: misst jeden Aufruf als Abschnitt, wenn die Instrumentierung aktiv ist.
+    Ausgeschaltet kostet er nur eine Abfrage pro Aufruf.
+
+    Args:
+        name (str, optional): Name des Abschnitts. Standard ist der qualifizierte Funktionsname.
+    """
+    def decorator(function):
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return function(*args, **kwargs)
+            with _active.section(label):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
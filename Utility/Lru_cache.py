@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024):
+        """
+        Einfacher LRU-Cache mit Treffer- und Fehlschlagzählern.
+
+        Args:
+            maxsize (int): Maximale Anzahl gespeicherter Einträge. Der am längsten ungenutzte wird verdrängt.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """
+        Gibt den gespeicherten Wert für den Schlüssel zurück und zählt Treffer bzw. Fehlschläge.
+
+        Args:
+            key: Hashbarer Cache-Schlüssel.
+
+        Returns:
+            Der gespeicherte Wert oder None, falls nicht vorhanden.
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Speichert einen Wert und verdrängt bei Bedarf den ältesten Eintrag."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Leert den Cache und setzt die Zähler zurück."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Gibt den aktuellen Zustand des Caches zurück.
+
+        Returns:
+            dict: Treffer, Fehlschläge, aktuelle Größe und maximale Größe.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def __len__(self):
+        return len(self._entries)
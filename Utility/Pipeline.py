@@ -0,0 +1,368 @@
+import argparse
+import os
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from Models.Deck import Deck
+from Models.Hands import Hands
+from Models.Dealer_hands import DealerHands
+from Models.Rules import Rules
+from Utility.DB import DatabaseManager
+from Utility.Stage_cache import StageCache
+import Utility.Instrumentation as instrumentation
+from Utility.Progress import ProgressReporter, NORMAL
+
+# Wartezeit in Millisekunden, wenn eine parallele Stufe gerade in die Datenbank schreibt
+BUSY_TIMEOUT_MS = 600000
+
+
+class Stage:
+    def __init__(self, name, build, depends_on=(), tables=(), inputs=("deck", "rules"), default=True):
+        """
+        Eine Stufe der Pipeline.
+
+        Args:
+            name (str): Eindeutiger Name der Stufe (auch Schlüssel im StageCache).
+            build (callable): Wird mit (db_manager, pipeline) aufgerufen und erzeugt die Ausgabetabellen.
+            depends_on (tuple[str]): Stufen, die vorher abgeschlossen sein müssen.
+            tables (tuple[str]): Ausgabetabellen (für Archivieren und Wiederherstellen im StageCache).
+            inputs (tuple[str]): Attribute der Pipeline, die in den Fingerabdruck eingehen. Statt 'rules' nur die
+                                 Regeln, von denen die Stufe abhängt: 'dealer_rules' (Rules.dealer_key) oder
+                                 'hand_rules' (Rules.hand_key).
+            default (bool): Ob die Stufe ohne ausdrückliche Auswahl läuft.
+        """
+        self.name = name
+        self.build = build
+        self.depends_on = tuple(depends_on)
+        self.tables = list(tables)
+        self.inputs = tuple(inputs)
+        self.default = default
+
+
+def _build_hands(db_manager, pipeline):
+    table_name = "Hands"
+    with db_manager.bulk_load() as stats:
+        db_manager.drop_table(table_name)
+        db_manager.create_table_hands(table_name)
+        print("Generiere und speichere alle möglichen Hände...")
+        Hands(pipeline.deck, db_manager, progress=pipeline.progress).generate_and_save_hands(pipeline.missing_cards)
+    print(f"Durchsatz: {stats.rows_per_second:.0f} Zeilen/s ({stats.rows} Zeilen in {stats.seconds:.4f} Sekunden)")
+    db_manager.print_hand_count(table_name)
+
+
+def _build_dealer_hands(db_manager, pipeline):
+    table_name = "Dealer_Hands"
+    db_manager.drop_table(table_name)
+    db_manager.create_table_hands(table_name)
+    DealerHands(pipeline.deck, db_manager, rules=pipeline.rules, progress=pipeline.progress).generate_dealer_hands(
+        table_name, missing_cards=pipeline.missing_cards)
+    db_manager.print_hand_count(table_name)
+
+
+def _build_dealer_statistics(db_manager, pipeline):
+    db_manager.drop_table("dealer_hand_stats")
+    db_manager.create_stats_table()
+    db_manager.update_dealer_hand_statistics()
+
+
+def _build_full_player_hands(db_manager, pipeline):
+    table_name = "Full_player_hands"
+    with db_manager.bulk_load() as stats:
+        db_manager.drop_table(table_name)
+        db_manager.create_table_full_player_hands(table_name)
+        start_time = time.perf_counter()  # Timer starten
+        Hands(pipeline.deck, db_manager, progress=pipeline.progress).generate_and_save_full_player_hands(
+            deck=pipeline.deck, jobs=pipeline.hand_jobs)
+        end_time = time.perf_counter()  # Timer stoppen
+        db_manager.create_hand_lookup_index(defer=True)
+    print(f"Generierung der Spielerhände dauerte: {end_time - start_time:.4f} Sekunden")
+    print(f"Durchsatz: {stats.rows_per_second:.0f} Zeilen/s ({stats.rows} Zeilen in {stats.seconds:.4f} Sekunden)")
+
+
+def _build_composition_sweep(db_manager, pipeline):
+    from Utility.Composition_sweep import CompositionSweep  # NumPy nur für diese Stufe nötig
+
+    sweep = CompositionSweep(pipeline.deck, max_removed=2, rules=pipeline.rules)
+    results = sweep.run()  # Reine Rechnung ohne Datenbankzugriff, läuft neben schreibenden Stufen
+    print(f"{len(results)} Zusammensetzungen in {sweep.seconds:.4f} Sekunden berechnet")
+    with db_manager.bulk_load():
+        sweep.save(db_manager, results)
+
+
+def _drop_and(build, *tables):
+    """Stufe, deren Tabellen vor dem Füllen gelöscht werden (die Builder füllen per Upsert)."""
+    def run(db_manager, pipeline):
+        for table in tables:
+            db_manager.drop_table(table)
+        build(db_manager)
+    return run
+
+
+# Standard-Stufengraph: Hände -> Spielerhände -> EVs -> Übersichten; Split_ev hängt nur von Deck und Regeln ab
+STAGES = [
+    Stage("hands", _build_hands, tables=["Hands"], inputs=("deck", "missing_cards")),
+    Stage("dealer_hands", _build_dealer_hands, tables=["Dealer_Hands"],
+          inputs=("deck", "dealer_rules", "missing_cards"), default=False),
+    Stage("dealer_statistics", _build_dealer_statistics, depends_on=["dealer_hands"], tables=["dealer_hand_stats"],
+          inputs=(), default=False),
+    Stage("full_player_hands", _build_full_player_hands, tables=["Full_player_hands"], inputs=("deck", "dealer_rules")),
+    Stage("evs", lambda db_manager, pipeline: db_manager.get_ev_for_hands("Full_player_hands"),
+          depends_on=["full_player_hands"], inputs=("deck", "hand_rules")),
+    Stage("startcard_overview",
+          lambda db_manager, pipeline: db_manager.create_player_dealer_startcard_overview("Full_player_hands"),
+          depends_on=["evs"], tables=["Player_dealer_startcard_overview"], inputs=()),
+    Stage("strategy_table",
+          lambda db_manager, pipeline: db_manager.create_and_fill_player_dealer_strategy_table(),
+          depends_on=["startcard_overview"], tables=["Player_dealer_strategy_table"], inputs=()),
+    Stage("strategy_table_soft",
+          lambda db_manager, pipeline: db_manager.create_and_fill_player_dealer_strategy_table_soft(),
+          depends_on=["startcard_overview"], tables=["Player_dealer_strategy_table_soft"], inputs=()),
+    Stage("double_overview", _drop_and(DatabaseManager.create_and_fill_double_overview, "Double_overview"),
+          depends_on=["evs"], tables=["Double_overview"], inputs=()),
+    Stage("split_ev", lambda db_manager, pipeline: db_manager.create_and_fill_split_ev(),
+          tables=["Split_ev"]),
+    Stage("starthand_overview", _drop_and(DatabaseManager.create_and_fill_starthand_overview, "starthand_overview"),
+          depends_on=["evs", "split_ev"], tables=["starthand_overview"], inputs=("rules",)),
+    Stage("pair_overview", _drop_and(DatabaseManager.create_and_fill_pair_overview, "Pair_overview"),
+          depends_on=["evs", "split_ev"], tables=["Pair_overview"], inputs=()),
+    Stage("composition_sweep", _build_composition_sweep,
+          tables=["Composition_strategy", "Composition_effect_of_removal"], default=False),
+]
+
+# Stufen, die Main.Strategy_Overview erzeugt
+OVERVIEW_STAGES = ["strategy_table", "strategy_table_soft", "double_overview", "starthand_overview", "pair_overview"]
+
+
+class Pipeline:
+    def __init__(self, db_path="Data/blackjack.db", stages=None, deck=None, rules=None, missing_cards=None, jobs=1,
+                 progress=None, hand_jobs=1):
+        """
+        Führt den Stufengraph aus: unabhängige Stufen laufen gleichzeitig in Threads, jede mit eigener
+        Datenbankverbindung. SQLite erlaubt nur einen Schreiber: Alle Verbindungen teilen sich eine Schreibsperre,
+        die nur Schreibtransaktionen (und bulk_load()) halten. Die Datenbank läuft im WAL-Modus, sodass Leseabfragen
+        und Rechenarbeit der Stufen gleichzeitig laufen, auch während eine andere Stufe schreibt. Jede Stufe läuft über den StageCache und wird übersprungen, wenn ihre Eingaben
+        unverändert sind; ihre Dauer und ihr Ergebnis werden in timings festgehalten.
+
+        Args:
+            db_path (str): Pfad zur Datenbank.
+            stages (list[Stage], optional): Der Stufengraph. Standard ist STAGES.
+            deck (Deck, optional): Deck-Zusammensetzung. Wenn nicht angegeben, wird ein Standarddeck verwendet.
+            rules (Rules, optional): Spielregeln. Standard sind die Standardregeln.
+            missing_cards (list[int], optional): Fehlende Karten für die Stufen 'hands' und 'dealer_hands'.
+            jobs (int): Anzahl gleichzeitig laufender Stufen.
+            progress (ProgressReporter, optional): Fortschrittsanzeige der Enumerationsstufen.
+            hand_jobs (int): Anzahl der Prozesse für die Generierung der Spielerhände (unabhängig von jobs).
+        """
+        self.db_path = db_path
+        self.stages = {stage.name: stage for stage in (stages if stages is not None else STAGES)}
+        self.deck = deck if deck is not None else Deck()
+        self.rules = rules if rules is not None else Rules()
+        self.missing_cards = missing_cards
+        self.jobs = jobs
+        self.hand_jobs = hand_jobs
+        self.progress = progress if progress is not None else ProgressReporter()
+        self.timings = {}
+        self.write_lock = threading.RLock()
+
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stufe '{stage.name}' hängt von unbekannter Stufe '{dependency}' ab.")
+
+    def select(self, targets=None):
+        """
+        Bestimmt die auszuführenden Stufen: die Ziele und alle ihre Abhängigkeiten, in topologischer Reihenfolge.
+
+        Args:
+            targets (list[str], optional): Gewünschte Stufen. Standard sind alle Stufen mit default=True.
+
+        Returns:
+            list[str]: Die Stufen in einer gültigen Ausführungsreihenfolge.
+
+        Raises:
+            ValueError: Bei unbekannten Stufen oder einem Zyklus.
+        """
+        if targets is None:
+            targets = [name for name, stage in self.stages.items() if stage.default]
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name not in self.stages:
+                raise ValueError(f"Unbekannte Stufe: {name}")
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Zyklus im Stufengraph bei '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    @property
+    def dealer_rules(self):
+        """Die Regeln, von denen Dealer-Verteilung und Spielerhände abhängen (H17, Peek)."""
+        return self.rules.dealer_key()
+
+    @property
+    def hand_rules(self):
+        """Die Regeln, von denen die EVs der Hände abhängen (Dealer-Regeln und Blackjack-Auszahlung)."""
+        return self.rules.hand_key()
+
+    def stage_inputs(self, name):
+        """
+        Eingaben einer Stufe für den Fingerabdruck im StageCache.
+
+        Args:
+            name (str): Name der Stufe.
+
+        Returns:
+            dict: Attributname -> Wert für alle Attribute aus Stage.inputs.
+        """
+        return {key: getattr(self, key) for key in self.stages[name].inputs}
+
+    def dependents(self, names):
+        """
+        Alle Stufen, die direkt oder indirekt von den angegebenen Stufen abhängen (inklusive dieser selbst).
+
+        Args:
+            names (iterable[str]): Stufen.
+
+        Returns:
+            set[str]: Die betroffenen Stufen.
+        """
+        affected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in affected and affected.intersection(stage.depends_on):
+                    affected.add(stage.name)
+                    changed = True
+        return affected
+
+    def connect(self):
+        """
+        Öffnet eine eigene Verbindung für eine Stufe mit der gemeinsamen Schreibsperre und schaltet die Datenbank
+        in den WAL-Modus, damit Leser nicht auf Schreiber warten. Der DatabaseManager erhält Deck und Regeln der
+        Pipeline, damit EVs und Split-EVs zu den Händen passen.
+        """
+        db_manager = DatabaseManager(self.db_path, rules=self.rules, deck=self.deck, write_lock=self.write_lock)
+        db_manager.connection.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        with self.write_lock:  # Der Journal-Modus lässt sich nur ohne offene Schreibtransaktion umschalten
+            db_manager.connection.execute("PRAGMA journal_mode = WAL")
+        return db_manager
+
+    def run_stage(self, name, force=False):
+        """
+        Führt eine Stufe über den StageCache aus.
+
+        Args:
+            name (str): Name der Stufe.
+            force (bool): Auch bei unverändertem Fingerabdruck neu berechnen.
+
+        Returns:
+            dict: status ('built', 'restored' oder 'skipped') und seconds.
+        """
+        stage = self.stages[name]
+        active = instrumentation.active()
+        start = time.perf_counter()
+        db_manager = self.connect()
+        try:
+            inputs = self.stage_inputs(name)
+            with active.section(f"stage:{name}") if active is not None else nullcontext():
+                status = StageCache(db_manager).run(name, stage.tables, lambda: stage.build(db_manager, self),
+                                                    inputs=inputs, depends_on=stage.depends_on, force=force)
+        finally:
+            db_manager.close()
+        return {"status": status, "seconds": time.perf_counter() - start}
+
+    def run(self, targets=None, rerun=()):
+        """
+        Führt die ausgewählten Stufen aus. Eine Stufe startet, sobald alle ihre Abhängigkeiten fertig sind.
+        Ist die Instrumentierung aktiv (siehe Utility.Instrumentation), wird jede Stufe gemessen und am Ende
+        ein Bericht geschrieben.
+
+        Args:
+            targets (list[str], optional): Gewünschte Stufen (Abhängigkeiten werden ergänzt).
+            rerun (iterable[str]): Stufen, die samt ihren abhängigen Stufen neu berechnet werden. Ohne targets
+                laufen nur diese Stufen (ihre übrigen Abhängigkeiten werden bei Bedarf übersprungen).
+
+        Returns:
+            dict: Stufe -> {'status', 'seconds'} in der Reihenfolge der Fertigstellung.
+        """
+        forced = self.dependents(rerun)
+        order = self.select(list(targets or []) + sorted(forced) if targets or forced else None)
+        pending = list(order)
+        running = {}
+        self.timings = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as executor:
+            while pending or running:
+                for name in list(pending):
+                    if len(running) >= max(1, self.jobs):
+                        break
+                    if all(dependency in self.timings for dependency in self.stages[name].depends_on):
+                        pending.remove(name)
+                        running[executor.submit(self.run_stage, name, name in forced)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.timings[name] = future.result()
+                    print(f"Stufe '{name}': {self.timings[name]['status']} in {self.timings[name]['seconds']:.4f} Sekunden")
+
+        active = instrumentation.active()
+        if active is not None:
+            path = active.write_report({"db_path": self.db_path, "jobs": self.jobs, "stages": self.timings})
+            print(f"Messbericht in '{path}' gespeichert.")
+        return self.timings
+
+
+def main(argv=None):
+    """Kommandozeile: führt die Pipeline (oder ausgewählte Stufen) aus."""
+    parser = argparse.ArgumentParser(description="Blackjack-Pipeline als Stufengraph")
+    parser.add_argument("stages", nargs="*", help="Auszuführende Stufen (Standard: alle Standardstufen)")
+    parser.add_argument("--db", default="Data/blackjack.db", help="Pfad zur Datenbank")
+    parser.add_argument("--jobs", type=int, default=1, help="Anzahl gleichzeitig laufender Stufen")
+    parser.add_argument("--hand-jobs", type=int, default=1,
+                        help="Anzahl der Prozesse für die Generierung der Spielerhände")
+    parser.add_argument("--rerun", nargs="+", default=[], metavar="STAGE",
+                        help="Diese Stufen und alle abhängigen neu berechnen")
+    parser.add_argument("--missing-cards", nargs="+", type=int, metavar="CARD")
+    parser.add_argument("--hit-soft-17", action="store_true", help="Dealer zieht auf Soft 17")
+    parser.add_argument("--blackjack-payout", type=float, default=1.5)
+    parser.add_argument("--no-peek", action="store_true", help="Europäische Regel ohne verdeckte Karte (ENHC)")
+    parser.add_argument("--surrender", action="store_true", help="Late Surrender erlaubt")
+    parser.add_argument("--verbosity", type=int, choices=[0, 1, 2], default=NORMAL,
+                        help="0 = still, 1 = gedrosselter Fortschritt, 2 = jede Hand ausgeben")
+    parser.add_argument("--list", action="store_true", help="Stufen mit Abhängigkeiten anzeigen")
+    parser.add_argument("--profile", nargs="?", const="", metavar="DIR",
+                        help=f"cProfile, Speicher und Zeiten je Stufe messen (auch über {instrumentation.PROFILE_ENV})")
+    args = parser.parse_args(argv)
+
+    rules = Rules(hit_soft_17=args.hit_soft_17, blackjack_payout=args.blackjack_payout, peek=not args.no_peek,
+                  surrender=args.surrender)
+    pipeline = Pipeline(args.db, rules=rules, missing_cards=args.missing_cards, jobs=args.jobs,
+                        progress=ProgressReporter(args.verbosity), hand_jobs=args.hand_jobs)
+    if args.list:
+        for name, stage in pipeline.stages.items():
+            print(f"{name}{'' if stage.default else ' (optional)'}: {', '.join(stage.depends_on) or '-'}")
+        return 0
+
+    if args.profile is not None or os.environ.get(instrumentation.PROFILE_ENV):
+        instrumentation.enable(args.profile or None)
+    start = time.perf_counter()
+    timings = pipeline.run(args.stages or None, args.rerun)
+    print(f"{len(timings)} Stufen in {time.perf_counter() - start:.4f} Sekunden")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+import threading
+import time
+
+# Ausführlichkeit: 0 = still, 1 = gedrosselte Fortschrittszeilen und Zusammenfassung, 2 = zusätzlich jede Hand
+QUIET, NORMAL, VERBOSE = 0, 1, 2
+
+
+class ProgressCancelled(Exception):
+    """Wird ausgelöst, wenn ein Lauf über ProgressReporter.cancel oder den Callback abgebrochen wurde."""
+
+
+class ProgressReporter:
+    def __init__(self, verbosity=NORMAL, interval=2.0, callback=None):
+        """
+        Strukturierter Fortschritt für lange Enumerationen (Dealer- und Spielerhände). Statt einer Zeile pro Hand
+        werden höchstens alle interval Sekunden Hände/s und die Restzeit der aktuellen Einheit (z. B. einer
+        Dealer-Karte) gemeldet, am Ende eine Zusammenfassung.
+
+        Args:
+            verbosity (int): QUIET, NORMAL oder VERBOSE.
+            interval (float): Mindestabstand der Fortschrittsmeldungen in Sekunden.
+            callback (callable, optional): Erhält jede Meldung als dict (auch bei QUIET). Gibt er False zurück,
+                                           wird der Lauf abgebrochen.
+        """
+        self.verbosity = verbosity
+        self.interval = interval
+        self.callback = callback
+        self.summaries = []
+        self._cancelled = threading.Event()
+
+    def task(self, name, total=None):
+        """
+        Startet eine Aufgabe.
+
+        Args:
+            name (str): Name der Aufgabe, z. B. 'Spielerhände'.
+            total (int, optional): Erwartete Anzahl der Einheiten (z. B. Dealer-Karten).
+
+        Returns:
+            ProgressTask: Die Aufgabe (auch als Kontextmanager verwendbar).
+        """
+        return ProgressTask(self, name, total)
+
+    def cancel(self):
+        """Bricht laufende Aufgaben beim nächsten Fortschritt ab (threadsicher)."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def emit(self, event, message=None):
+        """Gibt eine Meldung aus und reicht sie an den Callback weiter."""
+        if message is not None and self.verbosity >= NORMAL:
+            print(message)
+        if self.callback is not None and self.callback(event) is False:
+            self.cancel()
+
+
+class ProgressTask:
+    def __init__(self, reporter, name, total=None):
+        """
+        Eine laufende Aufgabe eines ProgressReporter. Wird über ProgressReporter.task erzeugt.
+
+        Args:
+            reporter (ProgressReporter): Der zugehörige Reporter.
+            name (str): Name der Aufgabe.
+            total (int, optional): Erwartete Anzahl der Einheiten.
+        """
+        self.reporter = reporter
+        self.name = name
+        self.total_units = total
+        self.verbose = reporter.verbosity >= VERBOSE
+        self.done = 0
+        self.units = {}
+        self.unit = None
+        self.unit_total = None
+        self.unit_done = 0
+        self.start = self.unit_start = time.perf_counter()
+        self._next_report = self.start + reporter.interval
+
+    def begin_unit(self, unit, total=None):
+        """
+        Beginnt eine neue Einheit; Restzeit und Fortschritt beziehen sich auf die aktuelle Einheit.
+
+        Args:
+            unit: Bezeichnung der Einheit, z. B. die Dealer-Karte.
+            total (int, optional): Erwartete Anzahl der Elemente der Einheit (für die Restzeit).
+        """
+        self._finish_unit()
+        self.unit = unit
+        self.unit_total = total
+        self.unit_done = 0
+        self.unit_start = time.perf_counter()
+
+    def advance(self, count=1):
+        """
+        Zählt erledigte Elemente und meldet den Fortschritt, wenn das Intervall abgelaufen ist.
+
+        Args:
+            count (int): Anzahl der neu erledigten Elemente.
+
+        Raises:
+            ProgressCancelled: Wenn der Lauf abgebrochen wurde.
+        """
+        self.done += count
+        self.unit_done += count
+        now = time.perf_counter()
+        if now >= self._next_report:
+            self._next_report = now + self.reporter.interval
+            self._report(now)
+        if self.reporter.cancelled:
+            raise ProgressCancelled(f"{self.name} abgebrochen nach {self.done} Elementen")
+
+    def detail(self, message):
+        """Einzelmeldung, nur bei VERBOSE (Aufrufer prüfen self.verbose, um das Formatieren zu sparen)."""
+        if self.verbose:
+            print(message)
+
+    def event(self, now=None, finished=False):
+        """
+        Aktueller Stand als dict.
+
+        Returns:
+            dict: task, unit, done, unit_done, unit_total, rate (Elemente/s), eta_seconds (Restzeit der Einheit
+                  oder None), elapsed und finished.
+        """
+        now = now if now is not None else time.perf_counter()
+        elapsed = now - self.start
+        unit_elapsed = now - self.unit_start
+        unit_rate = self.unit_done / unit_elapsed if unit_elapsed > 0 else 0.0
+        eta = None
+        if self.unit_total and unit_rate > 0:
+            eta = max(0.0, (self.unit_total - self.unit_done) / unit_rate)
+        return {"task": self.name, "unit": self.unit, "done": self.done, "unit_done": self.unit_done,
+                "unit_total": self.unit_total, "rate": self.done / elapsed if elapsed > 0 else 0.0,
+                "eta_seconds": eta, "elapsed": elapsed, "finished": finished}
+
+    def _report(self, now):
+        event = self.event(now)
+        message = f"{self.name}: {event['done']} ({event['rate']:.0f}/s)"
+        if self.unit is not None:
+            message += f", Einheit {self.unit}"
+            if self.total_units:
+                message += f" ({len(self.units) + 1}/{self.total_units})"
+            if event["eta_seconds"] is not None:
+                message += f", Restzeit ca. {event['eta_seconds']:.1f} s"
+        self.reporter.emit(event, message)
+
+    def _finish_unit(self):
+        if self.unit is not None:
+            self.units[self.unit] = self.unit_done
+            self.unit = None
+
+    def close(self):
+        """
+        Schließt die Aufgabe ab und meldet die Zusammenfassung.
+
+        Returns:
+            dict: Die abschließende Meldung (zusätzlich mit der Anzahl pro Einheit unter 'units').
+        """
+        self._finish_unit()
+        event = self.event(finished=True)
+        event["units"] = dict(self.units)
+        self.reporter.summaries.append(event)
+        self.reporter.emit(event, f"{self.name}: {event['done']} in {event['elapsed']:.4f} Sekunden "
+                                  f"({event['rate']:.0f}/s)")
+        return event
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        return False
@@ -0,0 +1,452 @@
+import math
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Models.Deck import Deck
+from Models.Dealer_hands import DealerHands
+from Models.Rules import Rules
+from Utility.Calculations import hand_key_of_cards
+
+
+def load_strategy(db_path, table_name="Full_player_hands"):
+    """
+    Lädt die berechnete Strategie aus der Datenbank.
+
+    Args:
+        db_path (str): Pfad zur Datenbank mit gefüllter Spielerhände-Tabelle und 'starthand_overview'.
+        table_name (str): Name der Spielerhände-Tabelle.
+
+    Returns:
+        tuple[dict, dict]: (Hit/Stand je Handschlüssel, Entscheidung je Handschlüssel einer Starthand aus
+                           'starthand_overview' mit 'Hit', 'Stand', 'Double', 'Split' oder 'Surrender').
+                           Der Handschlüssel packt Kartenzählung und Dealer-Karte (calc.hand_key_of_cards).
+    """
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        actions = dict(connection.execute(f"SELECT hand_key, action FROM {table_name} WHERE dealer_start != 'Blackjack'"))
+
+        starthand = {}
+        for hand_text, *decisions in connection.execute(
+                f"SELECT hand_text, {', '.join(f'Dealer_{i}' for i in range(1, 11))} FROM starthand_overview"):
+            cards = [int(card) for card in hand_text.split(",")]
+            for upcard, decision in enumerate(decisions, start=1):
+                if decision is not None:
+                    starthand[hand_key_of_cards(cards, upcard)] = decision
+        return actions, starthand
+    finally:
+        connection.close()
+
+
+def _value(hand):
+    """Gesamtwert einer Hand (ein Ass zählt 11, solange die Hand nicht über 21 kommt) und ob sie soft ist."""
+    hard = sum(hand)
+    if 1 in hand and hard <= 11:
+        return hard + 10, True
+    return hard, False
+
+
+class Shoe:
+    def __init__(self, rng, deck_count=1, penetration=0.75, batch_size=64):
+        """
+        Kartenschlitten der Simulation. Mischen und Ziehen sind vektorisiert: es werden immer batch_size
+        Schlitten auf einmal mit NumPy gemischt, gezogen wird danach nur noch über einen Positionszeiger.
+
+        Args:
+            rng (np.random.Generator): Zufallsgenerator des Shards.
+            deck_count (int): Anzahl der Decks im Schlitten.
+            penetration (float): Anteil des Schlittens, nach dem neu gemischt wird.
+                                 0 mischt vor jeder Runde (frisches Deck wie in der exakten Berechnung).
+            batch_size (int): Anzahl der Schlitten, die gemeinsam gemischt werden.
+        """
+        self.rng = rng
+        self.batch_size = batch_size
+        frequencies = [4 * deck_count] * 9 + [16 * deck_count]
+        self.cards = np.repeat(np.arange(1, 11), frequencies)
+        self.cut = int(len(self.cards) * penetration)
+        self.shuffles = 0
+        self._shuffled = []
+        self._current = []
+        self.position = 0
+        self.reshuffle()
+
+    def reshuffle(self):
+        """Nimmt den nächsten gemischten Schlitten, bei Bedarf wird ein neuer Block gemischt."""
+        if not self._shuffled:
+            block = np.tile(self.cards, (self.batch_size, 1))
+            self._shuffled = self.rng.permuted(block, axis=1).tolist()
+        self._current = self._shuffled.pop()
+        self.position = 0
+        self.shuffles += 1
+
+    def start_round(self):
+        """Mischt neu, wenn die Schnittkarte erreicht ist."""
+        if self.position >= self.cut:
+            self.reshuffle()
+
+    def draw(self):
+        """Zieht die nächste Karte; ist der Schlitten mitten in der Runde leer, wird neu gemischt."""
+        if self.position >= len(self._current):
+            self.reshuffle()
+        card = self._current[self.position]
+        self.position += 1
+        return card
+
+
+class RoundPlayer:
+    def __init__(self, strategy, rules=None):
+        """
+        Spielt einzelne Runden nach der berechneten Strategie.
+
+        Args:
+            strategy (tuple[dict, dict]): Ergebnis von load_strategy.
+            rules (Rules, optional): Spielregeln. Standard sind die Standardregeln.
+        """
+        self.actions, self.starthand = strategy
+        self.rules = rules if rules is not None else Rules()
+
+    def play(self, shoe):
+        """
+        Spielt eine Runde mit einer Box.
+
+        Args:
+            shoe (Shoe): Der Kartenschlitten.
+
+        Returns:
+            tuple: (Starthand-Schlüssel (hand_text, Dealer-Karte), Ergebnis in Einsätzen,
+                    ob der Dealer nach einem Peek Blackjack hatte, Anzahl gespielter Hände).
+        """
+        shoe.start_round()
+        player = [shoe.draw()]
+        upcard = shoe.draw()
+        player.append(shoe.draw())
+        hole = shoe.draw()
+        cell = (",".join(map(str, sorted(player))), upcard)
+        player_blackjack = _value(player)[0] == 21
+
+        # Dealer schaut nach (Peek): Blackjack beendet die Runde sofort
+        dealer_blackjack = _value([upcard, hole])[0] == 21
+        if dealer_blackjack and (self.rules.peek or player_blackjack):
+            # Ohne Peek enthalten die exakten EVs den Dealer-Blackjack, die Runde zählt dann auch für die Zelle
+            return cell, 0.0 if player_blackjack else -1.0, self.rules.peek, 1
+        if player_blackjack:
+            return cell, self.rules.blackjack_payout, False, 1
+
+        decision = self.starthand.get(hand_key_of_cards(player, upcard))
+        if decision == "Surrender":
+            if self.rules.surrender:
+                # Ohne Peek nimmt ein Dealer-Blackjack auch nach der Aufgabe den ganzen Einsatz
+                return cell, -1.0 if dealer_blackjack else -0.5, False, 1
+            decision = None
+        if decision == "Split" and player[0] == player[1]:
+            hands = self._play_split(player[0], upcard, shoe)
+        else:
+            hands = [self._play_hand(player, upcard, shoe, decision)]
+
+        # Ohne Peek (ENHC) verliert der Spieler bei einem Dealer-Blackjack alle Einsätze
+        if dealer_blackjack:
+            return cell, -float(sum(bet for bet, _ in hands)), False, len(hands)
+
+        # Der Dealer spielt nur, wenn noch eine Hand im Spiel ist
+        dealer = [upcard, hole]
+        if any(value <= 21 for _, value in hands):
+            while True:
+                value, soft = _value(dealer)
+                if not self.rules.dealer_stands(value, soft):
+                    dealer.append(shoe.draw())
+                else:
+                    break
+        dealer_value = _value(dealer)[0]
+
+        result = 0.0
+        for bet, value in hands:
+            if value > 21:
+                result -= bet
+            elif dealer_value > 21 or value > dealer_value:
+                result += bet
+            elif value < dealer_value:
+                result -= bet
+        return cell, result, False, len(hands)
+
+    def _play_split(self, pair_card, upcard, shoe):
+        """
+        Spielt ein gesplittetes Paar inklusive Resplits bis max_split_hands Hände.
+
+        Returns:
+            list[tuple]: (Einsatz, Endwert) pro Teilhand.
+        """
+        max_hands = self.rules.max_split_hands if pair_card != 1 or self.rules.resplit_aces else 2
+        pending, hand_count, hands = 2, 2, []
+        while pending:
+            hand = [pair_card, shoe.draw()]
+            if hand[1] == pair_card and hand_count < max_hands:
+                # Erneut splitten: die zweite Karte eröffnet eine weitere Teilhand
+                pending += 1
+                hand_count += 1
+                continue
+            hands.append(self._play_split_hand(hand, upcard, shoe))
+            pending -= 1
+        return hands
+
+    def _play_split_hand(self, hand, upcard, shoe):
+        """Spielt eine Hand nach einem Split (21 zählt nicht als Blackjack)."""
+        if hand[0] == 1 and self.rules.split_aces_one_card:
+            return 1, _value(hand)[0]
+        decision = self.starthand.get(hand_key_of_cards(hand, upcard))
+        if decision in ("Split", "Surrender") or (decision == "Double" and not self.rules.double_after_split):
+            decision = None
+        return self._play_hand(hand, upcard, shoe, decision)
+
+    def _play_hand(self, hand, upcard, shoe, decision=None):
+        """
+        Spielt eine Hand nach Hit/Stand aus der Tabelle bzw. der Entscheidung für die Starthand.
+
+        Returns:
+            tuple: (Einsatz, Endwert der Hand).
+        """
+        if decision == "Double":
+            hand.append(shoe.draw())
+            return 2, _value(hand)[0]
+        action = decision
+        while True:
+            value = _value(hand)[0]
+            if value > 21:
+                return 1, value
+            if action is None:
+                action = self.actions.get(hand_key_of_cards(hand, upcard), "Stand")
+            if action != "Hit":
+                return 1, value
+            hand.append(shoe.draw())
+            action = None
+
+
+def _simulate_shard(strategy, rounds, seed_sequence, deck_count, penetration, rules):
+    """
+    Worker-Funktion: simuliert einen Shard mit eigenem, unabhängigem Zufallsstrom.
+
+    Returns:
+        dict: Runden, Hände, Summe und Quadratsumme der Ergebnisse, Zellen und Dauer.
+    """
+    start = time.perf_counter()
+    shoe = Shoe(np.random.default_rng(seed_sequence), deck_count, penetration)
+    player = RoundPlayer(strategy, rules)
+    total = total_sq = 0.0
+    hands = 0
+    cells = {}
+    for _ in range(rounds):
+        cell, result, dealer_blackjack, hand_count = player.play(shoe)
+        total += result
+        total_sq += result * result
+        hands += hand_count
+        # Die exakten EVs setzen voraus, dass der Dealer keinen Blackjack hat (Peek)
+        if not dealer_blackjack:
+            stats = cells.get(cell)
+            if stats is None:
+                stats = cells[cell] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += result
+            stats[2] += result * result
+    return {"rounds": rounds, "hands": hands, "total": total, "total_sq": total_sq, "cells": cells,
+            "seconds": time.perf_counter() - start}
+
+
+class SimulationResult:
+    def __init__(self, shards, seconds):
+        """
+        Zusammengefasstes Ergebnis aller Shards.
+
+        Args:
+            shards (list[dict]): Ergebnisse von _simulate_shard.
+            seconds (float): Gesamtdauer (Wanduhr).
+        """
+        self.rounds = sum(shard["rounds"] for shard in shards)
+        self.hands = sum(shard["hands"] for shard in shards)
+        self.seconds = seconds
+        total = sum(shard["total"] for shard in shards)
+        total_sq = sum(shard["total_sq"] for shard in shards)
+        self.mean = total / self.rounds
+        variance = max(0.0, total_sq / self.rounds - self.mean ** 2)
+        self.standard_error = math.sqrt(variance / self.rounds)
+
+        self.cells = {}
+        for shard in shards:
+            for cell, (count, cell_total, cell_total_sq) in shard["cells"].items():
+                stats = self.cells.setdefault(cell, [0, 0.0, 0.0])
+                stats[0] += count
+                stats[1] += cell_total
+                stats[2] += cell_total_sq
+
+    @property
+    def house_edge(self):
+        """Hausvorteil pro Runde (negativer mittlerer Spielergewinn)."""
+        return -self.mean
+
+    def confidence_interval(self, z=1.96):
+        """
+        Konfidenzintervall des Hausvorteils.
+
+        Args:
+            z (float): Quantil der Normalverteilung (1.96 für 95 %).
+
+        Returns:
+            tuple[float, float]: Untere und obere Grenze.
+        """
+        return self.house_edge - z * self.standard_error, self.house_edge + z * self.standard_error
+
+    @property
+    def hands_per_second(self):
+        """Gespielte Runden pro Sekunde."""
+        return self.rounds / self.seconds if self.seconds else 0.0
+
+    def cell_mean(self, hand_text, upcard):
+        """
+        Mittelwert und Standardfehler einer Zelle (Starthand gegen Dealer-Karte, ohne Dealer-Blackjack).
+
+        Returns:
+            tuple: (Anzahl, Mittelwert, Standardfehler) oder None, falls die Zelle nie vorkam.
+        """
+        stats = self.cells.get((hand_text, upcard))
+        if not stats:
+            return None
+        count, cell_total, cell_total_sq = stats
+        mean = cell_total / count
+        variance = max(0.0, cell_total_sq / count - mean ** 2)
+        return count, mean, math.sqrt(variance / count)
+
+    def as_dict(self):
+        """Zusammenfassung als Dictionary."""
+        low, high = self.confidence_interval()
+        return {"rounds": self.rounds, "hands": self.hands, "seconds": self.seconds,
+                "house_edge": self.house_edge, "ci95": (low, high),
+                "standard_error": self.standard_error, "hands_per_second": self.hands_per_second}
+
+
+class Simulator:
+    def __init__(self, db_path="Data/blackjack.db", deck_count=1, penetration=0.75, rules=None,
+                 table_name="Full_player_hands"):
+        """
+        Monte-Carlo-Simulation von Runden mit der berechneten Strategie zur Überprüfung der exakten EVs.
+
+        Die Strategie ist für die Deck-Konfiguration der Datenbank berechnet; bei anderer Deckanzahl oder
+        Penetration wird sie unverändert angewendet. Für den zellweisen Vergleich mit compare_with_exact
+        sollte penetration=0 (frisches Deck in jeder Runde) und dieselbe Deckanzahl verwendet werden.
+
+        Args:
+            db_path (str): Pfad zur Datenbank mit Strategie.
+            deck_count (int): Anzahl der Decks im Schlitten.
+            penetration (float): Anteil des Schlittens, nach dem neu gemischt wird (0 = vor jeder Runde).
+            rules (Rules, optional): Spielregeln. Standard sind die Standardregeln.
+            table_name (str): Name der Spielerhände-Tabelle.
+        """
+        self.db_path = db_path
+        self.table_name = table_name
+        self.deck_count = deck_count
+        self.penetration = penetration
+        self.rules = rules if rules is not None else Rules()
+        self.strategy = load_strategy(db_path, table_name)
+
+    def run(self, rounds=1000000, shards=None, jobs=1, seed=0):
+        """
+        Simuliert die Runden verteilt auf Shards mit unabhängigen Zufallsströmen (SeedSequence.spawn).
+        Das Ergebnis hängt nur von seed und shards ab, nicht von jobs.
+
+        Args:
+            rounds (int): Gesamtzahl der Runden.
+            shards (int, optional): Anzahl der Shards. Standard ist jobs.
+            jobs (int): Anzahl der Prozesse; 1 simuliert im aktuellen Prozess.
+            seed (int): Startwert für die Zufallsströme.
+
+        Returns:
+            SimulationResult: Hausvorteil, Konfidenzintervall, Durchsatz und Zellen.
+        """
+        shards = shards or jobs
+        sizes = [rounds // shards + (1 if shard < rounds % shards else 0) for shard in range(shards)]
+        seeds = np.random.SeedSequence(seed).spawn(shards)
+        arguments = ([self.strategy] * shards, sizes, seeds, [self.deck_count] * shards,
+                     [self.penetration] * shards, [self.rules] * shards)
+
+        start = time.perf_counter()
+        if jobs <= 1:
+            results = list(map(_simulate_shard, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, shards)) as executor:
+                results = list(executor.map(_simulate_shard, *arguments))
+        return SimulationResult(results, time.perf_counter() - start)
+
+    def exact_cell_evs(self):
+        """
+        EVs der exakten Berechnung für jede Starthand gegen jede Dealer-Karte, passend zur Entscheidung
+        in 'starthand_overview' (Double: 2 * (win_hit - loss_hit), Split: EV aus 'Split_ev', Surrender: Rules.surrender_ev,
+        sonst ev).
+        Ohne Tabelle 'Split_ev' wird der Split mit 2 * EV der Einzelkarte geschätzt.
+
+        Returns:
+            dict: (hand_text, Dealer-Karte) -> EV.
+        """
+        _, starthand = self.strategy
+        connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(f"""
+                SELECT hand_text, dealer_start, ev, win_hit, loss_hit
+                FROM {self.table_name}
+                WHERE dealer_start != 'Blackjack' AND (is_starthand = 1 OR hand_text NOT LIKE '%,%')
+            """).fetchall()
+            has_split_ev = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Split_ev'").fetchone() is not None
+            split_evs = {}
+            if has_split_ev:
+                split_evs = {(pair_value, int(dealer_start)): ev for pair_value, dealer_start, ev
+                             in connection.execute("SELECT pair_value, dealer_start, ev FROM Split_ev")}
+        finally:
+            connection.close()
+
+        deck = Deck(self.deck_count)
+        dealer_hands = DealerHands(deck, rules=self.rules)
+        surrender_evs = {}
+        for upcard in deck.get_available_cards():
+            dealer_blackjack = dealer_hands.dealer_distribution(upcard, deck).get("Blackjack", 0.0)
+            surrender_evs[upcard] = self.rules.surrender_ev(dealer_blackjack)
+        single = {(hand_text, int(dealer_start)): ev for hand_text, dealer_start, ev, _, _ in rows
+                  if "," not in hand_text}
+        evs = {}
+        for hand_text, dealer_start, ev, win_hit, loss_hit in rows:
+            if "," not in hand_text or ev is None:
+                continue
+            upcard = int(dealer_start)
+            decision = starthand.get(hand_key_of_cards((int(card) for card in hand_text.split(",")), upcard))
+            if decision == "Double":
+                ev = 2 * (win_hit - loss_hit)
+            elif decision == "Surrender":
+                ev = surrender_evs[upcard]
+            elif decision == "Split" and has_split_ev:
+                ev = split_evs[(int(hand_text.split(",")[0]), upcard)]
+            elif decision == "Split":
+                ev = 2 * single[(hand_text.split(",")[0], upcard)]
+            evs[(hand_text, upcard)] = ev
+        return evs
+
+    def compare_with_exact(self, result, min_count=1):
+        """
+        Vergleicht die simulierten Zellen mit den exakten EVs.
+
+        Args:
+            result (SimulationResult): Ergebnis von run.
+            min_count (int): Zellen mit weniger Stichproben werden übersprungen.
+
+        Returns:
+            list[dict]: Pro Zelle hand_text, upcard, exact, simulated, standard_error, z und count,
+                        sortiert nach dem größten |z|.
+        """
+        comparison = []
+        for (hand_text, upcard), exact in self.exact_cell_evs().items():
+            cell = result.cell_mean(hand_text, upcard)
+            if cell is None or cell[0] < min_count:
+                continue
+            count, mean, standard_error = cell
+            z = (mean - exact) / standard_error if standard_error else 0.0
+            comparison.append({"hand_text": hand_text, "upcard": upcard, "exact": exact, "simulated": mean,
+                               "standard_error": standard_error, "z": z, "count": count})
+        comparison.sort(key=lambda row: abs(row["z"]), reverse=True)
+        return comparison
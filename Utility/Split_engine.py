@@ -0,0 +1,158 @@
+from Models.Rules import Rules
+
+
+class SplitEngine:
+    def __init__(self, hand_evaluator, rules=None):
+        """
+        Berechnet den EV eines Splits für eine gegebene Deck-Zusammensetzung, statt ihn als 2 * EV der
+        Einzelkarte zu schätzen.
+
+        Berücksichtigt werden:
+            - das Entfernen der Paarkarten (und weiterer Paarkarten bei Resplits) aus dem Deck jeder Teilhand,
+              auch für die Dealer-Verteilung,
+            - Resplits bis max_split_hands Hände, verdoppeln nach dem Split (DAS) und gesplittete Asse mit nur
+              einer Karte aus den Regeln,
+            - 21 aus zwei Karten nach einem Split zählt nicht als Blackjack.
+
+        Jede Teilhand wird wie im EVEngine mit dem Restdeck ohne die Karten der anderen Teilhände bewertet
+        (die übrigen Karten der anderen Hände werden nicht abgezogen). Die EVs der Teilhände kommen aus
+        hand_evaluator.hand_values und werden dort pro (Zusammensetzung, Dealer-Karte, Regeln) gespeichert.
+
+        Args:
+            hand_evaluator (CompositionSweep): Liefert Handverzeichnis und die EVs der Hände einer Zusammensetzung.
+            rules (Rules, optional): Spielregeln. Standard sind die Regeln des hand_evaluator.
+        """
+        self.hand_evaluator = hand_evaluator
+        self.rules = rules if rules is not None else getattr(hand_evaluator, "rules", None) or Rules()
+        self._second_cards = {}
+
+    def hand_values(self, counts, upcard):
+        """
+        EVs aller Hände für eine Zusammensetzung und Dealer-Karte unter den Regeln des Engines.
+
+        Args:
+            counts (tuple[int]): Zusammensetzung des Decks als Anzahlen der Karten 1 bis 10.
+            upcard (int): Dealer-Karte.
+
+        Returns:
+            tuple: (stand_ev, hit_ev, double_ev) pro Hand des Verzeichnisses und der Stand-EV einer 21 ohne Blackjack.
+        """
+        stand_ev, hit_ev, _, double_ev, stand_21 = self.hand_evaluator.hand_values(counts, upcard, self.rules)[:5]
+        return stand_ev, hit_ev, double_ev, stand_21
+
+    def _second_card(self, pair_card, upcard, counts, others):
+        """
+        Werte einer Teilhand nach dem Ziehen der zweiten Karte.
+
+        Args:
+            pair_card (int): Die Paarkarte.
+            upcard (int): Dealer-Karte.
+            counts (tuple[int]): Zusammensetzung vor dem Split (inklusive Paar und Dealer-Karte).
+            others (int): Anzahl der Paarkarten in den anderen Händen.
+
+        Returns:
+            tuple: (EV bei beliebiger zweiter Karte, EV bei zweiter Karte ungleich der Paarkarte,
+                    Wahrscheinlichkeit, die Paarkarte zu ziehen).
+        """
+        key = (pair_card, upcard, counts, others, self.rules.key())
+        cached = self._second_cards.get(key)
+        if cached is not None:
+            return cached
+
+        composition = list(counts)
+        composition[pair_card - 1] -= others
+        stand_ev, hit_ev, double_ev, stand_21 = self.hand_values(tuple(composition), upcard)
+
+        # Restdeck für die zweite Karte: ohne Dealer-Karte und die eigene Paarkarte
+        remaining = list(composition)
+        remaining[upcard - 1] -= 1
+        remaining[pair_card - 1] -= 1
+        total_cards = sum(remaining)
+        if total_cards <= 0:
+            return 0.0, 0.0, 0.0
+
+        catalogue = self.hand_evaluator.catalogue
+        any_card = other_card = 0.0
+        for card in range(1, 11):
+            count = remaining[card - 1]
+            if count <= 0:
+                continue
+            hand = [0] * 10
+            hand[pair_card - 1] += 1
+            hand[card - 1] += 1
+            index = catalogue.find(hand)
+            stand = stand_21 if catalogue.is_blackjack[index] else stand_ev[index]
+            if pair_card == 1 and self.rules.split_aces_one_card:
+                value = stand
+            else:
+                value = max(stand, hit_ev[index])
+                if self.rules.double_after_split:
+                    value = max(value, double_ev[index])
+            any_card += count * value
+            if card != pair_card:
+                other_card += count * value
+
+        pair_count = remaining[pair_card - 1]
+        result = (any_card / total_cards,
+                  other_card / (total_cards - pair_count) if total_cards > pair_count else 0.0,
+                  pair_count / total_cards)
+        self._second_cards[key] = result
+        return result
+
+    def split_ev(self, pair_card, upcard, counts=None):
+        """
+        EV eines Splits (Summe aller Teilhände in Einheiten des ursprünglichen Einsatzes).
+
+        Args:
+            pair_card (int): Die Paarkarte.
+            upcard (int): Dealer-Karte.
+            counts (tuple[int], optional): Zusammensetzung vor dem Austeilen. Standard ist das Deck des Evaluators.
+
+        Returns:
+            float or None: Der Split-EV oder None, wenn Paar und Dealer-Karte in der Zusammensetzung nicht möglich sind.
+        """
+        if counts is None:
+            counts = self.hand_evaluator.deck.get_card_counts()
+        counts = tuple(counts)
+        needed = [0] * 10
+        needed[pair_card - 1] += 2
+        needed[upcard - 1] += 1
+        if any(counts[card] < needed[card] for card in range(10)):
+            return None
+
+        max_hands = self.rules.max_split_hands if pair_card != 1 or self.rules.resplit_aces else 2
+        memo = {}
+
+        def expected(pending, hands, others):
+            # Erwartete Summe der noch offenen Teilhände; others = Paarkarten in den anderen Händen
+            if pending == 0:
+                return 0.0
+            key = (pending, hands, others)
+            if key in memo:
+                return memo[key]
+            any_card, other_card, pair_probability = self._second_card(pair_card, upcard, counts, others)
+            if hands < max_hands and pair_probability > 0:
+                value = (pair_probability * expected(pending + 1, hands + 1, others + 1)
+                         + (1 - pair_probability) * (other_card + expected(pending - 1, hands, others)))
+            else:
+                value = any_card + expected(pending - 1, hands, others)
+            memo[key] = value
+            return value
+
+        return float(expected(2, 2, 1))
+
+    def iter_rows(self, counts=None):
+        """
+        Split-EVs aller Paare gegen alle Dealer-Karten als Zeilen für die Tabelle 'Split_ev'.
+
+        Args:
+            counts (tuple[int], optional): Zusammensetzung. Standard ist das Deck des Evaluators.
+
+        Yields:
+            list: [pair_value, dealer_start, ev].
+        """
+        for pair_card in range(1, 11):
+            for upcard in range(1, 11):
+                ev = self.split_ev(pair_card, upcard, counts)
+                if ev is not None:
+                    yield [pair_card, str(upcard), ev]
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import time
+
+# Quelltexte, deren Inhalt die Code-Version der Pipeline bestimmt
+CODE_DIRECTORIES = ("Models", "Utility")
+
+_code_version = None
+
+
+def code_version():
+    """
+    Fingerabdruck des Quelltexts aller Module in Models und Utility. Jede Codeänderung ergibt eine neue Version,
+    sodass keine Ergebnisse eines älteren Stands wiederverwendet werden.
+
+    Returns:
+        str: SHA-256 über Pfade und Inhalte der .py-Dateien (pro Prozess einmal berechnet).
+    """
+    global _code_version
+    if _code_version is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256()
+        for directory in CODE_DIRECTORIES:
+            path = os.path.join(root, directory)
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".py"):
+                    digest.update(f"{directory}/{name}".encode())
+                    with open(os.path.join(path, name), "rb") as file:
+                        digest.update(file.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def _normalize(value):
+    """Wandelt Eingaben (Deck, Rules, Tupel, ...) in JSON-fähige Werte um."""
+    if hasattr(value, "get_card_counts"):
+        return {"deck": value.get_card_counts()}
+    if hasattr(value, "key") and callable(value.key):
+        return {"rules": _normalize(value.key())}
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+class StageCache:
+    def __init__(self, db_manager, table_name="Stage_metadata", version=None):
+        """
+        Inhaltsadressierter Cache für Pipeline-Stufen in derselben Datenbank.
+
+        Jede Stufe erhält einen Fingerabdruck aus ihren Eingaben (Deck-Zusammensetzung, entfernte Karten, Regeln,
+        Code-Version und Fingerabdrücke der vorgelagerten Stufen). Stimmt er mit dem aktiven Eintrag überein,
+        wird die Stufe übersprungen. Bei einem neuen Fingerabdruck werden die bisherigen Ausgabetabellen nicht
+        gelöscht, sondern unter '<Tabelle>__<Fingerabdruck>' archiviert; kehrt eine frühere Konfiguration zurück,
+        werden ihre Tabellen per Umbenennen wiederhergestellt. So liegen mehrere Konfigurationen nebeneinander
+        in einer Datenbankdatei, aktiv ist jeweils eine unter den gewohnten Tabellennamen.
+
+        Args:
+            db_manager (DatabaseManager): Datenbankmanager.
+            table_name (str): Name der Metadatentabelle.
+            version (str, optional): Code-Version. Standard ist code_version().
+        """
+        self.db_manager = db_manager
+        self.table_name = table_name
+        self.version = version if version is not None else code_version()
+        db_manager.create_table_stage_metadata(table_name)
+
+    def fingerprint(self, stage, inputs=None, depends_on=()):
+        """
+        Berechnet den Fingerabdruck einer Stufe.
+
+        Args:
+            stage (str): Name der Stufe.
+            inputs (dict, optional): Eingaben der Stufe (Deck, Rules, Listen und einfache Werte).
+            depends_on (iterable[str]): Vorgelagerte Stufen; deren aktive Fingerabdrücke fließen ein.
+
+        Returns:
+            tuple[str, str]: (Fingerabdruck, Eingaben als JSON).
+        """
+        payload = json.dumps({
+            "stage": stage,
+            "version": self.version,
+            "inputs": _normalize(inputs or {}),
+            "depends_on": {name: self.current(name) for name in sorted(depends_on)},
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest(), payload
+
+    def current(self, stage):
+        """
+        Gibt den Fingerabdruck der aktiven Ausgabe einer Stufe zurück.
+
+        Args:
+            stage (str): Name der Stufe.
+
+        Returns:
+            str or None: Der Fingerabdruck oder None, wenn die Stufe noch nicht gelaufen ist.
+        """
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(f"SELECT fingerprint FROM {self.table_name} WHERE stage = ? AND active = 1", (stage,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def archive_name(table_name, fingerprint):
+        """Name einer archivierten Ausgabetabelle."""
+        return f"{table_name}__{fingerprint[:16]}"
+
+    def run(self, stage, tables, build, inputs=None, depends_on=(), force=False):
+        """
+        Führt eine Stufe aus, falls ihre Eingaben sich geändert haben.
+
+        Args:
+            stage (str): Name der Stufe.
+            tables (list[str]): Ausgabetabellen der Stufe (leer, wenn sie nur bestehende Tabellen ergänzt;
+                                solche Stufen werden nie aus dem Archiv wiederhergestellt).
+            build (callable): Erzeugt die Ausgabetabellen; wird ohne Argumente aufgerufen.
+            inputs (dict, optional): Eingaben der Stufe.
+            depends_on (iterable[str]): Vorgelagerte Stufen.
+            force (bool): Stufe auch bei passendem Fingerabdruck neu berechnen.
+
+        Returns:
+            str: 'skipped' (aktuell), 'restored' (aus dem Archiv) oder 'built' (neu berechnet).
+        """
+        fingerprint, payload = self.fingerprint(stage, inputs, depends_on)
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(f"SELECT fingerprint, active FROM {self.table_name} WHERE stage = ?", (stage,))
+        entries = dict(cursor.fetchall())
+
+        if not force and entries.get(fingerprint) == 1 and all(self.db_manager.table_exists(table) for table in tables):
+            print(f"Stufe '{stage}' ist aktuell und wird übersprungen.")
+            return "skipped"
+
+        # Die bisherige Konfiguration archivieren (bei force mit gleichem Fingerabdruck wird sie überschrieben)
+        for active_fingerprint, active in entries.items():
+            if active == 1 and active_fingerprint != fingerprint:
+                self._archive(stage, active_fingerprint, tables)
+
+        # Stufen ohne eigene Tabellen (z. B. 'evs', die Full_player_hands ergänzt) haben kein Archiv und
+        # werden immer neu berechnet
+        archived = bool(tables) and all(self.db_manager.table_exists(self.archive_name(table, fingerprint))
+                                        for table in tables)
+        if not force and entries.get(fingerprint) == 0 and archived:
+            self._restore(stage, fingerprint, tables)
+            print(f"Stufe '{stage}' aus dem Archiv wiederhergestellt.")
+            return "restored"
+
+        start = time.perf_counter()
+        build()
+        seconds = time.perf_counter() - start
+        with self.db_manager._transaction() as conn:
+            conn.execute(f"""
+                INSERT OR REPLACE INTO {self.table_name} (stage, fingerprint, inputs, tables, indexes, active, seconds)
+                VALUES (?, ?, ?, ?, NULL, 1, ?)
+            """, (stage, fingerprint, payload, ",".join(tables), seconds))
+        return "built"
+
+    def _archive(self, stage, fingerprint, tables):
+        """
+        Benennt die aktiven Ausgabetabellen einer Stufe in ihre Archivnamen um. Indizes lassen sich in SQLite
+        nicht umbenennen; sie werden gelöscht und ihre Anweisungen für die Wiederherstellung gespeichert.
+        """
+        connection = self.db_manager.connection
+        indexes = []
+        with self.db_manager._transaction() as conn:
+            for table in tables:
+                if not self.db_manager.table_exists(table):
+                    continue
+                for name, sql in connection.execute(
+                        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                        (table,)).fetchall():
+                    indexes.append(sql)
+                    conn.execute(f"DROP INDEX {name}")
+                archive = self.archive_name(table, fingerprint)
+                conn.execute(f"DROP TABLE IF EXISTS {archive}")
+                conn.execute(f"ALTER TABLE {table} RENAME TO {archive}")
+            conn.execute(f"UPDATE {self.table_name} SET active = 0, indexes = ? WHERE stage = ? AND fingerprint = ?",
+                         (json.dumps(indexes), stage, fingerprint))
+
+    def _restore(self, stage, fingerprint, tables):
+        """Benennt archivierte Ausgabetabellen zurück und erstellt ihre Indizes neu."""
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(f"SELECT indexes FROM {self.table_name} WHERE stage = ? AND fingerprint = ?", (stage, fingerprint))
+        indexes = json.loads(cursor.fetchone()[0] or "[]")
+        with self.db_manager._transaction() as conn:
+            for table in tables:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"ALTER TABLE {self.archive_name(table, fingerprint)} RENAME TO {table}")
+            for sql in indexes:
+                conn.execute(sql)
+            conn.execute(f"UPDATE {self.table_name} SET active = 1, indexes = NULL WHERE stage = ? AND fingerprint = ?",
+                         (stage, fingerprint))
+
+    def entries(self):
+        """
+        Alle gespeicherten Konfigurationen.
+
+        Returns:
+            list[tuple]: (stage, fingerprint, active, tables, seconds, created_at).
+        """
+        cursor = self.db_manager.connection.cursor()
+        cursor.execute(f"""
+            SELECT stage, fingerprint, active, tables, seconds, created_at FROM {self.table_name} ORDER BY stage, created_at
+        """)
+        return cursor.fetchall()
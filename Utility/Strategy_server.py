@@ -0,0 +1,526 @@
+import argparse
+import asyncio
+import json
+import queue
+import random
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+
+from Utility.Lru_cache import LRUCache
+
+
+# Übersichtstabellen, die über /overview abgefragt werden dürfen, mit ihrer Schlüsselspalte
+OVERVIEW_TABLES = {
+    "Double_overview": "hand_text",
+    "starthand_overview": "hand_text",
+    "Pair_overview": "pair_value",
+}
+
+ACTION_COLUMNS = ["hand_text", "dealer_start", "total_value", "is_blackjack", "can_double", "can_split",
+                  "win_hit", "loss_hit", "win_stand", "loss_stand", "action", "ev"]
+
+HTTP_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+
+
+def percentiles(latencies):
+    """
+    Berechnet p50, p90 und p99 einer Liste von Latenzen.
+
+    Args:
+        latencies (list[float]): Latenzen in Millisekunden.
+
+    Returns:
+        dict: p50_ms, p90_ms, p99_ms (0.0 bei leerer Liste).
+    """
+    if not latencies:
+        return {"p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0}
+    ordered = sorted(latencies)
+    return {f"p{int(q * 100)}_ms": ordered[min(len(ordered) - 1, int(len(ordered) * q))] for q in (0.50, 0.90, 0.99)}
+
+
+class ReadOnlyPool:
+    def __init__(self, db_path, size=4):
+        """
+        Pool schreibgeschützter SQLite-Verbindungen, die von den Threads des Servers geteilt werden.
+
+        Args:
+            db_path (str): Pfad zur Datenbank.
+            size (int): Anzahl der Verbindungen.
+        """
+        self.size = size
+        self._connections = queue.Queue()
+        for _ in range(size):
+            self._connections.put(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False))
+
+    @contextmanager
+    def connection(self):
+        """Leiht eine Verbindung aus und gibt sie danach zurück (blockiert, falls alle belegt sind)."""
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        """Schließt alle Verbindungen."""
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+class ServerMetrics:
+    def __init__(self, window=60.0, maxlen=100000):
+        """
+        Sammelt Anfragezahlen und Latenzen für den /metrics-Endpunkt.
+
+        Args:
+            window (float): Zeitfenster in Sekunden für QPS und Perzentile.
+            maxlen (int): Maximale Anzahl gespeicherter Messpunkte.
+        """
+        self.window = window
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._samples = deque(maxlen=maxlen)  # (Zeitpunkt, Latenz in ms)
+
+    def record(self, latency_ms, error=False):
+        """Erfasst eine beantwortete Anfrage."""
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self._samples.append((time.monotonic(), latency_ms))
+
+    def record_batch(self, size):
+        """Erfasst einen ausgeführten Datenbank-Batch."""
+        self.batches += 1
+        self.batched_requests += size
+
+    def snapshot(self):
+        """
+        Gibt den aktuellen Stand der Messwerte zurück.
+
+        Returns:
+            dict: Anfragen, Fehler, QPS und Latenz-Perzentile im Zeitfenster sowie die mittlere Batchgröße.
+        """
+        now = time.monotonic()
+        recent = [latency for timestamp, latency in self._samples if now - timestamp <= self.window]
+        elapsed = min(self.window, now - self.started) or 1e-9
+        result = {
+            "requests": self.requests,
+            "errors": self.errors,
+            "uptime_s": now - self.started,
+            "qps": len(recent) / elapsed,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+        }
+        result.update(percentiles(recent))
+        return result
+
+
+class StrategyServer:
+    def __init__(self, db_path="Data/blackjack.db", host="127.0.0.1", port=8765, table_name="Full_player_hands",
+                 pool_size=4, cache_size=4096, batch_window=0.002, max_batch=256):
+        """
+        Asynchroner HTTP-Server (nur Standardbibliothek) für Strategieanfragen vieler Tische.
+
+        Endpunkte:
+            GET /action?cards=10,6&upcard=10       Zeile aus Full_player_hands (Aktion, EV, Gewinn/Verlust).
+            GET /overview?table=...&hand=10,6      Zeile aus einer Übersichtstabelle (OVERVIEW_TABLES).
+            GET /metrics                           QPS, Latenz-Perzentile, Cache- und Batch-Statistik.
+
+        /action-Anfragen gehen zuerst an den LRU-Cache; Fehlschläge werden für batch_window Sekunden gesammelt
+        und gemeinsam mit einer Abfrage über den schreibgeschützten Verbindungspool beantwortet.
+
+        Args:
+            db_path (str): Pfad zur berechneten Datenbank.
+            host (str): Adresse, an die der Server gebunden wird (standardmäßig nur localhost).
+            port (int): Port; 0 wählt einen freien Port (siehe self.port nach start()).
+            table_name (str): Name der Spielerhände-Tabelle.
+            pool_size (int): Anzahl der Datenbankverbindungen und Batch-Worker.
+            cache_size (int): Maximale Anzahl Einträge im LRU-Cache.
+            batch_window (float): Wartezeit in Sekunden, in der Anfragen zu einem Batch gesammelt werden.
+            max_batch (int): Maximale Anzahl Anfragen pro Batch.
+        """
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.table_name = table_name
+        self.pool_size = pool_size
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache = LRUCache(maxsize=cache_size)
+        self.metrics = ServerMetrics()
+        self.pool = None
+        self._executor = None
+        self._queue = None
+        self._workers = []
+        self._server = None
+
+    async def start(self):
+        """Öffnet den Verbindungspool, startet die Batch-Worker und bindet den Server."""
+        self.pool = ReadOnlyPool(self.db_path, self.pool_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size)
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._batch_worker()) for _ in range(self.pool_size)]
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        """Startet den Server (falls nötig) und beantwortet Anfragen bis zum Abbruch."""
+        if self._server is None:
+            await self.start()
+        print(f"Strategie-Server läuft auf http://{self.host}:{self.port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Beendet Server, Worker und Verbindungspool."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    async def _handle_connection(self, reader, writer):
+        """Liest HTTP/1.1-Anfragen einer Verbindung (Keep-Alive) und beantwortet sie nacheinander."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                start = time.perf_counter()
+                target = ""  # Bei einer fehlerhaften Anfragezeile gibt es kein Ziel (nicht das der vorigen Anfrage)
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                    status, body = await self.dispatch(method, target)
+                except ValueError as error:
+                    status, body = 400, {"error": str(error)}
+                except Exception as error:
+                    status, body = 500, {"error": str(error)}
+
+                payload = json.dumps(body).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_STATUS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+                if not target.startswith("/metrics"):
+                    self.metrics.record((time.perf_counter() - start) * 1000, error=status >= 400)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target):
+        """
+        Leitet eine Anfrage an den passenden Endpunkt weiter.
+
+        Args:
+            method (str): HTTP-Methode.
+            target (str): Pfad mit Query-String.
+
+        Returns:
+            tuple: (HTTP-Status, JSON-serialisierbarer Inhalt).
+
+        Raises:
+            ValueError: Bei fehlenden oder ungültigen Parametern.
+        """
+        if method != "GET":
+            return 405, {"error": "Nur GET wird unterstützt."}
+        url = urlsplit(target)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        if url.path == "/action":
+            key = self.action_key(params.get("cards", ""), params.get("upcard", ""))
+            row = await self.lookup_action(key)
+            if row is None:
+                return 404, {"error": f"Hand {key[0]} gegen {key[1]} nicht gefunden."}
+            return 200, row
+        if url.path == "/overview":
+            row = await self.lookup_overview(params.get("table", ""), params.get("hand", ""))
+            if row is None:
+                return 404, {"error": "Eintrag nicht gefunden."}
+            return 200, row
+        if url.path == "/metrics":
+            metrics = self.metrics.snapshot()
+            metrics["cache"] = self.cache.info()
+            return 200, metrics
+        return 404, {"error": f"Unbekannter Pfad {url.path}."}
+
+    @staticmethod
+    def action_key(cards, upcard):
+        """
+        Normalisiert eine Anfrage auf den Schlüssel (hand_text, dealer_start) der Tabelle.
+
+        Args:
+            cards (str): Kommagetrennte Karten, z. B. "10,6".
+            upcard (str): Dealer-Karte (1 bis 10 oder "Blackjack").
+
+        Returns:
+            tuple: (hand_text mit sortierten Karten, dealer_start).
+
+        Raises:
+            ValueError: Wenn Karten oder Dealer-Karte ungültig sind.
+        """
+        hand = sorted(int(card) for card in cards.split(",") if card)
+        if not hand or any(card < 1 or card > 10 for card in hand):
+            raise ValueError("Ungültige Karten.")
+        if upcard != "Blackjack" and upcard not in {str(card) for card in range(1, 11)}:
+            raise ValueError("Ungültige Dealer-Karte.")
+        return ",".join(map(str, hand)), upcard
+
+    async def lookup_action(self, key):
+        """
+        Beantwortet eine /action-Anfrage aus dem Cache oder über den nächsten Batch.
+
+        Args:
+            key (tuple): (hand_text, dealer_start).
+
+        Returns:
+            dict or None: Die Zeile als Dictionary oder None, falls die Hand nicht existiert.
+        """
+        row = self.cache.get(key)
+        if row is not None:
+            return row
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, future))
+        return await future
+
+    async def _batch_worker(self):
+        """Sammelt wartende /action-Anfragen und beantwortet sie mit einer gemeinsamen Abfrage."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            keys = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                rows = await loop.run_in_executor(self._executor, self._fetch_actions, keys)
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            self.metrics.record_batch(len(batch))
+            for key, row in rows.items():
+                self.cache.put(key, row)
+            for key, future in batch:
+                if not future.done():
+                    future.set_result(rows.get(key))
+
+    def _fetch_actions(self, keys):
+        """
+        Liest mehrere Hände mit einer Abfrage (läuft in einem Thread des Executors).
+
+        Args:
+            keys (list[tuple]): Liste von (hand_text, dealer_start).
+
+        Returns:
+            dict: (hand_text, dealer_start) -> Zeile als Dictionary.
+        """
+        values = ", ".join(["(?, ?)"] * len(keys))
+        parameters = [value for key in keys for value in key]
+        with self.pool.connection() as connection:
+            # Join über eine VALUES-Liste, damit SQLite den Index auf (hand_text, dealer_start) nutzt
+            cursor = connection.execute(f"""
+                WITH keys(hand_text, dealer_start) AS (VALUES {values})
+                SELECT {", ".join(f"t.{column}" for column in ACTION_COLUMNS)}
+                FROM keys
+                JOIN {self.table_name} AS t
+                    ON t.hand_text = keys.hand_text AND t.dealer_start = keys.dealer_start
+            """, parameters)
+            return {(row[0], row[1]): dict(zip(ACTION_COLUMNS, row)) for row in cursor.fetchall()}
+
+    async def lookup_overview(self, table, hand):
+        """
+        Beantwortet eine /overview-Anfrage aus dem Cache oder direkt aus der Datenbank.
+
+        Args:
+            table (str): Name der Übersichtstabelle (siehe OVERVIEW_TABLES).
+            hand (str): hand_text der Starthand bzw. Kartenwert des Paars bei Pair_overview.
+
+        Returns:
+            dict or None: Die Zeile als Dictionary oder None, falls sie nicht existiert.
+
+        Raises:
+            ValueError: Bei einer unbekannten Tabelle.
+        """
+        if table not in OVERVIEW_TABLES:
+            raise ValueError(f"Unbekannte Tabelle {table}.")
+        key = ("overview", table, hand)
+        row = self.cache.get(key)
+        if row is None:
+            row = await asyncio.get_running_loop().run_in_executor(self._executor, self._fetch_overview, table, hand)
+            if row is not None:
+                self.cache.put(key, row)
+        return row
+
+    def _fetch_overview(self, table, hand):
+        """Liest eine Zeile einer Übersichtstabelle (läuft in einem Thread des Executors)."""
+        with self.pool.connection() as connection:
+            cursor = connection.execute(f"SELECT * FROM {table} WHERE {OVERVIEW_TABLES[table]} = ?", (hand,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+
+async def fetch(host, port, path):
+    """
+    Einzelne GET-Anfrage an den Server (für Tests und Skripte).
+
+    Args:
+        host (str): Adresse des Servers.
+        port (int): Port des Servers.
+        path (str): Pfad mit Query-String.
+
+    Returns:
+        tuple: (HTTP-Status, dekodierter JSON-Inhalt).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await _request(reader, writer, path, keep_alive=False)
+    finally:
+        writer.close()
+
+
+async def _request(reader, writer, path, keep_alive=True):
+    """Sendet eine GET-Anfrage über eine bestehende Verbindung und liest die Antwort."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def default_queries(count, seed=0):
+    """
+    Erzeugt zufällige /action-Anfragen für Starthände gegen alle Dealer-Karten.
+
+    Args:
+        count (int): Anzahl der Anfragen.
+        seed (int): Startwert des Zufallsgenerators.
+
+    Returns:
+        list[str]: Pfade mit Query-String.
+    """
+    rng = random.Random(seed)
+    return [f"/action?cards={rng.randint(1, 10)},{rng.randint(1, 10)}&upcard={rng.randint(1, 10)}"
+            for _ in range(count)]
+
+
+async def run_load(host, port, requests=1000, concurrency=16, paths=None):
+    """
+    Lastgenerator: schickt Anfragen über mehrere gleichzeitige Keep-Alive-Verbindungen.
+
+    Args:
+        host (str): Adresse des Servers.
+        port (int): Port des Servers.
+        requests (int): Gesamtzahl der Anfragen (ignoriert, wenn paths angegeben ist).
+        concurrency (int): Anzahl gleichzeitiger Verbindungen.
+        paths (list[str], optional): Anfragen; standardmäßig default_queries(requests).
+
+    Returns:
+        dict: Anzahl Anfragen und Fehler, Dauer, QPS und Latenz-Perzentile aus Client-Sicht.
+    """
+    paths = list(paths) if paths is not None else default_queries(requests)
+    pending = deque(paths)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while pending:
+                path = pending.popleft()
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, path)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(max(1, min(concurrency, len(paths))))))
+    seconds = time.perf_counter() - start
+    result = {"requests": len(latencies), "errors": errors, "seconds": seconds,
+              "qps": len(latencies) / seconds if seconds else 0.0}
+    result.update(percentiles(latencies))
+    return result
+
+
+def main(argv=None):
+    """Kommandozeile: startet den Server oder mit --load den Lastgenerator gegen einen laufenden Server."""
+    parser = argparse.ArgumentParser(description="Lokaler Blackjack-Strategie-Server")
+    parser.add_argument("--db", default="Data/blackjack.db", help="Pfad zur berechneten Datenbank")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--load", type=int, metavar="N", help="N Anfragen an einen laufenden Server schicken")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    if args.load:
+        print(asyncio.run(run_load(args.host, args.port, args.load, args.concurrency)))
+        print(asyncio.run(fetch(args.host, args.port, "/metrics"))[1])
+        return
+    server = StrategyServer(args.db, args.host, args.port, pool_size=args.pool_size, cache_size=args.cache_size)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()